@@ -0,0 +1,114 @@
+"""
+Measure the upcoming-birthdays query on a large contacts table.
+
+Usage:
+    python -m benchmarks.bench_birthdays --rows 1000000 [--db-url ...]
+
+Seeds ``--rows`` contacts spread over ``--users`` users and times
+``ContactRepository.get_contacts_with_birthdays`` for a 7-day, a 30-day
+and a new-year-crossing window. On PostgreSQL the previous
+``to_char(birthday, 'MM-DD')`` query is timed as well for comparison.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select, func, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.entity.models import Base, Contact, User, birthday_key
+from src.repositories.contacts_repository import ContactRepository
+
+
+WINDOWS = (
+    ("7 days", date(2025, 6, 10), date(2025, 6, 17)),
+    ("30 days", date(2025, 6, 10), date(2025, 7, 10)),
+    ("new year", date(2025, 12, 28), date(2026, 1, 4)),
+)
+
+
+async def seed(engine, rows: int, users: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": u, "username": f"u{u}", "email": f"u{u}@x", "hash_password": "x"}
+            for u in range(1, users + 1)
+        ])
+        for start in range(0, rows, 50_000):
+            batch = []
+            for i in range(start, min(start + 50_000, rows)):
+                birthday = date(1970, 1, 1) + timedelta(days=random.randrange(20_000))
+                batch.append({
+                    "first_name": "abc",
+                    "last_name": "def",
+                    "email": f"{i:x}",
+                    "birthday": birthday,
+                    "birthday_mmdd": birthday_key(birthday),
+                    "user_id": 1 + i % users,
+                })
+            await conn.execute(insert(Contact), batch)
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("ANALYZE contacts"))
+
+
+def legacy_query(start: date, end: date, user_id: int):
+    """The to_char based query this benchmark replaces (PostgreSQL only)."""
+    return (
+        select(Contact)
+        .filter_by(user_id=user_id)
+        .where(
+            func.to_char(Contact.birthday, "MM-DD").between(
+                func.to_char(start, "MM-DD"), func.to_char(end, "MM-DD")
+            )
+        )
+        .order_by(func.to_char(Contact.birthday, "MM-DD"))
+    )
+
+
+async def median_ms(call, repeat: int) -> tuple[float, int]:
+    samples, count = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(await call())
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], count
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url, poolclass=StaticPool)
+    print(f"Seeding {args.rows} contacts for {args.users} user(s)...")
+    await seed(engine, args.rows, args.users)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    is_postgresql = engine.dialect.name == "postgresql"
+
+    user = User(id=1)
+    print(f"{'window':>10} {'rows':>7} {'indexed ms':>11} {'to_char ms':>11}")
+    async with session_maker() as session:
+        repository = ContactRepository(session)
+        for name, start, end in WINDOWS:
+            indexed, count = await median_ms(
+                lambda: repository.get_contacts_with_birthdays(start, end, user),
+                args.repeat,
+            )
+            legacy = "n/a"
+            if is_postgresql:
+                async def run_legacy():
+                    result = await session.execute(legacy_query(start, end, user.id))
+                    return result.scalars().all()
+                legacy = f"{(await median_ms(run_legacy, args.repeat))[0]:.2f}"
+            print(f"{name:>10} {count:>7} {indexed:>11.2f} {legacy:>11}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Compare GET /api/contacts page loads with and without the users join.
+
+Usage:
+    python -m benchmarks.bench_contact_loading --rows 20000 --limit 500
+
+Seeds a single user's contacts into an in-memory SQLite database (or the
+database given with ``--db-url``) and times ``ContactRepository.get_contacts``
+against the same query with ``joinedload(Contact.user)``, which is what
+every contact query used to emit. ``--explain`` prints both query plans.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import joinedload
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.bench_pagination import seed
+from src.entity.models import Base, Contact, User
+from src.repositories.contacts_repository import ContactRepository
+
+
+def page_stmt(limit: int, join_user: bool = False):
+    """The first-page query, optionally with the old ``lazy="joined"`` join."""
+    stmt = select(Contact).filter_by(user_id=1).order_by(Contact.id).limit(limit)
+    if join_user:
+        stmt = stmt.options(joinedload(Contact.user))
+    return stmt
+
+
+async def time_runs(fetch, repeat: int) -> float:
+    """Median latency in ms of ``fetch()``."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fetch()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def explain(session, stmt) -> str:
+    """Query plan of ``stmt`` in the bound dialect."""
+    dialect = session.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN" if dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    rows = (await session.execute(text(f"{prefix} {sql}"))).all()
+    return "\n".join("    " + str(row[-1]) for row in rows)
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"Seeding {args.rows} contacts...")
+    await seed(session_maker, args.rows)
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.execute(text("ANALYZE"))
+
+    user = User(id=1)
+    async with session_maker() as session:
+        repository = ContactRepository(session)
+
+        async def plain():
+            await repository.get_contacts(args.limit, 0, user)
+            session.expunge_all()
+
+        async def joined():
+            result = await session.execute(page_stmt(args.limit, join_user=True))
+            result.scalars().unique().all()
+            session.expunge_all()
+
+        plain_ms = await time_runs(plain, args.repeat)
+        joined_ms = await time_runs(joined, args.repeat)
+
+        print(f"{'query':>12} {'ms/page':>10} {'rows/s':>12}")
+        for name, ms in (("no join", plain_ms), ("users join", joined_ms)):
+            print(f"{name:>12} {ms:>10.2f} {args.limit / ms * 1000:>12.0f}")
+
+        if args.explain:
+            for name, join_user in (("no join", False), ("users join", True)):
+                plan = await explain(session, page_stmt(args.limit, join_user))
+                print(f"\n{name}:\n{plan}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--explain", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,159 @@
+"""
+Compare uvicorn event loops serving the contact list endpoint.
+
+Usage:
+    python -m benchmarks.bench_event_loop --concurrency 64 --duration 10
+
+Seeds a single user's contacts into a temporary SQLite file, then starts
+one uvicorn worker per loop (``asyncio`` and ``uvloop``) in a subprocess
+and drives ``GET /api/contacts/?limit=N`` from concurrent clients. The
+app runs with authentication, Redis and the rate limiter replaced by
+in-process stand-ins, so the numbers reflect the loop, HTTP parser and
+request path rather than external services. Reports requests per second
+and p50/p99 latency.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from benchmarks.bench_pagination import seed
+from src.entity.models import Base, User
+from src.services.cache import CacheService
+
+
+class VersionsOnlyCache(CacheService):
+    """Cache stand-in that only answers contacts versions."""
+    def __init__(self):
+        pass
+
+    async def get_contacts_version(self, user_id: int) -> int:
+        return 0
+
+
+def create_app():
+    """App factory for uvicorn, run in the benchmark's server process."""
+    from main import app
+    from src.core.depend_service import get_current_user
+    from src.database.db import get_db
+    from src.services.cache import get_cache_service
+
+    engine = create_async_engine(os.environ["BENCH_DB_URL"])
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    user = User(id=1, username="bench", email="bench@example.com")
+    cache = VersionsOnlyCache()
+
+    async def bench_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_cache_service] = lambda: cache
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def load(url: str, concurrency: int, duration: float) -> tuple[float, float, float]:
+    """Requests per second, p50 and p99 latency in ms."""
+    samples = []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                samples.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    samples.sort()
+    return (
+        len(samples) / elapsed,
+        samples[len(samples) // 2] * 1000,
+        samples[int(len(samples) * 0.99)] * 1000,
+    )
+
+
+async def run(loop: str, args, env: dict) -> tuple[float, float, float]:
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.bench_event_loop:create_app",
+            "--factory", "--port", str(port), "--loop", loop, "--http", args.http,
+            "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        await wait_ready(f"{base}/")
+        url = f"{base}/api/contacts/?limit={args.limit}"
+        await load(url, args.concurrency, 1)  # warm-up
+        return await load(url, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        db_url = f"sqlite+aiosqlite:///{directory}/bench.db"
+        engine = create_async_engine(db_url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        print(f"Seeding {args.rows} contacts...")
+        await seed(async_sessionmaker(bind=engine, expire_on_commit=False), args.rows)
+        await engine.dispose()
+
+        env = {
+            **os.environ,
+            "BENCH_DB_URL": db_url,
+            "RATE_LIMIT_ENABLED": "false",
+            "LOAD_SHEDDING_ENABLED": "false",
+        }
+        results = {loop: await run(loop, args, env) for loop in ("asyncio", "uvloop")}
+
+    print(f"{'loop':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for loop, (rate, p50, p99) in results.items():
+        print(f"{loop:>8} {rate:>8.0f} {p50:>8.2f} {p99:>8.2f}")
+    print(f"speedup: {results['uvloop'][0] / results['asyncio'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--http", choices=("h11", "httptools"), default="httptools")
+    asyncio.run(main(parser.parse_args()))
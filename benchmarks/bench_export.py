@@ -0,0 +1,62 @@
+"""
+Check that GET /api/contacts/export streams with flat memory.
+
+Usage:
+    python -m benchmarks.bench_export --rows 10000 100000
+
+For each row count, seeds one user's contacts into a fresh in-memory SQLite
+database (or the database given with ``--db-url``), drains the chunks of
+``ContactService.export_contacts`` and reports throughput and the peak
+memory traced while exporting.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.bench_pagination import seed
+from src.entity.models import Base, User
+from src.services.contact_services import ContactService
+
+
+async def run(db_url: str, rows: int, format: str) -> None:
+    engine = create_async_engine(db_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    await seed(session_maker, rows)
+
+    async with session_maker() as session:
+        _, chunks = ContactService(session).export_contacts(User(id=1), format)
+        size = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        async for chunk in chunks:
+            size += len(chunk)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{rows:>10} {size / 1e6:>9.1f} {rows / elapsed:>12,.0f} "
+        f"{peak / 1e6:>10.2f}"
+    )
+    await engine.dispose()
+
+
+async def main(args) -> None:
+    print(f"{'rows':>10} {'MB out':>9} {'rows/s':>12} {'peak MB':>10}")
+    for rows in args.rows:
+        await run(args.db_url, rows, args.format)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--db-url", default="sqlite+aiosqlite:///:memory:")
+    asyncio.run(main(parser.parse_args()))
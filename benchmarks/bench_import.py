@@ -0,0 +1,83 @@
+"""
+Measure bulk contact import throughput for POST /api/contacts/import.
+
+Usage:
+    python -m benchmarks.bench_import --rows 200000
+
+Generates a CSV body in memory, feeds it in 64 KiB chunks through the same
+line/record parsers the endpoint uses and imports it with
+``ContactService.import_contacts`` into an in-memory SQLite database (or the
+database given with ``--db-url``). Reports rows/sec, and peak traced memory
+with ``--trace-memory`` (tracing slows the run down noticeably).
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.entity.models import Base, User
+from src.services.contact_io_services import iter_lines, iter_csv_records
+from src.services.contact_services import ContactService
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_csv(rows: int) -> bytes:
+    """Build a CSV body with ``rows`` valid contacts."""
+    lines = ["first_name,last_name,email,phone,birthday"]
+    for i in range(rows):
+        lines.append(
+            f"First{i},Last{i % 997},{i:x}@ex.com,1234567890,"
+            f"1990-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def chunks(data: bytes):
+    for i in range(0, len(data), CHUNK_SIZE):
+        yield data[i:i + CHUNK_SIZE]
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        session.add(User(id=1, username="bench", email="bench@example.com", hash_password="x"))
+        await session.commit()
+
+    body = make_csv(args.rows)
+    print(f"Importing {args.rows} rows ({len(body) / 1e6:.1f} MB)...")
+
+    if args.trace_memory:
+        tracemalloc.start()
+    async with session_maker() as session:
+        service = ContactService(session)
+        start = time.perf_counter()
+        report = await service.import_contacts(
+            iter_csv_records(iter_lines(chunks(body))), User(id=1)
+        )
+        elapsed = time.perf_counter() - start
+
+    print(f"inserted: {report['inserted']}, failed: {report['failed']}")
+    print(f"elapsed:  {elapsed:.2f} s ({report['inserted'] / elapsed:,.0f} rows/s)")
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"peak mem: {peak / 1e6:.1f} MB (excluding the generated body)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--trace-memory", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+"""
+Compare CPU cost of encoding a contact list page two ways.
+
+Usage:
+    python -m benchmarks.bench_list_response --limit 500
+
+Seeds a single user's contacts into an in-memory SQLite database (or the
+database given with ``--db-url``) and measures process CPU time per page
+for:
+
+* ``orm``: ``Contact`` instances validated into ``ContactResponse`` with
+  ``from_attributes`` and dumped by the stdlib ``json`` encoder, which is
+  what FastAPI does for a ``response_model``;
+* ``rows``: Core rows encoded by ``RowsJSONResponse`` (orjson).
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.bench_pagination import seed
+from src.config import constants
+from src.core.responses import RowsJSONResponse
+from src.entity.models import Base, User
+from src.repositories.contacts_repository import ContactRepository
+from src.schemas.contact_schema import ContactResponse
+
+
+async def cpu_per_page(encode, repeat: int) -> tuple[float, int]:
+    """Median CPU ms of ``encode()`` and the size of its output."""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        body = await encode()
+        samples.append((time.process_time() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], len(body)
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"Seeding {args.rows} contacts...")
+    await seed(session_maker, args.rows)
+
+    user = User(id=1)
+    adapter = TypeAdapter(list[ContactResponse])
+    fields = constants.CONTACT_RESPONSE_FIELDS
+    async with session_maker() as session:
+        repository = ContactRepository(session)
+
+        async def orm():
+            contacts = await repository.get_contacts(args.limit, 0, user)
+            models = adapter.validate_python(contacts, from_attributes=True)
+            content = adapter.dump_python(models, mode="json")
+            session.expunge_all()
+            return json.dumps(content, separators=(",", ":")).encode()
+
+        async def rows():
+            contacts = await repository.get_contacts(args.limit, 0, user, fields=fields)
+            return RowsJSONResponse(contacts, fields).body
+
+        orm_ms, orm_size = await cpu_per_page(orm, args.repeat)
+        rows_ms, rows_size = await cpu_per_page(rows, args.repeat)
+
+    print(f"{'path':>6} {'cpu ms/page':>12} {'bytes':>8}")
+    print(f"{'orm':>6} {orm_ms:>12.2f} {orm_size:>8}")
+    print(f"{'rows':>6} {rows_ms:>12.2f} {rows_size:>8}")
+    print(f"speedup: {orm_ms / rows_ms:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
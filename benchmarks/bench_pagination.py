@@ -0,0 +1,94 @@
+"""
+Compare offset and cursor pagination latency for GET /api/contacts.
+
+Usage:
+    python -m benchmarks.bench_pagination --rows 100000 --limit 10
+
+Seeds a single user's contacts into an in-memory SQLite database (or the
+database given with ``--db-url``) and times the repository query for
+pages 1 .. 10,000 with both strategies.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.entity.models import Base, Contact, User
+from src.repositories.contacts_repository import ContactRepository
+
+
+PAGES = (1, 10, 100, 1_000, 10_000)
+
+
+async def seed(session_maker, rows: int) -> None:
+    """Insert one user with ``rows`` contacts."""
+    async with session_maker() as session:
+        session.add(User(id=1, username="bench", email="bench@example.com", hash_password="x"))
+        await session.commit()
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "first_name": f"First{i}",
+                "last_name": f"Last{i % 997}",
+                "email": f"contact{i}@example.com",
+                "phone": "1234567890",
+                "birthday": date(1990, 1 + i % 12, 1 + i % 28),
+                "user_id": 1,
+            })
+            if len(batch) == 10_000:
+                await session.execute(insert(Contact), batch)
+                batch.clear()
+        if batch:
+            await session.execute(insert(Contact), batch)
+        await session.commit()
+
+
+async def time_page(repository, user, limit, page, after, repeat) -> float:
+    """Median latency in ms of fetching one page."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await repository.get_contacts(
+            limit, (page - 1) * limit, user, after=after
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"Seeding {args.rows} contacts...")
+    await seed(session_maker, args.rows)
+
+    user = User(id=1)
+    print(f"{'page':>8} {'offset ms':>12} {'cursor ms':>12}")
+    async with session_maker() as session:
+        repository = ContactRepository(session)
+        for page in PAGES:
+            if (page - 1) * args.limit >= args.rows:
+                break
+            # Keyset position of the last row on the previous page.
+            after = (None, (page - 1) * args.limit) if page > 1 else None
+            offset_ms = await time_page(repository, user, args.limit, page, None, args.repeat)
+            cursor_ms = await time_page(repository, user, args.limit, page, after, args.repeat)
+            print(f"{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
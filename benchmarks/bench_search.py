@@ -0,0 +1,91 @@
+"""
+Measure contact search latency on PostgreSQL with the pg_trgm index.
+
+Usage:
+    python -m benchmarks.bench_search --db-url postgresql+asyncpg://... --rows 1000000
+
+The database must allow ``CREATE EXTENSION pg_trgm``. The contacts table
+is recreated, seeded with ``--rows`` contacts spread over ``--users``
+users, indexed like migration c41d7a9e6b02 and analyzed. The script then
+reports p50/p95 latency of ``ContactRepository.search_contacts``.
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.entity.models import Base, Contact, User
+from src.repositories.contacts_repository import ContactRepository
+
+
+QUERIES = ("abc", "xyz", "mar", "jo", "q", "k@")
+
+
+def random_word(length: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+async def seed(engine, rows: int, users: int) -> None:
+    """Recreate the schema and insert ``rows`` contacts."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": u, "username": f"u{u}", "email": f"u{u}@x", "hash_password": "x"}
+            for u in range(1, users + 1)
+        ])
+        # Values are sized to fit the current contacts column widths.
+        columns = Contact.__table__.c
+        for start in range(0, rows, 50_000):
+            await conn.execute(insert(Contact), [
+                {
+                    "first_name": random_word(columns.first_name.type.length),
+                    "last_name": random_word(columns.last_name.type.length),
+                    "email": random_word(columns.email.type.length),
+                    "user_id": 1 + i % users,
+                }
+                for i in range(start, min(start + 50_000, rows))
+            ])
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(
+            "CREATE INDEX ix_contacts_search_trgm ON contacts USING gin "
+            "(first_name gin_trgm_ops, last_name gin_trgm_ops, email gin_trgm_ops)"
+        ))
+        await conn.execute(text("ANALYZE contacts"))
+
+
+async def main(args) -> None:
+    engine = create_async_engine(args.db_url)
+    print(f"Seeding {args.rows} contacts for {args.users} user(s)...")
+    await seed(engine, args.rows, args.users)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    user = User(id=1)
+    print(f"{'query':>8} {'rows':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    async with session_maker() as session:
+        repository = ContactRepository(session)
+        for query in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = await repository.search_contacts(query, user, limit=args.limit)
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            p50 = samples[len(samples) // 2]
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            print(f"{query:>8} {len(found):>6} {p50:>8.2f} {p95:>8.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -1,22 +1,44 @@
+import asyncio
+import logging
+import os
 from datetime import datetime, timezone, timedelta
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from slowapi.errors import RateLimitExceeded
 
-from src.routes import contacts_route, auth_route, users_route
+from src.routes import contacts_route, auth_route, users_route, batch_route
 from src.database.db import get_db, sessionmanager
 from src.config import messages
+from src.config.config import settings
+from src.services.cache import cache_service
+from src.core.compression import CompressionMiddleware
+from src.core.load_shedding import LoadSheddingMiddleware
+from src.core.loop_monitor import LoopLagMonitor
+from src.core.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    client_allowed,
+    observe_job,
+)
+from src.core.process_lock import hold_lock
+from src.core.profiling import ProfilingMiddleware
+from src.core.query_log import QueryLogMiddleware
+from src.core.rate_limit import RateLimitMiddleware
+from src.core.timing import ServerTimingMiddleware
+
 
+logger = logging.getLogger("uvicorn.error")
 
 schedulers = AsyncIOScheduler()
 
 
+@observe_job
 async def cleanup_expired_tokens():
     """Cleanup expired tokens."""
     async with sessionmanager.session() as db:
@@ -27,16 +49,55 @@ async def cleanup_expired_tokens():
         )
         await db.execute(stmt, {"now": now, "cutoff": cutoff})
         await db.commit()
-        print(f"Expired tokens cleaned up at [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
+        logger.info(f"Expired tokens cleaned up at [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
+
+
+@observe_job
+async def cleanup_deleted_contacts():
+    """Cleanup contact tombstones past the sync retention."""
+    async with sessionmanager.session() as db:
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=settings.CONTACT_TOMBSTONE_RETENTION_DAYS)
+        stmt = text("DELETE FROM deleted_contacts WHERE deleted_at < :cutoff")
+        await db.execute(stmt, {"cutoff": cutoff.replace(tzinfo=None)})
+        await db.commit()
+        logger.info(f"Deleted contacts cleaned up at [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """App lifespan."""
-    schedulers.add_job(cleanup_expired_tokens, "interval", hours=1)
-    schedulers.start()
+    # With several workers only the one holding the lock runs the jobs.
+    scheduler_lock = None
+    if settings.SCHEDULER_LOCK_FILE:
+        scheduler_lock = hold_lock(settings.SCHEDULER_LOCK_FILE)
+    run_scheduler = not settings.SCHEDULER_LOCK_FILE or scheduler_lock is not None
+    if run_scheduler:
+        schedulers.add_job(cleanup_expired_tokens, "interval", hours=1)
+        schedulers.add_job(cleanup_deleted_contacts, "interval", hours=24)
+        schedulers.start()
+        logger.info(f"Scheduler running in process {os.getpid()}")
+    loop_monitor = LoopLagMonitor(
+        interval=settings.LOOP_LAG_INTERVAL,
+        threshold=settings.LOOP_LAG_THRESHOLD,
+        capture_stacks=settings.LOOP_LAG_CAPTURE_STACKS,
+    )
+    background = [asyncio.create_task(loop_monitor.run())]
+    if settings.METRICS_MULTIPROC_DIR:
+        REGISTRY.multiproc_dir = settings.METRICS_MULTIPROC_DIR
+        background.append(asyncio.create_task(
+            REGISTRY.flush_periodically(settings.METRICS_FLUSH_SECONDS)
+        ))
     yield
-    schedulers.shutdown()
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    if settings.METRICS_MULTIPROC_DIR:
+        REGISTRY.write_snapshot()
+    if run_scheduler:
+        schedulers.shutdown()
+    if scheduler_lock is not None:
+        scheduler_lock.close()
 
 
 app = FastAPI(
@@ -47,27 +108,62 @@ app = FastAPI(
 )
 
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    """Rate limit handler."""
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": messages.requests_limit.get("en")},
+# Middleware is added innermost first. CORS goes last, so it is outermost
+# and its headers also reach 429 and 503 rejections.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    cache_size=settings.COMPRESSION_CACHE_SIZE,
+)
+app.add_middleware(
+    ProfilingMiddleware,
+    min_interval=settings.PROFILING_MIN_INTERVAL,
+    sample_interval=settings.PROFILING_SAMPLE_INTERVAL,
+)
+app.add_middleware(
+    ServerTimingMiddleware, sample_rate=settings.SERVER_TIMING_SAMPLE_RATE
+)
+app.add_middleware(
+    QueryLogMiddleware, n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD
+)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        redis=cache_service.redis,
+        secret_key=settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        default=settings.RATE_LIMIT_DEFAULT,
+        limits=settings.RATE_LIMITS,
     )
-
-
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(
+        LoadSheddingMiddleware, pools=settings.LOAD_SHEDDING_POOLS
+    )
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "ETag",
+        "X-Request-ID",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+    ],
 )
 
 
 app.include_router(contacts_route.router, prefix="/api")
 app.include_router(auth_route.router, prefix="/api")
 app.include_router(users_route.router, prefix="/api")
+app.include_router(batch_route.router, prefix="/api")
 
 
 @app.get("/")
@@ -76,6 +172,18 @@ def read_root(request: Request):
     return {"message": "Contacts_app v1.0"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics of all workers, for scrapers on allowed networks."""
+    client = request.client.host if request.client else None
+    if not client_allowed(client, settings.METRICS_ALLOWED_NETWORKS):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=messages.metrics_forbidden.get("en"),
+        )
+    return Response(await REGISTRY.exposition(), media_type=CONTENT_TYPE)
+
+
 @app.get("/api/healthchecker")
 async def healthchecker(db: AsyncSession = Depends(get_db)):
     """Healthchecker endpoint."""
@@ -90,7 +198,7 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             )
         return {"message": "Welcome to FastAPI!"}
     except Exception as e:
-        print(e)
+        logger.error(f"Healthcheck failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
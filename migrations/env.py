@@ -26,6 +26,15 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", settings.DB_URL)
 
+# Indexes that depend on PostgreSQL extensions live only in migrations;
+# keep autogenerate from proposing to drop them.
+MIGRATION_ONLY_INDEXES = {"ix_contacts_search_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip migration-only objects during autogenerate."""
+    return not (type_ == "index" and name in MIGRATION_ONLY_INDEXES)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +57,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +67,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,70 @@
+"""add contacts (user_id, id) and per-user unique email indexes
+
+Revision ID: 3b8e5f1c2a94
+Revises: 987317ddbfa3
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5f1c2a94'
+down_revision: Union[str, None] = '987317ddbfa3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_invalid_index(name: str) -> None:
+    """Drop an index left INVALID by an interrupted concurrent build."""
+    if op.get_context().as_sql:
+        return
+    conn = op.get_bind()
+    stmt = (
+        "SELECT EXISTS (SELECT 1 FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid)"
+    )
+    if conn.execute(sa.text(stmt), {"name": name}).scalar():
+        op.drop_index(name, table_name='contacts', postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction and
+    # does not block writes to contacts while the index is being built.
+    with op.get_context().autocommit_block():
+        for name in ('ix_contacts_user_id_id', 'ix_contacts_user_id_email'):
+            _drop_invalid_index(name)
+        op.create_index(
+            'ix_contacts_user_id_id', 'contacts', ['user_id', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_contacts_user_id_email', 'contacts', ['user_id', 'email'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_contacts_email', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_email', 'contacts', ['email'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_contacts_user_id_email', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'ix_contacts_user_id_id', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,47 @@
+"""add indexed contacts.birthday_mmdd
+
+Revision ID: 5e9a0c3d7f18
+Revises: c41d7a9e6b02
+Create Date: 2026-10-19 13:27:05.104662
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a0c3d7f18'
+down_revision: Union[str, None] = 'c41d7a9e6b02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column(
+        'birthday_mmdd', sa.SmallInteger(), nullable=True,
+        comment='Birthday month and day (MMDD):'
+    ))
+    op.execute(
+        "UPDATE contacts "
+        "SET birthday_mmdd = EXTRACT(MONTH FROM birthday) * 100 + EXTRACT(DAY FROM birthday) "
+        "WHERE birthday IS NOT NULL"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_id_birthday_mmdd', 'contacts',
+            ['user_id', 'birthday_mmdd'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_user_id_birthday_mmdd', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('contacts', 'birthday_mmdd')
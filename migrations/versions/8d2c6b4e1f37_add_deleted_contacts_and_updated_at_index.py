@@ -0,0 +1,54 @@
+"""add deleted_contacts tombstones and contacts (user_id, updated_at) index
+
+Revision ID: 8d2c6b4e1f37
+Revises: 5e9a0c3d7f18
+Create Date: 2026-10-19 16:04:52.731906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2c6b4e1f37'
+down_revision: Union[str, None] = '5e9a0c3d7f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'deleted_contacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_deleted_contacts_user_id_deleted_at', 'deleted_contacts',
+        ['user_id', 'deleted_at', 'id'], unique=False
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_id_updated_at', 'contacts',
+            ['user_id', 'updated_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_user_id_updated_at', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_index(
+        'ix_deleted_contacts_user_id_deleted_at', table_name='deleted_contacts'
+    )
+    op.drop_table('deleted_contacts')
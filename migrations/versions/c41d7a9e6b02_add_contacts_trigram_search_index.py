@@ -0,0 +1,46 @@
+"""add pg_trgm GIN index for contact search
+
+Revision ID: c41d7a9e6b02
+Revises: 3b8e5f1c2a94
+Create Date: 2026-10-19 11:02:17.550931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7a9e6b02'
+down_revision: Union[str, None] = '3b8e5f1c2a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN trigram ops let ILIKE '%q%' on any of the columns use the index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_search_trgm',
+            'contacts',
+            ['first_name', 'last_name', 'email'],
+            postgresql_using='gin',
+            postgresql_ops={
+                'first_name': 'gin_trgm_ops',
+                'last_name': 'gin_trgm_ops',
+                'email': 'gin_trgm_ops',
+            },
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_search_trgm', table_name='contacts',
+            postgresql_concurrently=True, if_exists=True
+        )
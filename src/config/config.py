@@ -20,6 +20,72 @@ class Settings(BaseSettings):
     REDIS_URL: str
     REDIS_TTL: int = 3600  
 
+    # Contacts
+    CONTACT_IMPORT_BATCH_SIZE: int = 1000
+    CONTACT_IMPORT_MAX_ERRORS: int = 1000
+    CONTACT_EXPORT_BATCH_SIZE: int = 1000
+    CONTACT_SYNC_SETTLE_SECONDS: int = 2
+    CONTACT_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Server (src/serve.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0: one per available CPU
+    SERVER_BACKLOG: int = 2048
+    # Longer than the usual 60 s load balancer idle timeout, so the
+    # balancer, not the app, closes idle upstream connections.
+    SERVER_KEEPALIVE_TIMEOUT: int = 75
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    # File the workers lock so one of them runs the scheduler; empty: run it.
+    SCHEDULER_LOCK_FILE: str = ""
+
+    # Rate limiting: "<count>/<second|minute|hour|day>" token buckets per
+    # client; RATE_LIMITS gives routes their own bucket.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "120/minute"
+    RATE_LIMITS: dict[str, str] = {
+        "/api/auth/register": "5/minute",
+        "/api/auth/login": "10/minute",
+        "/api/auth/refresh": "30/minute",
+        "/api/users/me": "10/minute",
+        "/api/users/request_email": "5/minute",
+        "/api/users/request_password_reset": "5/minute",
+        "/api/users/reset_password/{token}": "5/minute",
+        "/api/contacts/import": "10/minute",
+        "/api/contacts/upsert": "10/minute",
+        "/api/contacts/export/": "10/minute",
+        "/api/batch": "30/minute",
+    }
+
+    # Load shedding: adaptive concurrency pools per route class.
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHEDDING_POOLS: dict[str, dict[str, float]] = {
+        "auth": {"max_limit": 8, "target_latency": 0.5, "queue_timeout": 0.5},
+        "write": {"max_limit": 32, "target_latency": 0.5, "queue_timeout": 0.25},
+        "read": {"max_limit": 128, "target_latency": 0.2, "queue_timeout": 0.1},
+    }
+
+    # Compression
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_CACHE_SIZE: int = 256
+
+    # Observability
+    SERVER_TIMING_SAMPLE_RATE: float = 0.1
+    # Shared directory for per-worker metric files; empty for one worker.
+    METRICS_MULTIPROC_DIR: str = ""
+    METRICS_FLUSH_SECONDS: float = 5.0
+    # Client networks allowed to scrape /metrics (after proxy headers).
+    METRICS_ALLOWED_NETWORKS: list[str] = ["127.0.0.1/32", "::1/128"]
+    PROFILING_MIN_INTERVAL: float = 10.0
+    PROFILING_SAMPLE_INTERVAL: float = 0.001
+    LOOP_LAG_INTERVAL: float = 0.5
+    LOOP_LAG_THRESHOLD: float = 0.1
+    # Log the stack of whatever blocks the loop past the threshold.
+    LOOP_LAG_CAPTURE_STACKS: bool = False
+    SQL_SLOW_QUERY_THRESHOLD: float = 0.2
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
     # Email
     MAIL_USERNAME: EmailStr 
     MAIL_PASSWORD: str 
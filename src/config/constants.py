@@ -9,10 +9,79 @@ EMAIL_MAX_LENGTH = 255
 PHONE_MIN_LENGTH = 10
 PHONE_MAX_LENGTH = 15
 ADDITIONAL_INFO_MAX_LENGTH = 255
+CONTACT_SORT_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "created_at",
+    "updated_at",
+)
+CONTACT_RESPONSE_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "birthday",
+    "additional_info",
+    "created_at",
+    "updated_at",
+)
+CONTACT_EXPORT_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "birthday",
+    "additional_info",
+)
+CONTACT_BULK_MAX_IDS = 5000
+CONTACT_BATCH_MAX_IDS = 500
+# Contact IDs are 32-bit INTEGER columns.
+CONTACT_ID_MAX = 2**31 - 1
+# Longest import line or record, in characters; longer ones are row errors.
+IMPORT_MAX_RECORD_LENGTH = 64 * 1024
 
 # USER
 
 USERNAME_MIN_LENGTH = 2
 USERNAME_MAX_LENGTH = 16
 USER_PASSWORD_MIN_LENGTH = 8
-USER_PASSWORD_MAX_LENGTH = 20
\ No newline at end of file
+USER_PASSWORD_MAX_LENGTH = 20
+# BATCH
+
+BATCH_MAX_REQUESTS = 20
+BATCH_PATH_PREFIX = "/api/contacts"
+# Streamed routes; a batch would buffer their whole body.
+BATCH_EXCLUDED_PATHS = (
+    "/api/contacts/export",
+    "/api/contacts/import",
+    "/api/contacts/upsert",
+)
+BATCH_FORWARDED_HEADERS = ("if-match", "if-none-match", "content-type")
+BATCH_RETURNED_HEADERS = ("etag", "x-next-cursor", "content-type")
+
+# PROFILING
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_MODES = ("cprofile", "pstats", "collapsed")
+PROFILE_REPORT_LINES = 50
+
+# RATE LIMITING
+
+RATE_LIMIT_EXEMPT_PATHS = ("/", "/metrics", "/api/healthchecker", "/docs", "/openapi.json")
+
+# LOAD SHEDDING
+
+# bcrypt-heavy routes, kept in a pool of their own.
+LOAD_SHEDDING_AUTH_PREFIXES = ("/api/auth/", "/api/users/reset_password/")
+LOAD_SHEDDING_EXEMPT_PATHS = ("/metrics", "/api/healthchecker")
+# Long by design; they hold a slot but do not steer the limit.
+LOAD_SHEDDING_UNTIMED_PATHS = (
+    "/api/contacts/export/",
+    "/api/contacts/import",
+    "/api/contacts/upsert",
+    "/api/batch",
+)
@@ -1,3 +1,6 @@
+from src.config import constants
+
+
 # CONTACT
 
 contact_schema_first_name = {
@@ -20,6 +23,10 @@ contact_schema_birthday = {
     "en": "Birthday:",
 }   
 
+contact_schema_birthday_mmdd = {
+    "en": "Birthday month and day (MMDD):",
+}
+
 contact_schema_additional_info = {    
     "en": "Additional info:",
 }
@@ -60,6 +67,14 @@ contact_get_all = {
     "en": "Contacts retrieved",
 }
 
+contact_upcoming_birthdays_description = {
+    "en": "Retrieve contacts with birthdays in the next N days.",
+}
+
+contact_upcoming_birthdays_days_description = {
+    "en": "Number of days ahead to look for birthdays",
+}
+
 contact_get_upcoming_birthdays = {    
     "en": "Contacts with upcoming birthdays retrieved",
 }
@@ -120,6 +135,18 @@ contact_get_by_id_range = {
     "en": "Contacts with IDs retrieved",
 }
 
+contact_cursor_description = {
+    "en": "Opaque cursor returned in the X-Next-Cursor header of the previous page",
+}
+
+contact_sort_description = {
+    "en": "Field to sort by: " + ", ".join(constants.CONTACT_SORT_FIELDS),
+}
+
+invalid_cursor = {
+    "en": "Invalid cursor",
+}
+
 contact_birthday_description = {
     "en": "Birthday (YYYY-MM-DD)",
 }
@@ -128,6 +155,115 @@ contact_additional_info_description = {
     "en": "Additional info:",
 }
 
+contact_import_description = {
+    "en": "Import contacts from a CSV (text/csv), NDJSON (application/x-ndjson) or vCard (text/vcard) body",
+}
+
+import_unsupported_media_type = {
+    "en": "Unsupported content type. Use text/csv, application/x-ndjson or text/vcard",
+}
+
+import_column_count = {
+    "en": "Expected {expected} columns, got {got}",
+}
+
+import_unterminated_quote = {
+    "en": "Unterminated quoted field",
+}
+
+import_record_too_long = {
+    "en": f"Record longer than {constants.IMPORT_MAX_RECORD_LENGTH} characters",
+}
+
+import_invalid_json = {
+    "en": "Invalid JSON object",
+}
+
+import_unterminated_vcard = {
+    "en": "Missing END:VCARD",
+}
+
+import_duplicate_email = {
+    "en": "Contact with this email already exists",
+}
+
+contact_batch_description = {
+    "en": "Get contacts by a comma-separated list of IDs, in the given order",
+}
+
+contact_batch_ids_description = {
+    "en": f"Comma-separated contact IDs (at most {constants.CONTACT_BATCH_MAX_IDS})",
+}
+
+contact_fields_description = {
+    "en": "Comma-separated fields to return: "
+    + ", ".join(constants.CONTACT_RESPONSE_FIELDS),
+}
+
+contact_unknown_fields = {
+    "en": "Unknown field; allowed: " + ", ".join(constants.CONTACT_RESPONSE_FIELDS),
+}
+
+contact_batch_too_many_ids = {
+    "en": f"At most {constants.CONTACT_BATCH_MAX_IDS} IDs can be requested at once",
+}
+
+contact_batch_id_out_of_range = {
+    "en": f"Contact IDs must be at most {constants.CONTACT_ID_MAX}",
+}
+
+contact_bulk_update_description = {
+    "en": "Update contacts selected by a list of IDs or a filter; returns the updated IDs",
+}
+
+contact_bulk_delete_description = {
+    "en": "Delete contacts selected by a list of IDs or a filter; returns the deleted IDs",
+}
+
+contact_bulk_selector_required = {
+    "en": "Give either ids or a non-empty filter",
+}
+
+contact_bulk_changes_required = {
+    "en": "No changes given",
+}
+
+contact_bulk_email_change = {
+    "en": "Email cannot be changed in bulk",
+}
+
+contact_upsert_description = {
+    "en": "Insert or update contacts by email from a CSV, NDJSON or vCard body",
+}
+
+upsert_duplicate_email = {
+    "en": "Email appears more than once in the same batch",
+}
+
+contact_changes_description = {
+    "en": "Contacts changed and deleted since a sync token, with the next token",
+}
+
+contact_changes_since_description = {
+    "en": "Token from the previous sync; omit for a full sync",
+}
+
+sync_token_expired = {
+    "en": "Sync token has expired, run a full sync without a token",
+}
+
+contact_precondition_failed = {
+    "en": "Contact has been modified since it was read",
+}
+
+contact_export_description = {
+    "en": "Export all contacts as a streamed CSV, NDJSON or vCard file",
+}
+
+contact_export_format_description = {
+    "en": "Export format: csv, ndjson or vcf",
+}
+
 # USER
 
 user_not_found = {
@@ -198,6 +334,10 @@ requests_limit = {
 
 # ROLE
 
+metrics_forbidden = {
+    "en": "Metrics are only served to allowed networks",
+}
+
 role_access_info = {    
     "en": "You do not have permission to perform this action",     
 }
@@ -242,4 +382,41 @@ password_reset_success = {
 contact_not_found = {
         "ua": "Контакт не знайдено",
         "en": "Contact not found"
-}
\ No newline at end of file
+}
+
+# BATCH
+
+batch_description = {
+    "en": "Run up to "
+    f"{constants.BATCH_MAX_REQUESTS} contacts API requests in one call "
+    "(except streamed import, upsert and export)",
+}
+
+batch_path_not_allowed = {
+    "en": f"Only {constants.BATCH_PATH_PREFIX} paths can be batched",
+}
+
+batch_path_streamed = {
+    "en": "Streamed import, upsert and export requests cannot be batched",
+}
+
+batch_header_not_allowed = {
+    "en": "Only these headers can be set on a batched request: "
+    + ", ".join(constants.BATCH_FORWARDED_HEADERS),
+}
+
+# PROFILING
+
+profiling_unknown_mode = {
+    "en": "Profile mode must be one of: " + ", ".join(constants.PROFILE_MODES),
+}
+
+profiling_busy = {
+    "en": "A request was profiled too recently, try again later",
+}
+
+# LOAD SHEDDING
+
+service_overloaded = {
+    "en": "The service is overloaded. Please try again later",
+}
@@ -0,0 +1,224 @@
+import hashlib
+import re
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import CACHE_REQUESTS
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/",
+)
+
+CONDITIONAL_HEADERS = (b"if-none-match", b"if-match")
+# Matches the coding suffix of an entity tag, e.g. '"abc-gzip"'.
+CODED_ETAG = re.compile(rb'-(br|gzip)"')
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """Entity tag of the ``coding`` representation, e.g. '"abc-gzip"'."""
+    return f'{etag[:-1]}-{coding}"'
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick the best supported content coding the client accepts."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    for coding in supported:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor."""
+    def __init__(self, coding: str, gzip_level: int):
+        if coding == "br":
+            compressor = brotli.Compressor(quality=4)
+            self.compress, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress, self.finish = compressor.compress, compressor.flush
+
+    def whole(self, body: bytes) -> bytes:
+        return self.compress(body) + self.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with gzip, or brotli when it is installed.
+
+    The coding is negotiated from ``Accept-Encoding``. Bodies below
+    ``minimum_size`` bytes, already-encoded responses and non-text types
+    pass through untouched; streamed bodies are compressed chunk by chunk.
+
+    Complete bodies with a strong ``ETag`` are kept compressed in an LRU
+    of ``cache_size`` entries keyed by path, ETag, coding and body digest,
+    so a hot list page is compressed once per version instead of on every
+    hit.
+
+    Compressed responses carry the ETag with a coding suffix, as a strong
+    tag must not be shared by two representations. The suffix is removed
+    from ``If-None-Match`` and ``If-Match`` before the app sees them.
+    """
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 500,
+            gzip_level: int = 6,
+            cache_size: int = 256
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.cache_size = cache_size
+        self.cache: OrderedDict[tuple, bytes] = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope, coded = self._strip_codings(scope)
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, scope, coding, coding in coded, send)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def _strip_codings(scope: Scope) -> tuple[Scope, set[str]]:
+        """Drop coding suffixes from conditional headers; return the codings seen."""
+        coded = set()
+        headers = []
+        for name, value in scope["headers"]:
+            if name in CONDITIONAL_HEADERS and b"-" in value:
+                coded.update(match.decode() for match in CODED_ETAG.findall(value))
+                value = CODED_ETAG.sub(b'"', value)
+            headers.append((name, value))
+        if not coded:
+            return scope, coded
+        return {**scope, "headers": headers}, coded
+
+    def compress(
+            self, body: bytes, coding: str, etag: str | None, path: str = ""
+    ) -> bytes:
+        """Compress a complete body, reusing a cached result for its ETag."""
+        if not self.cache_size or not etag or etag.startswith("W/"):
+            return _Compressor(coding, self.gzip_level).whole(body)
+        # The digest guards against two bodies sharing an ETag.
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        key = (path, etag, coding, len(body), digest)
+        compressed = self.cache.get(key)
+        if compressed is not None:
+            CACHE_REQUESTS.inc(cache="compression", result="hit")
+            self.cache.move_to_end(key)
+            return compressed
+        CACHE_REQUESTS.inc(cache="compression", result="miss")
+        compressed = _Compressor(coding, self.gzip_level).whole(body)
+        self.cache[key] = compressed
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return compressed
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper deciding whether and how to compress."""
+    def __init__(
+            self,
+            middleware: CompressionMiddleware,
+            scope: Scope,
+            coding: str,
+            coded_request: bool,
+            send: Send
+    ):
+        self.middleware = middleware
+        self.path = scope["path"]
+        self.coding = coding
+        self.coded_request = coded_request
+        self.downstream = send
+        self.start: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+        if self.passthrough:
+            await self.downstream(message)
+            return
+        if self.compressor is not None:
+            await self._send_chunk(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self._compressible(headers) or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            # A 304 answers the tag the client sent, coding suffix included.
+            if self.start["status"] == 304 and self.coded_request and "etag" in headers:
+                headers["ETag"] = coded_etag(headers["etag"], self.coding)
+            await self.downstream(self.start)
+            await self.downstream(message)
+            return
+
+        etag = headers.get("etag")
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        if etag:
+            headers["ETag"] = coded_etag(etag, self.coding)
+        if not more_body:
+            body = self.middleware.compress(body, self.coding, etag, self.path)
+            headers["Content-Length"] = str(len(body))
+            await self.downstream(self.start)
+            await self.downstream({"type": "http.response.body", "body": body})
+            return
+
+        del headers["Content-Length"]
+        self.compressor = _Compressor(self.coding, self.middleware.gzip_level)
+        await self.downstream(self.start)
+        await self._send_chunk(message)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] < 200 or self.start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _send_chunk(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        body = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            body += self.compressor.finish()
+        await self.downstream(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
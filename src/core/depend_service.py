@@ -1,6 +1,7 @@
 from fastapi import (
     Depends,
-    HTTPException
+    HTTPException,
+    Request,
 )
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +12,8 @@ from src.entity.models import User, UserRole
 from src.services.cache import get_cache_service
 from src.config import messages
 from src.database.db import get_db
+from src.core.timing import timed
+from src.services.batch_services import BATCH_USER
 
 
 def get_auth_service(
@@ -28,11 +31,16 @@ def get_user_service(
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    """Get current user."""
-    return await auth_service.get_current_user(token)
+    """Get current user, reusing the one a batch request resolved."""
+    user = getattr(request.state, BATCH_USER, None)
+    if user is not None:
+        return user
+    with timed("auth"):
+        return await auth_service.get_current_user(token)
 
 
 # Get current Moderator
@@ -0,0 +1,35 @@
+import hashlib
+from datetime import datetime
+
+
+def make_etag(*parts) -> str:
+    """Build a strong entity tag from the values a representation depends on."""
+    raw = ":".join(str(part) for part in parts).encode()
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def contact_etag(contact_id: int, updated_at: datetime) -> str:
+    """Entity tag of a single contact."""
+    return make_etag("contact", contact_id, updated_at.isoformat())
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = False) -> bool:
+    """
+    Check an ``If-Match`` / ``If-None-Match`` header against an entity tag.
+
+    ``If-None-Match`` uses weak comparison (``weak=True``), which ignores
+    a ``W/`` prefix; ``If-Match`` requires a strong match.
+    """
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
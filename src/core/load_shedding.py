@@ -0,0 +1,166 @@
+"""
+Adaptive concurrency limits with load shedding, per class of route.
+
+Requests fall into three pools: ``auth`` (bcrypt-heavy login, signup and
+password resets), ``write`` (other non-GET requests) and ``read``. Each
+pool admits up to ``limit`` requests at a time. Extra requests queue for
+up to ``queue_timeout`` seconds, and are refused with a 503 and
+``Retry-After`` when the queue is full or the wait runs out. An auth
+storm therefore fills only the auth pool, and reads keep their
+capacity.
+
+Limits adapt by AIMD (additive increase, multiplicative decrease). Each
+request that finishes within the pool's ``target_latency`` adds
+``1 / limit``, about one slot per full round. A slower one cuts the
+limit by ``DECREASE_FACTOR``, at most once per ``target_latency`` so a
+single slow burst counts once. The limit stays between ``min_limit``
+and ``max_limit``.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config import constants, messages
+from src.core.metrics import (
+    LOAD_SHEDDING_IN_FLIGHT,
+    LOAD_SHEDDING_LIMIT,
+    LOAD_SHEDDING_REJECTED,
+    REGISTRY,
+)
+from src.services.batch_services import is_batched
+
+
+DECREASE_FACTOR = 0.9
+
+
+class ConcurrencyPool:
+    """AIMD-limited pool of request slots with a bounded wait queue."""
+    def __init__(
+            self,
+            name: str,
+            max_limit: int,
+            target_latency: float,
+            queue_timeout: float,
+            min_limit: int = 1,
+            max_queue: int | None = None
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_limit if max_queue is None else max_queue
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.last_decrease = float("-inf")
+
+    async def acquire(self) -> str | None:
+        """Take a slot; return why none was given otherwise."""
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            return None
+        if len(self.waiters) >= self.max_queue:
+            return "queue_full"
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except TimeoutError:
+            if future.done() and not future.cancelled():
+                return None  # handed a slot just as the wait ran out
+            self._forget(future)
+            return "timeout"
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(None)
+            else:
+                self._forget(future)
+            raise
+        return None
+
+    def _forget(self, future: asyncio.Future) -> None:
+        # A release() between the cancellation and this task resuming has
+        # already popped the (cancelled) future.
+        if future in self.waiters:
+            self.waiters.remove(future)
+
+    def release(self, latency: float | None) -> None:
+        """Free a slot, adapting the limit to ``latency`` when given."""
+        if latency is not None:
+            self._adapt(latency)
+        self.in_flight -= 1
+        # Waiters are handed their slot directly so nobody can jump the queue.
+        while self.waiters and self.in_flight < self.limit:
+            future = self.waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def _adapt(self, latency: float) -> None:
+        if latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            return
+        now = time.monotonic()
+        if now - self.last_decrease >= self.target_latency:
+            self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+            self.last_decrease = now
+
+
+class LoadSheddingMiddleware:
+    """Admit requests through the pool of their route class."""
+    def __init__(self, app: ASGIApp, pools: dict[str, dict[str, float]]):
+        self.app = app
+        self.pools = {
+            name: ConcurrencyPool(name, **options) for name, options in pools.items()
+        }
+        REGISTRY.add_collector(self._collect)
+
+    def _collect(self) -> None:
+        for name, pool in self.pools.items():
+            LOAD_SHEDDING_LIMIT.set(pool.limit, pool=name)
+            LOAD_SHEDDING_IN_FLIGHT.set(pool.in_flight, pool=name)
+
+    @staticmethod
+    def _pool_name(scope: Scope) -> str:
+        if scope["path"].startswith(constants.LOAD_SHEDDING_AUTH_PREFIXES):
+            return "auth"
+        if scope["method"] in ("GET", "HEAD"):
+            return "read"
+        return "write"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Batched requests already hold the batch's slot.
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in constants.LOAD_SHEDDING_EXEMPT_PATHS
+            or is_batched(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        pool = self.pools[self._pool_name(scope)]
+        refused = await pool.acquire()
+        if refused is not None:
+            LOAD_SHEDDING_REJECTED.inc(pool=pool.name, reason=refused)
+            response = JSONResponse(
+                {"error": messages.service_overloaded.get("en")},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(math.ceil(pool.target_latency))},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timed = scope["path"] not in constants.LOAD_SHEDDING_UNTIMED_PATHS
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release(time.perf_counter() - start if timed else None)
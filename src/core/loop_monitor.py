@@ -0,0 +1,85 @@
+"""
+Event loop lag sampling and blocking-call detection.
+
+``LoopLagMonitor.run`` sleeps for ``interval`` in a loop and records how
+late each wake-up is in ``event_loop_lag_seconds``. Lag means something
+ran on the loop thread without yielding: a synchronous call, heavy CPU
+work, or simply too many ready callbacks.
+
+By the time the sampler wakes up the culprit has returned. With
+``capture_stacks`` a watchdog thread checks the sampler's heartbeat
+instead. Once a wake-up is ``threshold`` overdue, it logs the loop
+thread's stack, which is the blocking code, while the loop is still
+stuck.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from src.core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class LoopLagMonitor:
+    """Sample event loop lag and optionally catch what blocks it."""
+    def __init__(
+            self,
+            interval: float = 0.5,
+            threshold: float = 0.1,
+            capture_stacks: bool = False
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.capture_stacks = capture_stacks
+        # Monotonic time the sampler expects to wake up at.
+        self._deadline = float("inf")
+        self._stopped = threading.Event()
+
+    async def run(self) -> None:
+        """Sample until cancelled; run as a background task."""
+        loop = asyncio.get_running_loop()
+        watchdog = None
+        if self.capture_stacks:
+            watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(),),
+                name="loop-watchdog",
+                daemon=True,
+            )
+            watchdog.start()
+        try:
+            while True:
+                start = loop.time()
+                self._deadline = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                lag = max(loop.time() - start - self.interval, 0.0)
+                EVENT_LOOP_LAG.observe(lag)
+                if lag > self.threshold:
+                    EVENT_LOOP_BLOCKED.inc()
+                    logger.warning(f"Event loop lagged {lag * 1000:.0f} ms")
+        finally:
+            self._stopped.set()
+            if watchdog is not None:
+                watchdog.join()
+
+    def _watch(self, loop_thread: int) -> None:
+        """Log the loop thread's stack once per overdue wake-up."""
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            deadline = self._deadline
+            overdue = time.monotonic() - deadline
+            if overdue < self.threshold or deadline == reported:
+                continue
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                continue
+            reported = deadline
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop blocked for over {overdue * 1000:.0f} ms in:\n{stack}"
+            )
@@ -0,0 +1,409 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Metrics are plain counters, gauges and histograms kept in ``REGISTRY``.
+They are updated from the event loop thread only, so they take no locks.
+
+With several workers, set ``multiproc_dir`` (``METRICS_MULTIPROC_DIR``):
+every worker then writes its values to ``<dir>/<pid>.json`` every few
+seconds and on each scrape, and ``/metrics`` merges all the files. Counters
+and histograms are summed over every file, including those of workers that
+have exited, so they never go backwards; gauges are summed over live
+workers only. The directory must be emptied when the server starts.
+"""
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger("uvicorn.error")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(key), value] for key, value in self.values.items()],
+        }
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self.values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+    type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Iterable[str] = (),
+            buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self.values.get(key)
+        if state is None:
+            # Per-bucket (not cumulative) counts, the +Inf bucket last,
+            # then the sum of observations.
+            state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        counts = state[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        state[1] += value
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class MetricsRegistry:
+    """Named metrics plus callbacks refreshing gauges before each export."""
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self.multiproc_dir: str | None = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self.collectors.append(collector)
+
+    def collect(self) -> dict[str, dict]:
+        """Current values of every metric of this process."""
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector %r failed", collector)
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def write_snapshot(self) -> None:
+        """Write this process' values to its file in ``multiproc_dir``."""
+        self._write(json.dumps(self.collect()))
+
+    def _write(self, content: str) -> None:
+        path = os.path.join(self.multiproc_dir, f"{os.getpid()}.json")
+        temp = f"{path}.tmp"
+        with open(temp, "w") as file:
+            file.write(content)
+        os.replace(temp, path)
+
+    async def flush_periodically(self, interval: float) -> None:
+        """Keep this process' file fresh for scrapes served by other workers."""
+        while True:
+            try:
+                # Values are read on the loop, which updates them; files in a thread.
+                await asyncio.to_thread(self._write, json.dumps(self.collect()))
+            except OSError:
+                logger.exception("Could not write metrics snapshot")
+            await asyncio.sleep(interval)
+
+    async def exposition(self) -> str:
+        """All metrics in the text exposition format."""
+        if not self.multiproc_dir:
+            return render(self.collect())
+        content = json.dumps(self.collect())
+        return await asyncio.to_thread(self._merged_exposition, content)
+
+    def _merged_exposition(self, content: str) -> str:
+        self._write(content)
+        return render(merge_snapshots(self._read_snapshots()))
+
+    def _read_snapshots(self) -> list[tuple[bool, dict]]:
+        snapshots = []
+        for entry in os.scandir(self.multiproc_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((_is_alive(int(entry.name[:-5])), snapshot))
+        return snapshots
+
+
+def client_allowed(host: str | None, networks: Iterable[str]) -> bool:
+    """Whether the client address ``host`` is in one of ``networks``."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network) for network in networks)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: list[tuple[bool, dict]]) -> dict[str, dict]:
+    """Sum per-process snapshots; gauges only from live processes."""
+    merged: dict[str, dict] = {}
+    totals: dict[str, dict[tuple, Any]] = {}
+    for alive, snapshot in snapshots:
+        for name, metric in snapshot.items():
+            if name not in merged:
+                merged[name] = {**metric, "samples": []}
+                totals[name] = {}
+            if metric["type"] == "gauge" and not alive:
+                continue
+            values = totals[name]
+            for key, value in metric["samples"]:
+                key = tuple(key)
+                current = values.get(key)
+                if current is None:
+                    values[key] = value
+                elif metric["type"] == "histogram":
+                    values[key] = [
+                        [a + b for a, b in zip(current[0], value[0])],
+                        current[1] + value[1],
+                    ]
+                else:
+                    values[key] = current + value
+    for name, metric in merged.items():
+        metric["samples"] = [[list(key), value] for key, value in totals[name].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render(snapshot: dict[str, dict]) -> str:
+    """Format a (merged) snapshot in the text exposition format."""
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labelnames"]
+        for key, value in metric["samples"]:
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {float(value)!r}")
+                continue
+            counts, total = value
+            cumulative = 0
+            bounds = [repr(float(bound)) for bound in metric["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _labels(names, key, f'le="{bound}"')
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {float(total)!r}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+))
+DB_POOL_CONNECTIONS = REGISTRY.register(Gauge(
+    "db_pool_connections",
+    "Database pool connections by state.",
+    ("state",),
+))
+DB_STATEMENT_DURATION = REGISTRY.register(Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by statement type.",
+    ("operation",),
+    FAST_BUCKETS,
+))
+REDIS_COMMAND_DURATION = REGISTRY.register(Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency; pipelines count as one PIPELINE command.",
+    ("command",),
+    FAST_BUCKETS,
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+))
+BCRYPT_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "bcrypt_queue_depth",
+    "Password hashes and checks waiting for or running in a thread.",
+))
+SCHEDULER_JOB_DURATION = REGISTRY.register(Histogram(
+    "scheduler_job_duration_seconds",
+    "Scheduled job run time by job and outcome.",
+    ("job", "status"),
+    JOB_BUCKETS,
+))
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds",
+    "Delay of event loop wake-ups past their scheduled time.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+EVENT_LOOP_BLOCKED = REGISTRY.register(Counter(
+    "event_loop_blocked_total",
+    "Lag samples above the configured threshold.",
+))
+
+LOAD_SHEDDING_LIMIT = REGISTRY.register(Gauge(
+    "load_shedding_limit",
+    "Current adaptive concurrency limit by pool.",
+    ("pool",),
+))
+LOAD_SHEDDING_IN_FLIGHT = REGISTRY.register(Gauge(
+    "load_shedding_in_flight",
+    "Requests holding a slot by pool.",
+    ("pool",),
+))
+LOAD_SHEDDING_REJECTED = REGISTRY.register(Counter(
+    "load_shedding_rejected_total",
+    "Requests refused with 503 by pool and reason (queue_full or timeout).",
+    ("pool", "reason"),
+))
+
+SQL_OPERATIONS = frozenset(
+    ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK")
+)
+
+
+def sql_operation(statement: str) -> str:
+    """Statement type used as the ``operation`` label."""
+    words = statement.lstrip()[:9].split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def observe_pool(engine: AsyncEngine) -> None:
+    """Export the connection pool state of ``engine`` on every scrape."""
+    pool = engine.sync_engine.pool
+
+    def collect() -> None:
+        if not hasattr(pool, "checkedout"):
+            return  # NullPool / StaticPool keep no counts
+        DB_POOL_CONNECTIONS.set(pool.size(), state="size")
+        DB_POOL_CONNECTIONS.set(pool.checkedin(), state="idle")
+        DB_POOL_CONNECTIONS.set(pool.checkedout(), state="checked_out")
+        DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), state="overflow")
+
+    REGISTRY.add_collector(collect)
+
+
+def observe_job(job: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Record the duration and outcome of a scheduled job."""
+    @wraps(job)
+    async def run() -> None:
+        start, status = time.perf_counter(), "error"
+        try:
+            await job()
+            status = "ok"
+        finally:
+            SCHEDULER_JOB_DURATION.observe(
+                time.perf_counter() - start, job=job.__name__, status=status
+            )
+    return run
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template.
+
+    Labelling by template (``/api/contacts/{contact_id}``) rather than
+    path keeps the number of series bounded; unmatched paths share one.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=status,
+            )
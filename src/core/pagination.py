@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+from src.config import messages
+
+
+def encode_cursor(payload: dict) -> str:
+    """Encode a keyset position into an opaque cursor."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode an opaque cursor back into a keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=messages.invalid_cursor.get("en"),
+        )
+    return payload
@@ -0,0 +1,26 @@
+"""
+Elect one worker process for work that must run once per deployment.
+
+``src.serve`` points ``SCHEDULER_LOCK_FILE`` at a file shared by its
+workers. The first worker to lock it runs the scheduler. The lock goes
+away with that process, so the worker started in its place takes over.
+"""
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, where every process is elected
+    fcntl = None
+
+
+def hold_lock(path: str) -> IO | None:
+    """Lock ``path`` until the returned file is closed; ``None`` if already held."""
+    handle = open(path, "a")
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
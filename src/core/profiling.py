@@ -0,0 +1,181 @@
+"""
+On-demand profiling of single requests, for admins.
+
+A request carrying ``X-Profile: <mode>`` (or ``?profile=<mode>``) from an
+admin runs as usual, but its response body is replaced by a profile and
+its status moves to ``X-Profile-Status``. Modes:
+
+* ``cprofile`` - deterministic cProfile, as a pstats text report;
+* ``pstats`` - the same, as a binary pstats dump for snakeviz & co.;
+* ``collapsed`` - a sampling profiler, as collapsed stacks ready for
+  ``flamegraph.pl`` or speedscope.
+
+Both profilers see everything the event loop runs meanwhile, including
+other requests. Only one request is profiled at a time and at most one
+per ``min_interval`` seconds; requests without the flag cost one header
+lookup.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException, Request, status
+from fastapi.dependencies.utils import get_dependant, solve_dependencies
+from fastapi.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import constants, messages
+from src.core.depend_service import get_current_admin_user
+from src.services.batch_services import is_batched
+
+
+class StackSampler:
+    """Sample the stack of one thread from a background thread."""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """One ``frame;frame;frame count`` line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """Replace an admin's flagged response with its profile."""
+    def __init__(self, app: ASGIApp, min_interval: float = 10.0, sample_interval: float = 0.001):
+        self.app = app
+        self.header = constants.PROFILE_HEADER.encode()
+        self.query_param = constants.PROFILE_QUERY_PARAM.encode()
+        self.min_interval = min_interval
+        self.sample_interval = sample_interval
+        self.running = False
+        self.last_started = float("-inf")
+        self.admin = get_dependant(path="", call=get_current_admin_user)
+
+    def _mode(self, scope: Scope) -> str | None:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                return value.decode()
+        if self.query_param in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode())
+            return query.get(constants.PROFILE_QUERY_PARAM, [None])[0]
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None or is_batched(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._authorize(Request(scope))
+        except HTTPException as exc:
+            response = JSONResponse(
+                {"detail": exc.detail}, exc.status_code, headers=exc.headers
+            )
+            await response(scope, receive, send)
+            return
+        if mode not in constants.PROFILE_MODES:
+            response = JSONResponse(
+                {"detail": messages.profiling_unknown_mode.get("en")},
+                status.HTTP_400_BAD_REQUEST,
+            )
+            await response(scope, receive, send)
+            return
+        now = time.monotonic()
+        if self.running or now - self.last_started < self.min_interval:
+            response = JSONResponse(
+                {"detail": messages.profiling_busy.get("en")},
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            await response(scope, receive, send)
+            return
+
+        self.running, self.last_started = True, now
+        try:
+            response = await self._profile(mode, scope, receive)
+        finally:
+            self.running = False
+        await response(scope, receive, send)
+
+    async def _authorize(self, request: Request) -> None:
+        """Raise unless ``get_current_admin_user`` accepts the request."""
+        async with AsyncExitStack() as stack:
+            solved = await solve_dependencies(
+                request=request,
+                dependant=self.admin,
+                dependency_overrides_provider=request.app,
+                async_exit_stack=stack,
+                embed_body_fields=False,
+            )
+            if solved.errors:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail=messages.validate_credentials.get("en"),
+                )
+            get_current_admin_user(**solved.values)
+
+    async def _profile(self, mode: str, scope: Scope, receive: Receive) -> Response:
+        """Run the request under a profiler and return the profile."""
+        response_status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+
+        headers = {}
+        if mode == "collapsed":
+            sampler = StackSampler(self.sample_interval)
+            sampler.start()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                sampler.stop()
+            body, media_type = sampler.collapsed(), "text/plain"
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+            if mode == "pstats":
+                profiler.create_stats()
+                body, media_type = marshal.dumps(profiler.stats), "application/octet-stream"
+                headers["Content-Disposition"] = 'attachment; filename="request.prof"'
+            else:
+                report = io.StringIO()
+                stats = pstats.Stats(profiler, stream=report)
+                stats.sort_stats("cumulative").print_stats(constants.PROFILE_REPORT_LINES)
+                body, media_type = report.getvalue(), "text/plain"
+        headers["X-Profile-Status"] = str(response_status)
+        return Response(body, media_type=media_type, headers=headers)
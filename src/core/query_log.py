@@ -0,0 +1,146 @@
+"""
+Per-request SQL accounting: slow-query log, N+1 warnings, query counts.
+
+``QueryLogMiddleware`` gives every request an ID (``X-Request-ID``,
+taken from the request when present) and a ``RequestQueries`` record.
+The engine hooks from ``watch_queries`` add each statement to the record
+of the request that issued it. They also log statements slower than
+``slow_threshold``, tagged with the route template and request ID.
+
+When a request finishes having run one statement ``n_plus_one_threshold``
+times or more, it is logged as a likely N+1. Tests can collect the
+records of the requests they make with ``capture_queries``.
+"""
+import logging
+import re
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.timing import on_statement
+
+
+logger = logging.getLogger("uvicorn.error")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Client-supplied IDs end up in logs and headers; accept plain tokens only.
+REQUEST_ID_PATTERN = re.compile(rb"[\w.-]{1,64}")
+
+
+class RequestQueries:
+    """SQL statements issued while serving one request."""
+    def __init__(self, request_id: str, scope: Scope):
+        self.request_id = request_id
+        self.scope = scope
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> str:
+        """Route template once routing is done, the raw path before."""
+        route = self.scope.get("route")
+        return getattr(route, "path", self.scope["path"])
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_queries: ContextVar[RequestQueries | None] = ContextVar("queries", default=None)
+_recorders: list[list[RequestQueries]] = []
+
+
+def current_queries() -> RequestQueries | None:
+    """Statements of the current request, or ``None`` outside one."""
+    return _queries.get()
+
+
+@contextmanager
+def capture_queries() -> Iterator[list[RequestQueries]]:
+    """Collect the records of requests completed inside the block."""
+    requests: list[RequestQueries] = []
+    _recorders.append(requests)
+    try:
+        yield requests
+    finally:
+        _recorders.remove(requests)
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def watch_queries(engine: AsyncEngine, slow_threshold: float) -> None:
+    """Count ``engine``'s statements per request and log slow ones."""
+    def _log(statement: str, elapsed: float) -> None:
+        queries = _queries.get()
+        if queries is not None:
+            queries.statements[statement] += 1
+        if elapsed >= slow_threshold:
+            route, request_id = (
+                (queries.route, queries.request_id) if queries else ("-", "-")
+            )
+            logger.warning(
+                f"Slow query {elapsed * 1000:.0f} ms route={route} "
+                f"request_id={request_id}: {_one_line(statement)}"
+            )
+
+    on_statement(engine, _log)
+
+
+class QueryLogMiddleware:
+    """Tag requests with an ID and report their SQL statement counts."""
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    @staticmethod
+    def _request_id(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and REQUEST_ID_PATTERN.fullmatch(value):
+                return value.decode()
+        return uuid.uuid4().hex
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(self._request_id(scope), scope)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = queries.request_id
+            await send(message)
+
+        token = _queries.set(queries)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _queries.reset(token)
+            for statement, count in queries.repeated(self.n_plus_one_threshold):
+                logger.warning(
+                    f"Possible N+1: {count} identical statements "
+                    f"route={queries.route} request_id={queries.request_id}: "
+                    f"{_one_line(statement)}"
+                )
+            for requests in _recorders:
+                requests.append(queries)
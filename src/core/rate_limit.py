@@ -0,0 +1,207 @@
+"""
+Token-bucket rate limiting shared by all workers through Redis.
+
+Each client has one bucket per budgeted route template plus one bucket
+for every other route. The client is the ``sub`` of a valid access token,
+or the remote address for anonymous requests. A bucket holds up to N
+tokens and refills at N per period. Refilling and taking a token happen
+in one Lua script, so a request costs a single round trip and buckets
+stay consistent across workers.
+
+If Redis is unreachable, requests are let through: losing the limiter
+is better than losing the API.
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import jwt
+from fastapi import status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import constants, messages
+from src.services.batch_services import is_batched
+
+
+logger = logging.getLogger("uvicorn.error")
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS[1] bucket; ARGV[1] capacity, ARGV[2] refill rate in tokens/second.
+# Returns whether a token was taken and the tokens left, as a string so
+# Redis does not truncate the fraction.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+@lru_cache(maxsize=4096)
+def _token_subject(token: bytes, secret_key: str, algorithm: str) -> tuple[str | None, float]:
+    """``sub`` and expiry of a signed token; cached, as clients reuse tokens."""
+    try:
+        payload = jwt.decode(
+            token, secret_key, algorithms=[algorithm], options={"verify_exp": False}
+        )
+    except jwt.PyJWTError:
+        return None, math.inf
+    return payload.get("sub"), payload.get("exp", math.inf)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """``capacity`` requests per ``period`` seconds."""
+    capacity: int
+    period: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Budget":
+        """Parse ``"10/minute"``-style specs."""
+        count, _, unit = spec.partition("/")
+        if not count.strip().isdigit() or unit.strip() not in PERIODS:
+            raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '10/minute'")
+        return cls(int(count), PERIODS[unit.strip()])
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+class RateLimitMiddleware:
+    """
+    Apply per-client token buckets to every HTTP request.
+
+    ``limits`` maps route templates (``/api/auth/login``) to their own
+    budget; all other routes share ``default``. Responses carry
+    ``RateLimit-*`` headers, and rejected ones ``Retry-After``. Requests
+    run by /api/batch are only charged on budgeted routes.
+    """
+    def __init__(
+            self,
+            app: ASGIApp,
+            redis: Redis,
+            secret_key: str,
+            algorithm: str,
+            default: str = "120/minute",
+            limits: dict[str, str] | None = None
+    ):
+        self.app = app
+        self.script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.default = Budget.parse(default)
+        self.limits = {
+            path: Budget.parse(spec) for path, spec in (limits or {}).items()
+        }
+        self.routes = None
+        self.redis_down = False
+
+    def _budget(self, scope: Scope) -> tuple[str, Budget]:
+        """The bucket name and budget of a request."""
+        if self.routes is None:
+            # Resolved lazily: the app's routes are complete by the first request.
+            self.routes = [
+                route for route in scope["app"].routes
+                if getattr(route, "path", None) in self.limits
+            ]
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return route.path, self.limits[route.path]
+        return "*", self.default
+
+    def _client(self, scope: Scope) -> str:
+        """The access token's user, or the remote address."""
+        for name, value in scope["headers"]:
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                subject, expires = _token_subject(
+                    value[7:], self.secret_key, self.algorithm
+                )
+                if subject and expires > time.time():
+                    return f"user:{subject}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def _take(self, key: str, budget: Budget) -> tuple[bool, float] | None:
+        """Take a token; ``None`` when Redis cannot be reached."""
+        try:
+            allowed, tokens = await self.script(
+                keys=[key], args=[budget.capacity, budget.rate]
+            )
+        except (RedisError, OSError) as e:
+            if not self.redis_down:
+                logger.warning(f"Rate limiting disabled, Redis unavailable: {e}")
+                self.redis_down = True
+            return None
+        if self.redis_down:
+            logger.info("Rate limiting restored")
+            self.redis_down = False
+        return bool(allowed), float(tokens)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in constants.RATE_LIMIT_EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        bucket, budget = self._budget(scope)
+        # The batch paid the default bucket; budgeted routes still cost
+        # their own token, or a batch would multiply their budget.
+        if bucket == "*" and is_batched(scope):
+            await self.app(scope, receive, send)
+            return
+        result = await self._take(
+            f"rate-limit:{bucket}:{self._client(scope)}", budget
+        )
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, tokens = result
+        headers = {
+            "RateLimit-Limit": str(budget.capacity),
+            "RateLimit-Remaining": str(math.floor(tokens)),
+            "RateLimit-Reset": str(math.ceil((budget.capacity - tokens) / budget.rate)),
+            "RateLimit-Policy": f"{budget.capacity};w={budget.period}",
+        }
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil((1 - tokens) / budget.rate))
+            response = JSONResponse(
+                {"error": messages.requests_limit.get("en")},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,38 @@
+from typing import Any, Sequence
+
+import orjson
+from fastapi import Response
+
+from src.core.timing import timed
+
+
+class RowsJSONResponse(Response):
+    """
+    JSON array of Core result rows, one object per row.
+
+    Rows are encoded by orjson straight from their column values, with no
+    ORM instances or response models in between. Only ``fields`` are
+    written, in that order; other selected columns are left out. Rows
+    that start with ``fields`` (see ``ContactRepository._select``) take
+    the fast path.
+    """
+    media_type = "application/json"
+
+    def __init__(self, rows: Sequence, fields: Sequence[str], **kwargs: Any):
+        self.fields = tuple(fields)
+        super().__init__(rows, **kwargs)
+
+    def render(self, rows: Sequence) -> bytes:
+        with timed("serialize"):
+            return self._render(rows)
+
+    def _render(self, rows: Sequence) -> bytes:
+        if not rows:
+            return b"[]"
+        fields = self.fields
+        if rows[0]._fields[:len(fields)] == fields:
+            return orjson.dumps([dict(zip(fields, row)) for row in rows])
+        pairs = [(field, rows[0]._fields.index(field)) for field in fields]
+        return orjson.dumps(
+            [{field: row[position] for field, position in pairs} for row in rows]
+        )
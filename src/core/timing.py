@@ -0,0 +1,280 @@
+"""
+Per-request phase timings, reported as ``Server-Timing`` and in logs.
+
+Phases:
+
+* ``db`` - SQL statements (engine cursor events);
+* ``cache`` - Redis commands and pipelines (``TimedRedis``);
+* ``auth`` - resolving the current user, including its db/cache time;
+* ``handler`` - the route function, including its db/cache time but
+  not JSON encoding done inside it;
+* ``serialize`` - response validation and JSON encoding;
+* ``total`` - the whole request up to the response headers.
+
+``db`` and ``cache`` are therefore sub-phases of ``auth`` and
+``handler``, not additions to them. The same hooks feed the SQL and Redis
+latency metrics in ``src.core.metrics`` for every request, sampled or not.
+"""
+import asyncio
+import logging
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+from fastapi.routing import APIRoute
+from redis.asyncio.client import Pipeline, Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import DB_STATEMENT_DURATION, REDIS_COMMAND_DURATION, sql_operation
+
+logger = logging.getLogger("uvicorn.error")
+
+PHASES = ("db", "cache", "auth", "handler", "serialize")
+
+
+class RequestTimings:
+    """Time and call count accumulated per phase during one request."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counts: dict[str, int] = dict.fromkeys(PHASES, 0)
+        # When the route function returned; see ``TimedRoute``.
+        self.handler_done: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.durations[phase] += seconds
+        self.counts[phase] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """``Server-Timing`` value with durations in milliseconds."""
+        metrics = []
+        for phase in PHASES:
+            if not self.counts[phase]:
+                continue
+            metric = f"{phase};dur={self.durations[phase] * 1000:.1f}"
+            if phase in ("db", "cache"):
+                metric += f';desc="{self.counts[phase]} calls"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def logfmt(self) -> str:
+        """Durations in milliseconds as ``key=value`` pairs."""
+        fields = [f"total_ms={self.elapsed() * 1000:.1f}"]
+        for phase in PHASES:
+            fields.append(f"{phase}_ms={self.durations[phase] * 1000:.1f}")
+        fields.append(f"db_calls={self.counts['db']}")
+        fields.append(f"cache_calls={self.counts['cache']}")
+        return " ".join(fields)
+
+
+_timings: ContextVar[RequestTimings | None] = ContextVar("timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    """Timings of the current request, or ``None`` when it is not sampled."""
+    return _timings.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the current request."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+StatementHook = Callable[[str, float], None]
+_statement_hooks: "weakref.WeakKeyDictionary[Engine, list[StatementHook]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def on_statement(engine: AsyncEngine, hook: StatementHook) -> None:
+    """
+    Call ``hook(statement, seconds)`` after each SQL statement of ``engine``.
+
+    All hooks of an engine share one pair of cursor events. The start
+    time is kept on the statement's execution context, so a statement
+    that fails (and gets no ``after_cursor_execute``) leaves nothing behind.
+    """
+    sync_engine = engine.sync_engine
+    hooks = _statement_hooks.get(sync_engine)
+    if hooks is not None:
+        hooks.append(hook)
+        return
+    hooks = _statement_hooks[sync_engine] = [hook]
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.statement_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "statement_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        for statement_hook in hooks:
+            statement_hook(statement, elapsed)
+
+
+def _record_statement(statement: str, elapsed: float) -> None:
+    DB_STATEMENT_DURATION.observe(elapsed, operation=sql_operation(statement))
+    timings = _timings.get()
+    if timings is not None:
+        timings.add("db", elapsed)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record every SQL statement of ``engine`` in the ``db`` phase."""
+    on_statement(engine, _record_statement)
+
+
+@contextmanager
+def _redis_call(command: str) -> Iterator[None]:
+    """Record a Redis round trip in the ``cache`` phase and its metric."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REDIS_COMMAND_DURATION.observe(elapsed, command=command)
+        timings = _timings.get()
+        if timings is not None:
+            timings.add("cache", elapsed)
+
+
+class TimedPipeline(Pipeline):
+    """Redis pipeline recording its round trip as one ``PIPELINE`` call."""
+    async def execute(self, raise_on_error: bool = True):
+        with _redis_call("PIPELINE"):
+            return await super().execute(raise_on_error)
+
+
+class TimedRedis(Redis):
+    """Redis client recording every command in the ``cache`` phase and metrics."""
+    async def execute_command(self, *args, **options):
+        with _redis_call(str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None):
+        return TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def _timed_endpoint(call: Callable) -> Callable:
+    """Wrap a route function so its own time goes to ``handler``."""
+    def record(timings: RequestTimings, start: float, serialized: float) -> None:
+        # JSON encoded inside the route (e.g. RowsJSONResponse) is
+        # already counted as ``serialize``.
+        serialize = timings.durations["serialize"] - serialized
+        timings.add("handler", time.perf_counter() - start - serialize)
+        timings.handler_done = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def endpoint(**values: Any) -> Any:
+            timings = _timings.get()
+            if timings is None:
+                return await call(**values)
+            start, serialized = time.perf_counter(), timings.durations["serialize"]
+            try:
+                return await call(**values)
+            finally:
+                record(timings, start, serialized)
+    else:
+        @wraps(call)
+        def endpoint(**values: Any) -> Any:
+            timings = _timings.get()
+            if timings is None:
+                return call(**values)
+            start, serialized = time.perf_counter(), timings.durations["serialize"]
+            try:
+                return call(**values)
+            finally:
+                record(timings, start, serialized)
+    return endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    API route splitting its time into ``handler`` and ``serialize``.
+
+    Everything between the route function returning and the response
+    being ready is response-model validation and JSON encoding.
+    """
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # The request handler reads ``dependant.call`` on every request.
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timings = _timings.get()
+            if timings is not None and timings.handler_done is not None:
+                timings.add("serialize", time.perf_counter() - timings.handler_done)
+                timings.handler_done = None
+            return response
+
+        return timed_handler
+
+
+class ServerTimingMiddleware:
+    """
+    Collect phase timings for a sample of requests.
+
+    Sampled responses get a ``Server-Timing`` header, and one log line with
+    every phase is written when the response is complete.
+    """
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header())
+            await send(message)
+
+        token = _timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            logger.info(
+                "timing method=%s path=%s status=%s %s",
+                scope["method"], scope["path"], status, timings.logfmt(),
+            )
@@ -1,6 +1,8 @@
 import contextlib
 import logging
 
+from fastapi import Request
+
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,6 +11,10 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.config.config import settings
+from src.core.metrics import observe_pool
+from src.core.query_log import watch_queries
+from src.core.timing import instrument_engine
+from src.services.batch_services import BATCH_SESSION
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -16,6 +22,9 @@ logger = logging.getLogger("uvicorn.error")
 class DatabaseSessionManager:
     def __init__(self, url: str):
         self._engine: AsyncEngine | None = create_async_engine(url)
+        instrument_engine(self._engine)
+        observe_pool(self._engine)
+        watch_queries(self._engine, settings.SQL_SLOW_QUERY_THRESHOLD)
         self._session_maker: async_sessionmaker = async_sessionmaker(
             autoflush=False, autocommit=False, bind=self._engine
         )
@@ -42,6 +51,11 @@ class DatabaseSessionManager:
 sessionmanager = DatabaseSessionManager(settings.DB_URL)
 
 
-async def get_db():
+async def get_db(request: Request):
+    # Requests run by /api/batch share the batch's session.
+    session = getattr(request.state, BATCH_SESSION, None)
+    if session is not None:
+        yield session
+        return
     async with sessionmanager.session() as session:
         yield session
\ No newline at end of file
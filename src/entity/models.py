@@ -5,24 +5,35 @@ from enum import Enum
 from sqlalchemy import (
     String, 
     DateTime, 
+    SmallInteger,
     func, 
     Date,
     Text,
     ForeignKey,
     Boolean,
+    Index,
     Enum as SqlEnum
 )
 from sqlalchemy.orm import (
     DeclarativeBase, 
     Mapped, 
     mapped_column, 
-    relationship
+    relationship,
+    query_expression,
+    validates
 )
 
 from src.config import constants
 from src.config import messages
 
 
+def birthday_key(birthday: date | None) -> int | None:
+    """Encode a birthday as month * 100 + day, e.g. 1231 for December 31."""
+    if birthday is None:
+        return None
+    return birthday.month * 100 + birthday.day
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
@@ -31,6 +42,12 @@ class Base(DeclarativeBase):
 class Contact(Base):
     """Represents a contact in the system."""
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_email", "user_id", "email", unique=True),
+        Index("ix_contacts_user_id_birthday_mmdd", "user_id", "birthday_mmdd"),
+        Index("ix_contacts_user_id_updated_at", "user_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     first_name: Mapped[str] = mapped_column(
@@ -46,8 +63,6 @@ class Contact(Base):
     email: Mapped[str] = mapped_column(
         String(constants.EMAIL_MIN_LENGTH), 
         nullable=False,
-        unique=True,
-        index=True,
         comment=messages.contact_schema_email.get('en')
     )
     phone: Mapped[str | None] = mapped_column(
@@ -60,6 +75,11 @@ class Contact(Base):
         nullable=True,
         comment=messages.contact_schema_birthday.get('en')
     )
+    birthday_mmdd: Mapped[int | None] = mapped_column(
+        SmallInteger,
+        nullable=True,
+        comment=messages.contact_schema_birthday_mmdd.get('en')
+    )
     additional_info: Mapped[str | None] = mapped_column(
         String(255), 
         nullable=True,
@@ -77,9 +97,36 @@ class Contact(Base):
         comment=messages.contact_schema_updated_at.get('en')
     )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
-    user: Mapped["User"] = relationship("User", backref="contacts", lazy="joined")
+    # Never loaded implicitly; opt in with selectinload/joinedload.
+    user: Mapped["User"] = relationship("User", backref="contacts", lazy="raise")
+    search_rank: Mapped[float | None] = query_expression()
+
+    @validates("birthday")
+    def _set_birthday_mmdd(self, key: str, value: date | None) -> date | None:
+        """Keep the indexed birthday key in sync with the birthday."""
+        self.birthday_mmdd = birthday_key(value)
+        return value
     
 
+class DeletedContact(Base):
+    """Tombstone of a deleted contact, kept for delta sync."""
+    __tablename__ = "deleted_contacts"
+    __table_args__ = (
+        Index(
+            "ix_deleted_contacts_user_id_deleted_at",
+            "user_id", "deleted_at", "id"
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    contact_id: Mapped[int] = mapped_column(nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), nullable=False
+    )
+
+
 class UserRole(str, Enum):
     """Represents a user role in the system."""
     USER = "USER"
@@ -1,68 +1,325 @@
 import logging
-from datetime import date
-from typing import Sequence
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
 
-from sqlalchemy import select, or_, func, asc
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    or_,
+    and_,
+    func,
+    case,
+    tuple_,
+    any_,
+    bindparam,
+    Integer,
+    literal_column,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_expression
 
-from src.entity.models import Contact, User
+from src.entity.models import Contact, DeletedContact, User, birthday_key
 from src.schemas.contact_schema import ContactSchema, ContactUpdateSchema
 
 
 logger = logging.getLogger("uvicorn.error")
 
+# Table columns of ``contacts``; statements built only from these are
+# executed as Core statements even through the ORM session.
+CONTACT_COLUMNS = Contact.__table__.c
+
+# Columns an upsert overwrites; ``email`` is the conflict key.
+UPSERT_COLUMNS = (
+    "first_name",
+    "last_name",
+    "phone",
+    "birthday",
+    "birthday_mmdd",
+    "additional_info",
+)
+
 
 class ContactRepository:
     """Contact repository."""
     def __init__(self, session: AsyncSession):
         self.db = session
 
+    def _is_postgresql(self) -> bool:
+        """Check whether the session is bound to PostgreSQL."""
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _insert(self):
+        """INSERT construct of the bound dialect, for ON CONFLICT support."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(Contact)
+        if dialect == "sqlite":
+            return sqlite.insert(Contact)
+        return insert(Contact)
+
+    def _ids_condition(self, ids: Sequence[int]):
+        """
+        Match contact IDs from a list.
+
+        PostgreSQL gets ``id = ANY(:ids)`` with a single array parameter,
+        so the statement is the same whatever the number of IDs.
+        """
+        if self._is_postgresql():
+            return Contact.id == any_(
+                bindparam("ids", list(ids), type_=postgresql.ARRAY(Integer))
+            )
+        return Contact.id.in_(ids)
+
+    def _search_condition(self, query: str):
+        """Case-insensitive substring match on names and email."""
+        escaped = query.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        pattern = f"%{escaped}%"
+        return or_(
+            CONTACT_COLUMNS.first_name.ilike(pattern, escape="/"),
+            CONTACT_COLUMNS.last_name.ilike(pattern, escape="/"),
+            CONTACT_COLUMNS.email.ilike(pattern, escape="/"),
+        )
+
+    def _bulk_conditions(
+            self,
+            user: User,
+            ids: Sequence[int] | None,
+            filters: dict | None
+    ) -> list:
+        """WHERE clauses selecting the user's contacts by IDs or filter."""
+        conditions = [Contact.user_id == user.id]
+        if ids is not None:
+            conditions.append(self._ids_condition(ids))
+        for field, value in (filters or {}).items():
+            if field == "query":
+                conditions.append(self._search_condition(value))
+            else:
+                conditions.append(getattr(Contact, field) == value)
+        return conditions
+
+    @staticmethod
+    def _select(fields: Sequence[str] | None, *required: str):
+        """
+        SELECT of whole contacts, or only of ``fields`` followed by the
+        ``required`` columns pagination needs when ``fields`` is given.
+
+        Column selects use table columns, so as long as the criteria do
+        too, rows skip the ORM loading machinery entirely.
+        """
+        if fields is None:
+            return select(Contact)
+        names = dict.fromkeys((*fields, *required))
+        return select(*(CONTACT_COLUMNS[name] for name in names))
+
     async def get_contacts(
             self, 
             limit: int, 
             offset: int, 
-            user: User
-    ) -> Sequence[Contact]:
-        """Get a list of contacts."""
-        stmt = (
-            select(Contact)
-            .filter_by(user_id=user.id)
-            .order_by(Contact.id)
-            .offset(offset)
-            .limit(limit)
+            user: User,
+            sort_by: str = "id",
+            after: tuple | None = None,
+            fields: Sequence[str] | None = None
+    ) -> Sequence:
+        """
+        Get a list of contacts.
+
+        When ``after`` is given as a ``(sort value, id)`` pair the page
+        starts right after that row (keyset pagination) and ``offset``
+        is ignored, so deep pages cost the same as the first one. With
+        ``fields`` only those columns are read and rows are returned
+        instead of ``Contact`` instances.
+        """
+        sort_column = CONTACT_COLUMNS[sort_by]
+        contact_id = CONTACT_COLUMNS.id
+        stmt = self._select(fields, "id", sort_by).where(
+            CONTACT_COLUMNS.user_id == user.id
         )
+        if sort_by == "id":
+            stmt = stmt.order_by(contact_id)
+        else:
+            stmt = stmt.order_by(sort_column, contact_id)
+
+        if after is not None:
+            value, last_id = after
+            if isinstance(value, datetime):
+                value = self._timestamp(value)
+            if sort_by == "id":
+                stmt = stmt.where(contact_id > last_id)
+            else:
+                stmt = stmt.where(
+                    tuple_(sort_column, contact_id) > tuple_(value, last_id)
+                )
+        else:
+            stmt = stmt.offset(offset)
+
+        stmt = stmt.limit(limit)
         contacts = await self.db.execute(stmt)
+        if fields is not None:
+            return contacts.all()
         return contacts.scalars().all()
 
     async def get_contact_by_id(
             self, 
             contact_id: int, 
-            user: User
+            user: User,
+            for_update: bool = False
     ) -> Contact | None:
-        """Get a contact by ID."""
+        """Get a contact by ID, optionally locking the row until commit."""
         stmt = select(Contact).filter_by(id=contact_id, user_id=user.id)
+        if for_update:
+            stmt = stmt.with_for_update(of=Contact)
         contact = await self.db.execute(stmt)
         return contact.scalar_one_or_none()
 
+    async def get_contact_updated_at(
+            self,
+            contact_id: int,
+            user: User
+    ) -> datetime | None:
+        """Get only the ``updated_at`` of a contact, for cheap revalidation."""
+        stmt = select(Contact.updated_at).filter_by(id=contact_id, user_id=user.id)
+        return await self.db.scalar(stmt)
+
+    async def get_contacts_by_ids(
+            self,
+            ids: Sequence[int],
+            user: User
+    ) -> Sequence[Contact]:
+        """Get the user's contacts with the given IDs in one query."""
+        stmt = select(Contact).where(
+            Contact.user_id == user.id, self._ids_condition(ids)
+        )
+        contacts = await self.db.execute(stmt)
+        return contacts.scalars().all()
+
     async def create_contact(
             self, body: ContactSchema, 
             user: User
     ) -> Contact:
         """Create a new contact."""
-        contact = Contact(**body.model_dump(), user=user)
+        contact = Contact(**body.model_dump(), user_id=user.id)
         self.db.add(contact)
         await self.db.commit()
         await self.db.refresh(contact)
         return contact
 
+    @staticmethod
+    def _insert_values(rows: list[dict], user: User) -> list[dict]:
+        """Complete contact rows for a bulk INSERT."""
+        return [
+            {
+                **row,
+                "birthday_mmdd": birthday_key(row.get("birthday")),
+                "user_id": user.id,
+            }
+            for row in rows
+        ]
+
+    async def bulk_create_contacts(
+            self,
+            rows: list[dict],
+            user: User
+    ) -> set[str]:
+        """
+        Insert many contacts in one batched statement.
+
+        Rows whose email already exists for the user are skipped. Returns
+        the emails of the contacts that were inserted.
+        """
+        values = self._insert_values(rows, user)
+        stmt = self._insert()
+        if hasattr(stmt, "on_conflict_do_nothing"):
+            stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "email"])
+        result = await self.db.execute(stmt.returning(Contact.email), values)
+        await self.db.commit()
+        return set(result.scalars().all())
+
+    async def bulk_upsert_contacts(
+            self,
+            rows: list[dict],
+            user: User
+    ) -> dict[str, bool]:
+        """
+        Insert or update many contacts by email in one batched statement.
+
+        Existing contacts are only written when a value differs, so
+        unchanged rows keep their ``updated_at`` and cost no write.
+        Returns ``{email: inserted}`` for every row that was written;
+        unchanged rows are left out.
+        """
+        values = self._insert_values(rows, user)
+        stmt = self._insert()
+        changed = or_(*(
+            getattr(Contact, column).is_distinct_from(stmt.excluded[column])
+            for column in UPSERT_COLUMNS
+        ))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "email"],
+            set_={
+                **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                "updated_at": func.now(),
+            },
+            where=changed,
+        )
+        if self._is_postgresql():
+            # xmax is 0 only for tuples created by this INSERT.
+            stmt = stmt.returning(
+                Contact.email, (literal_column("xmax") == 0).label("inserted")
+            )
+            result = await self.db.execute(stmt, values)
+            written = {email: inserted for email, inserted in result.all()}
+        else:
+            existing = await self.db.execute(
+                select(Contact.email).where(
+                    Contact.user_id == user.id,
+                    Contact.email.in_([row["email"] for row in values]),
+                )
+            )
+            existing = set(existing.scalars().all())
+            result = await self.db.execute(stmt.returning(Contact.email), values)
+            written = {
+                email: email not in existing for email in result.scalars().all()
+            }
+        await self.db.commit()
+        return written
+
+    async def stream_contacts(
+            self,
+            user: User,
+            fields: Sequence[str],
+            batch_size: int
+    ) -> AsyncIterator[Sequence]:
+        """
+        Stream the user's contacts as batches of column tuples.
+
+        Rows come from a server-side cursor ``batch_size`` at a time, so
+        memory use does not grow with the number of contacts.
+        """
+        stmt = (
+            select(*(getattr(Contact, field) for field in fields))
+            .filter_by(user_id=user.id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+
     async def remove_contact(
             self, contact_id: 
             int, user: User
     ) -> Contact | None:
-        """Remove a contact by ID."""
+        """Remove a contact by ID and leave a tombstone for delta sync."""
         contact = await self.get_contact_by_id(contact_id, user)
         if contact:
             await self.db.delete(contact)
+            self.db.add(DeletedContact(contact_id=contact.id, user_id=user.id))
             await self.db.commit()
         return contact
 
@@ -85,25 +342,174 @@ class ContactRepository:
 
         return contact
 
-    async def search_contacts(
-            self, 
-            query: str, 
-            user: User
+    async def bulk_update_contacts(
+            self,
+            user: User,
+            values: dict,
+            ids: Sequence[int] | None = None,
+            filters: dict | None = None
+    ) -> list[int]:
+        """
+        Update the selected contacts in one statement.
+
+        Returns the IDs of the updated contacts.
+        """
+        if "birthday" in values:
+            values = {**values, "birthday_mmdd": birthday_key(values["birthday"])}
+        stmt = (
+            update(Contact)
+            .where(*self._bulk_conditions(user, ids, filters))
+            .values(**values)
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return sorted(result.scalars().all())
+
+    async def bulk_remove_contacts(
+            self,
+            user: User,
+            ids: Sequence[int] | None = None,
+            filters: dict | None = None
+    ) -> list[int]:
+        """
+        Delete the selected contacts in one statement.
+
+        Tombstones for delta sync are written in the same transaction.
+        Returns the IDs of the deleted contacts.
+        """
+        stmt = (
+            delete(Contact)
+            .where(*self._bulk_conditions(user, ids, filters))
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        deleted = sorted(result.scalars().all())
+        if deleted:
+            await self.db.execute(
+                insert(DeletedContact),
+                [{"contact_id": contact_id, "user_id": user.id} for contact_id in deleted],
+            )
+        await self.db.commit()
+        return deleted
+
+    def _timestamp(self, value: datetime):
+        """Bind a timestamp comparable with columns filled by ``func.now()``."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            # SQLite stores CURRENT_TIMESTAMP as text without fractional
+            # seconds; compare against the same format.
+            return func.datetime(value)
+        return value
+
+    async def get_db_now(self) -> datetime:
+        """Current time on the database clock, as timestamp columns store it."""
+        now = func.localtimestamp() if self._is_postgresql() else func.now()
+        return await self.db.scalar(select(now))
+
+    async def get_changed_contacts(
+            self,
+            user: User,
+            after: tuple | None,
+            before: datetime,
+            limit: int
     ) -> Sequence[Contact]:
-        """Search for contacts by query."""
+        """
+        Get contacts changed after an ``(updated_at, id)`` position.
+
+        Only rows with ``updated_at`` before ``before`` are returned, in
+        ``(updated_at, id)`` order, served by the (user_id, updated_at)
+        index.
+        """
+        stmt = select(Contact).where(
+            Contact.user_id == user.id,
+            Contact.updated_at < self._timestamp(before),
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(Contact.updated_at, Contact.id)
+                > tuple_(self._timestamp(after[0]), after[1])
+            )
+        stmt = stmt.order_by(Contact.updated_at, Contact.id).limit(limit)
+        contacts = await self.db.execute(stmt)
+        return contacts.scalars().all()
+
+    async def get_deleted_contacts(
+            self,
+            user: User,
+            after: tuple,
+            before: datetime,
+            limit: int
+    ) -> Sequence[DeletedContact]:
+        """Get tombstones after a ``(deleted_at, id)`` position."""
         stmt = (
-            select(Contact)
-            .filter_by(user_id=user.id)
+            select(DeletedContact)
             .where(
-                or_(
-                    Contact.first_name.ilike(f"%{query}%"),
-                    Contact.last_name.ilike(f"%{query}%"),
-                    Contact.email.ilike(f"%{query}%"),
-                )
+                DeletedContact.user_id == user.id,
+                DeletedContact.deleted_at < self._timestamp(before),
+                tuple_(DeletedContact.deleted_at, DeletedContact.id)
+                > tuple_(self._timestamp(after[0]), after[1]),
             )
-            .order_by(Contact.id)
+            .order_by(DeletedContact.deleted_at, DeletedContact.id)
+            .limit(limit)
+        )
+        tombstones = await self.db.execute(stmt)
+        return tombstones.scalars().all()
+
+    async def search_contacts(
+            self, 
+            query: str, 
+            user: User,
+            limit: int | None = None,
+            after: tuple | None = None,
+            fields: Sequence[str] | None = None
+    ) -> Sequence:
+        """
+        Search for contacts by query.
+
+        On PostgreSQL the ILIKE predicates are served by the pg_trgm GIN
+        index and results are ordered by trigram similarity, best match
+        first; ``Contact.search_rank`` holds the score. Other backends
+        fall back to plain ILIKE ordered by id. ``after`` is the
+        ``(search_rank, id)`` of the last row of the previous page.
+        ``fields`` narrows the SELECT as in ``get_contacts``.
+        """
+        stmt = (
+            self._select(fields, "id")
+            .where(CONTACT_COLUMNS.user_id == user.id)
+            .where(self._search_condition(query))
         )
+
+        if self._is_postgresql():
+            rank = func.greatest(
+                func.similarity(CONTACT_COLUMNS.first_name, query),
+                func.similarity(CONTACT_COLUMNS.last_name, query),
+                func.similarity(CONTACT_COLUMNS.email, query),
+            )
+            if fields is None:
+                stmt = stmt.options(with_expression(Contact.search_rank, rank))
+            else:
+                stmt = stmt.add_columns(rank.label("search_rank"))
+            stmt = stmt.order_by(rank.desc(), CONTACT_COLUMNS.id)
+            if after is not None:
+                last_rank, last_id = after
+                stmt = stmt.where(
+                    or_(
+                        rank < last_rank,
+                        and_(rank == last_rank, CONTACT_COLUMNS.id > last_id),
+                    )
+                )
+        else:
+            stmt = stmt.order_by(CONTACT_COLUMNS.id)
+            if after is not None:
+                stmt = stmt.where(CONTACT_COLUMNS.id > after[1])
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
         contacts = await self.db.execute(stmt)
+        if fields is not None:
+            return contacts.all()
         return contacts.scalars().all()
 
     async def get_contacts_with_birthdays(
@@ -112,17 +518,33 @@ class ContactRepository:
         end_date: date, 
         user: User
     ) -> Sequence[Contact]:
-        """Get contacts with birthdays."""
-        stmt = (
-            select(Contact)
-            .filter_by(user_id=user.id)
-            .where(
-                func.to_char(Contact.birthday, "MM-DD").between(
-                    func.to_char(start_date, "MM-DD"), 
-                    func.to_char(end_date, "MM-DD")
+        """
+        Get contacts with birthdays between two dates, inclusive.
+
+        Compares the indexed ``birthday_mmdd`` key, so windows crossing
+        the new year (e.g. Dec 28 - Jan 4) are split into two ranges.
+        Results are ordered by the next birthday from ``start_date``.
+        """
+        start_key = birthday_key(start_date)
+        end_key = birthday_key(end_date)
+        stmt = select(Contact).filter_by(user_id=user.id)
+
+        if (end_date - start_date).days >= 365:
+            stmt = stmt.where(Contact.birthday_mmdd.is_not(None))
+        elif start_key <= end_key:
+            stmt = stmt.where(Contact.birthday_mmdd.between(start_key, end_key))
+        else:
+            stmt = stmt.where(
+                or_(
+                    Contact.birthday_mmdd >= start_key,
+                    Contact.birthday_mmdd <= end_key,
                 )
             )
-            .order_by(asc(func.to_char(Contact.birthday, "MM-DD")))
+
+        stmt = stmt.order_by(
+            case((Contact.birthday_mmdd >= start_key, 0), else_=1),
+            Contact.birthday_mmdd,
+            Contact.id,
         )
         contacts = await self.db.execute(stmt)
-        return contacts.scalars().all()
\ No newline at end of file
+        return contacts.scalars().all()
@@ -16,9 +16,10 @@ from src.schemas.token import TokenResponse, RefreshTokenRequest
 from src.schemas.user_schema import UserCreate, UserResponse
 from src.services.cache import get_cache_service, CacheService
 from src.services.email_services import send_email
+from src.core.timing import TimedRoute
 
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TimedRoute)
 logger = logging.getLogger("uvicorn.error")
 
 
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import get_db
+from src.services.batch_services import BatchService
+from src.schemas.batch_schema import BatchRequestSchema, BatchResponseItem
+from src.config import messages
+from src.core.depend_service import get_current_user
+from src.entity.models import User
+from src.core.timing import TimedRoute
+
+
+router = APIRouter(prefix="/batch", tags=["batch"], route_class=TimedRoute)
+
+
+@router.post(
+    "",
+    response_model=list[BatchResponseItem],
+    description=messages.batch_description.get("en"),
+)
+async def run_batch(
+    body: BatchRequestSchema,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Run several contacts API requests in one HTTP call.
+
+    Requests run in order, each with the caller's credentials, and each
+    gets its own entry in the response, so one failing request does not
+    stop the rest. Only ``If-Match``, ``If-None-Match`` and
+    ``Content-Type`` headers can be set per request.
+
+    Args:
+        body (BatchRequestSchema): The requests to run.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        list[BatchResponseItem]: Status, headers and body of every request.
+    """
+    batch_service = BatchService(request, db, user)
+    return await batch_service.run(body.requests)
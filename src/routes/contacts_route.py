@@ -1,44 +1,158 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Header,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.services.contact_services import ContactService
+from src.services.contact_io_services import RECORD_PARSERS, iter_lines
+from src.services.cache import CacheService, get_cache_service
+from src.core.etag import contact_etag, etag_matches
+from src.core.responses import RowsJSONResponse
 from src.schemas.contact_schema import (
     ContactSchema, 
     ContactResponse, 
-    ContactUpdateSchema
+    ContactUpdateSchema,
+    ContactImportReport,
+    ContactUpsertReport,
+    ContactBatchResponse,
+    ContactChangesResponse,
+    ContactBulkSchema,
+    ContactBulkUpdateSchema,
+    ContactBulkResult,
     )
-from src.config import messages
+from src.config import messages, constants
 from src.core.depend_service import get_current_user
 from src.entity.models import User
+from src.core.timing import TimedRoute
 
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+router = APIRouter(prefix="/contacts", tags=["contacts"], route_class=TimedRoute)
 logger = logging.getLogger("uvicorn.error")
 
 
+def _parse_records(request: Request):
+    """Pick the record parser for the request body's content type."""
+    content_type = request.headers.get("content-type", "")
+    parser = RECORD_PARSERS.get(content_type.split(";")[0].strip().lower())
+    if parser is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=messages.import_unsupported_media_type.get("en"),
+        )
+    return parser(iter_lines(request.stream()))
+
+
+def _not_modified(if_none_match: str | None, etag: str | None) -> Response | None:
+    """Build a 304 response when the client's copy is still current."""
+    if etag and etag_matches(if_none_match, etag, weak=True):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return None
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Split a ``fields`` parameter, rejecting unknown field names."""
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(fields.split(",")))
+    if not set(names) <= set(constants.CONTACT_RESPONSE_FIELDS):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=messages.contact_unknown_fields.get("en"),
+        )
+    return names
+
+
+def _rows_response(
+        rows,
+        fields: tuple[str, ...],
+        response: Response
+) -> RowsJSONResponse:
+    """Encode column rows straight to JSON, skipping the response model."""
+    headers = {
+        name: response.headers[name]
+        for name in ("ETag", "X-Next-Cursor")
+        if name in response.headers
+    }
+    return RowsJSONResponse(rows, fields, headers=headers)
+
+
 @router.get("/", response_model=list[ContactResponse])
 async def get_contacts(
     limit: int = Query(10, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(
+        None, description=messages.contact_cursor_description.get("en")
+    ),
+    sort_by: Literal[constants.CONTACT_SORT_FIELDS] = Query(
+        "id", description=messages.contact_sort_description.get("en")
+    ),
+    fields: str | None = Query(
+        None,
+        pattern=r"^\w+(,\w+)*$",
+        example="id,first_name,last_name",
+        description=messages.contact_fields_description.get("en"),
+    ),
+    if_none_match: str | None = Header(None),
+    request: Request = None,
+    response: Response = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Get a list of contacts.
 
+    Pages can be walked either with ``offset`` or with the opaque
+    ``cursor`` returned in the ``X-Next-Cursor`` header. When a cursor
+    is given, ``offset`` is ignored. A request whose ``If-None-Match``
+    matches the page's ``ETag`` gets 304 without querying the database.
+    ``fields`` limits both the selected columns and the returned keys.
+    Rows are encoded straight to JSON; ``ContactResponse`` only documents
+    their shape.
+
     Args:
         limit (int): The maximum number of contacts to retrieve.
         offset (int): The number of contacts to skip.
+        cursor (str | None): Cursor of the page to retrieve.
+        sort_by (str): The field to sort contacts by.
+        fields (str | None): Comma-separated fields to return.
+        if_none_match (str | None): ETags of the client's cached copies.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         list[ContactResponse]: A list of contacts.
     """
-    contact_service = ContactService(db)
-    return await contact_service.get_contacts(limit, offset, user)
+    field_names = _parse_fields(fields) or constants.CONTACT_RESPONSE_FIELDS
+    contact_service = ContactService(db, cache)
+    etag = await contact_service.get_contacts_etag(
+        user, request.url.path, request.url.query
+    )
+    if not_modified := _not_modified(if_none_match, etag):
+        return not_modified
+    response.headers["ETag"] = etag
+    contacts, next_cursor = await contact_service.get_contacts_page(
+        limit, offset, user, sort_by=sort_by, cursor=cursor, fields=field_names
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return _rows_response(contacts, field_names, response)
 
 
 @router.get(
@@ -50,26 +164,37 @@ async def get_contacts(
 )
 async def get_contact(
     contact_id: int, 
+    if_none_match: str | None = Header(None),
+    response: Response = None,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
     """
     Get a contact by ID.
 
+    A request whose ``If-None-Match`` matches the contact's ``ETag``
+    gets 304 after reading only ``updated_at``.
+
     Args:
         contact_id (int): The ID of the contact to retrieve.
+        if_none_match (str | None): ETags of the client's cached copies.
         db (AsyncSession): The database session dependency.
 
     Returns:
         ContactResponse: The retrieved contact.
     """
     contact_service = ContactService(db)
+    if if_none_match:
+        etag = await contact_service.get_contact_etag(contact_id, user)
+        if not_modified := _not_modified(if_none_match, etag):
+            return not_modified
     contact = await contact_service.get_contact(contact_id, user)
     if not contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=messages.contact_not_found.get("en"),
         )
+    response.headers["ETag"] = contact_etag(contact.id, contact.updated_at)
     return contact
 
 
@@ -86,43 +211,218 @@ async def search_contacts(
         example="John Doe", 
         description=messages.contact_search_description.get("ua")
         ),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(
+        None, description=messages.contact_cursor_description.get("en")
+    ),
+    fields: str | None = Query(
+        None,
+        pattern=r"^\w+(,\w+)*$",
+        example="id,first_name,last_name",
+        description=messages.contact_fields_description.get("en"),
+    ),
+    if_none_match: str | None = Header(None),
+    request: Request = None,
+    response: Response = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Search contacts by name, last name, or email.
 
+    Results are ranked by similarity to the query, best match first.
+    Rows are encoded straight to JSON as in ``get_contacts``.
+
     Args:
         query (str): The search query.
+        limit (int): The maximum number of contacts to retrieve.
+        cursor (str | None): Cursor of the page to retrieve.
+        fields (str | None): Comma-separated fields to return.
+        if_none_match (str | None): ETags of the client's cached copies.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         list[ContactResponse]: A list of contacts that match the search query.
     """
-    contact_service = ContactService(db)
-    return await contact_service.search_contacts(query, user)
+    field_names = _parse_fields(fields) or constants.CONTACT_RESPONSE_FIELDS
+    contact_service = ContactService(db, cache)
+    etag = await contact_service.get_contacts_etag(
+        user, request.url.path, request.url.query
+    )
+    if not_modified := _not_modified(if_none_match, etag):
+        return not_modified
+    response.headers["ETag"] = etag
+    contacts, next_cursor = await contact_service.search_contacts_page(
+        query, user, limit, cursor=cursor, fields=field_names
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return _rows_response(contacts, field_names, response)
 
 
 @router.get(
     "/upcoming_birthdays/",
     response_model=list[ContactResponse],
-    description="Retrieve contacts with birthdays in the next 7 days.",
+    description=messages.contact_upcoming_birthdays_description.get("en"),
 )
 async def get_upcoming_birthdays(
+    days: int = Query(
+        7,
+        ge=1,
+        le=366,
+        description=messages.contact_upcoming_birthdays_days_description.get("en"),
+    ),
+    if_none_match: str | None = Header(None),
+    response: Response = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
-    Retrieve contacts who have birthdays within the next 7 days.
+    Retrieve contacts who have birthdays within the next ``days`` days.
 
     Args:
+        days (int): Number of days ahead to look for birthdays.
+        if_none_match (str | None): ETags of the client's cached copies.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         list[ContactResponse]: A list of contacts with upcoming birthdays.
     """
+    contact_service = ContactService(db, cache)
+    etag = await contact_service.get_contacts_etag(
+        user, "upcoming_birthdays", days, date.today()
+    )
+    if not_modified := _not_modified(if_none_match, etag):
+        return not_modified
+    response.headers["ETag"] = etag
+    return await contact_service.upcoming_birthdays(user, days)
+
+
+@router.get(
+    "/batch/",
+    response_model=ContactBatchResponse,
+    description=messages.contact_batch_description.get("en"),
+)
+async def get_contacts_batch(
+    ids: str = Query(
+        ...,
+        pattern=r"^\d{1,10}(,\d{1,10})*$",
+        example="1,2,3",
+        description=messages.contact_batch_ids_description.get("en"),
+    ),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Get many contacts by ID with a single query.
+
+    Results follow the order of ``ids``; IDs that do not exist or belong
+    to another user come back as ``None`` and are listed in ``missing``.
+
+    Args:
+        ids (str): Comma-separated contact IDs.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        ContactBatchResponse: The contacts and the missing IDs.
+    """
+    contact_ids = [int(contact_id) for contact_id in ids.split(",")]
+    if len(contact_ids) > constants.CONTACT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=messages.contact_batch_too_many_ids.get("en"),
+        )
+    if max(contact_ids) > constants.CONTACT_ID_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=messages.contact_batch_id_out_of_range.get("en"),
+        )
+    contact_service = ContactService(db)
+    contacts, missing = await contact_service.get_contacts_batch(contact_ids, user)
+    return {"contacts": contacts, "missing": missing}
+
+
+@router.get(
+    "/changes/",
+    response_model=ContactChangesResponse,
+    description=messages.contact_changes_description.get("en"),
+)
+async def get_contact_changes(
+    since: str | None = Query(
+        None, description=messages.contact_changes_since_description.get("en")
+    ),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Get contacts changed or deleted since the previous sync.
+
+    Call without ``since`` for a full sync, then pass the returned
+    ``next_token`` each time. While ``has_more`` is true, call again
+    right away. A 410 response means the token is older than the
+    tombstone retention and a full sync is needed.
+
+    Args:
+        since (str | None): Token from the previous sync.
+        limit (int): The maximum number of contacts and of deletions.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        ContactChangesResponse: Changed contacts, deleted IDs, next token.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.get_changes(user, since, limit)
+
+
+@router.get(
+    "/export/",
+    response_class=StreamingResponse,
+    description=messages.contact_export_description.get("en"),
+)
+async def export_contacts(
+    format: Literal["csv", "ndjson", "vcf"] = Query(
+        "csv", description=messages.contact_export_format_description.get("en")
+    ),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Stream all contacts of the user as a CSV, NDJSON or vCard file.
+
+    Rows are read from a server-side cursor and written out batch by
+    batch, so memory use stays flat however many contacts there are.
+
+    Args:
+        format (str): The export format, ``csv``, ``ndjson`` or ``vcf``.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        StreamingResponse: The chunked export file.
+    """
     contact_service = ContactService(db)
-    return await contact_service.upcoming_birthdays(user)
+    media_type, chunks = contact_service.export_contacts(user, format)
+
+    async def body():
+        # The response body outlives the get_db dependency, so release
+        # the connection here once the last chunk has been sent.
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="contacts.{format}"'
+        },
+    )
 
 
 @router.post(
@@ -133,7 +433,8 @@ async def get_upcoming_birthdays(
 async def create_contact(
     body: ContactSchema, 
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Create a new contact.
@@ -141,60 +442,195 @@ async def create_contact(
     Args:
         body (ContactSchema): The contact data.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         ContactResponse: The created contact.
     """
-    contact_service = ContactService(db)
+    contact_service = ContactService(db, cache)
     return await contact_service.create_contact(body, user)
 
 
+@router.post(
+    "/import",
+    response_model=ContactImportReport,
+    description=messages.contact_import_description.get("en"),
+)
+async def import_contacts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
+):
+    """
+    Import contacts from a streamed CSV, NDJSON or vCard request body.
+
+    Rows are parsed and validated as they arrive and inserted in
+    batches. CSV input needs a header row naming the contact fields.
+
+    Args:
+        request (Request): The request whose body holds the contacts.
+        db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
+
+    Returns:
+        ContactImportReport: Inserted and failed counts with row errors.
+    """
+    records = _parse_records(request)
+    contact_service = ContactService(db, cache)
+    return await contact_service.import_contacts(records, user)
+
+
+@router.post(
+    "/upsert",
+    response_model=ContactUpsertReport,
+    description=messages.contact_upsert_description.get("en"),
+)
+async def upsert_contacts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
+):
+    """
+    Insert or update contacts by email from a streamed request body.
+
+    Accepts the same formats as the import. Contacts whose values did
+    not change are left untouched and counted as unchanged.
+
+    Args:
+        request (Request): The request whose body holds the contacts.
+        db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
+
+    Returns:
+        ContactUpsertReport: Inserted, updated, unchanged and failed counts.
+    """
+    records = _parse_records(request)
+    contact_service = ContactService(db, cache)
+    return await contact_service.import_contacts(records, user, upsert=True)
+
+
+@router.post(
+    "/bulk_update/",
+    response_model=ContactBulkResult,
+    description=messages.contact_bulk_update_description.get("en"),
+)
+async def bulk_update_contacts(
+    body: ContactBulkUpdateSchema,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
+):
+    """
+    Update many contacts with a single statement.
+
+    Args:
+        body (ContactBulkUpdateSchema): The selection and the changes.
+        db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
+
+    Returns:
+        ContactBulkResult: The IDs of the updated contacts.
+    """
+    contact_service = ContactService(db, cache)
+    ids = await contact_service.bulk_update_contacts(body, user)
+    return {"ids": ids}
+
+
+@router.post(
+    "/bulk_delete/",
+    response_model=ContactBulkResult,
+    description=messages.contact_bulk_delete_description.get("en"),
+)
+async def bulk_delete_contacts(
+    body: ContactBulkSchema,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
+):
+    """
+    Delete many contacts with a single statement.
+
+    Args:
+        body (ContactBulkSchema): The selection of contacts to delete.
+        db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
+
+    Returns:
+        ContactBulkResult: The IDs of the deleted contacts.
+    """
+    contact_service = ContactService(db, cache)
+    ids = await contact_service.bulk_remove_contacts(body, user)
+    return {"ids": ids}
+
+
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     contact_id: int, 
     body: ContactUpdateSchema, 
+    if_match: str | None = Header(None),
+    response: Response = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Update a contact by ID.
 
+    With ``If-Match`` the update only happens if the contact still has
+    that ``ETag``; otherwise the response is 412.
+
     Args:
         contact_id (int): The ID of the contact to update.
         body (ContactUpdateSchema): The updated contact data.
+        if_match (str | None): ETag the client last read.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         ContactResponse: The updated contact.
     """
-    contact_service = ContactService(db)
-    contact = await contact_service.update_contact(contact_id, body, user)
+    contact_service = ContactService(db, cache)
+    contact = await contact_service.update_contact(
+        contact_id, body, user, if_match=if_match
+    )
     if not contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=messages.contact_not_found.get("ua"),
         )
+    response.headers["ETag"] = contact_etag(contact.id, contact.updated_at)
     return contact
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact(
     contact_id: int, 
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db), 
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Delete a contact by ID.
 
+    With ``If-Match`` the contact is only deleted if it still has that
+    ``ETag``; otherwise the response is 412.
+
     Args:
         contact_id (int): The ID of the contact to delete.
+        if_match (str | None): ETag the client last read.
         db (AsyncSession): The database session dependency.
+        cache (CacheService): The cache service dependency.
 
     Returns:
         None
     """
-    contact_service = ContactService(db)
-    contact = await contact_service.remove_contact(contact_id, user)
+    contact_service = ContactService(db, cache)
+    contact = await contact_service.remove_contact(
+        contact_id, user, if_match=if_match
+    )
     if not contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
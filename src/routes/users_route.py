@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import (
     APIRouter,
     Depends,
@@ -8,9 +10,6 @@ from fastapi import (
     UploadFile,
     File,
 )
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
 from src.services.auth_services import AuthService, oauth2_scheme
 from src.schemas.user_schema import UserResponse
 from src.schemas.password_schema import ResetPasswordRequestSchema, ResetPasswordSchema
@@ -29,17 +28,15 @@ from src.services.email_services import send_email
 from src.core.email_token import get_email_from_token
 from src.services.upload_file_services import UploadFileService
 from src.config.config import settings
+from src.core.timing import TimedRoute
 
 
 
-router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
+router = APIRouter(prefix="/users", tags=["users"], route_class=TimedRoute)
 
 
 @router.get("/me", response_model=UserResponse)
-@limiter.limit("10/minute")
 async def me(
-    request: Request,
     token: str = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service),
 ):
@@ -105,11 +102,15 @@ async def update_avatar_user(
     user_service: UserService = Depends(get_user_service),
 ):
     """Update avatar user."""
-    avatar_url = UploadFileService(
+    upload_service = UploadFileService(
         settings.CLOUDINARY_NAME, 
         settings.CLOUDINARY_API_KEY, 
         settings.CLOUDINARY_API_SECRET,
-    ).upload_file(file, user.username)
+    )
+    # The Cloudinary SDK is synchronous; keep the upload off the event loop.
+    avatar_url = await asyncio.to_thread(
+        upload_service.upload_file, file, user.username
+    )
     user = await user_service.update_avatar_url(user.email, avatar_url)
     return user
 
@@ -0,0 +1,55 @@
+from typing import Any, Literal
+from urllib.parse import unquote
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.config import messages
+from src.config import constants
+
+
+class BatchRequestItem(BaseModel):
+    """A single request of a batch."""
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(examples=["/api/contacts/?limit=10"])
+    headers: dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+    @field_validator("path")
+    @classmethod
+    def check_path(cls, path: str) -> str:
+        """
+        Only contacts routes, and not streamed ones, can be batched.
+
+        The route is checked decoded, as it is dispatched.
+        """
+        route = unquote(path.split("?", 1)[0])
+        if route != constants.BATCH_PATH_PREFIX and not route.startswith(
+            constants.BATCH_PATH_PREFIX + "/"
+        ):
+            raise ValueError(messages.batch_path_not_allowed.get("en"))
+        if route.rstrip("/") in constants.BATCH_EXCLUDED_PATHS:
+            raise ValueError(messages.batch_path_streamed.get("en"))
+        return path
+
+    @field_validator("headers")
+    @classmethod
+    def check_headers(cls, headers: dict[str, str]) -> dict[str, str]:
+        """Authorization always comes from the batch request itself."""
+        headers = {name.lower(): value for name, value in headers.items()}
+        if not set(headers) <= set(constants.BATCH_FORWARDED_HEADERS):
+            raise ValueError(messages.batch_header_not_allowed.get("en"))
+        return headers
+
+
+class BatchRequestSchema(BaseModel):
+    """Requests to run in order."""
+    requests: list[BatchRequestItem] = Field(
+        min_length=1, max_length=constants.BATCH_MAX_REQUESTS
+    )
+
+
+class BatchResponseItem(BaseModel):
+    """Result of a single batched request."""
+    status: int
+    headers: dict[str, str]
+    body: Any = None
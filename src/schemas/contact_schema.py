@@ -1,7 +1,7 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 from src.config import messages
 from src.config import constants
@@ -84,9 +84,95 @@ class ContactResponse(BaseModel):
     last_name: str
     email: str
     phone: Optional[str]    
-    birthday: date    
-    additional_info: str   
+    birthday: Optional[date]
+    additional_info: Optional[str]
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ContactBatchResponse(BaseModel):
+    """Contacts in the requested order, ``None`` where not found."""
+    contacts: list[Optional[ContactResponse]]
+    missing: list[int]
+
+
+class ContactChangesResponse(BaseModel):
+    """Contacts changed and deleted since a sync token."""
+    contacts: list[ContactResponse]
+    deleted: list[int]
+    next_token: str
+    has_more: bool
+
+
+class ContactImportError(BaseModel):
+    """Error of a single imported row."""
+    row: int
+    error: str
+
+
+class ContactImportReport(BaseModel):
+    """Result of a bulk contact import."""
+    inserted: int
+    failed: int
+    errors: list[ContactImportError]
+
+
+class ContactFilterSchema(BaseModel):
+    """Filter selecting contacts for a bulk operation."""
+    query: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=100,
+        description=messages.contact_search_description.get("en")
+    )
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+
+
+class ContactBulkSchema(BaseModel):
+    """Contacts selected by IDs or by a filter."""
+    ids: Optional[
+        list[Annotated[int, Field(ge=1, le=constants.CONTACT_ID_MAX)]]
+    ] = Field(
+        default=None,
+        min_length=1,
+        max_length=constants.CONTACT_BULK_MAX_IDS,
+    )
+    filter: Optional[ContactFilterSchema] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        """Require exactly one of ``ids`` or a non-empty ``filter``."""
+        has_filter = bool(
+            self.filter and self.filter.model_dump(exclude_none=True)
+        )
+        if (self.ids is None) == (not has_filter):
+            raise ValueError(messages.contact_bulk_selector_required.get("en"))
+        return self
+
+
+class ContactBulkUpdateSchema(ContactBulkSchema):
+    """Changes applied to every selected contact."""
+    changes: ContactUpdateSchema
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        """Reject empty changes and email changes."""
+        if not self.changes.model_fields_set:
+            raise ValueError(messages.contact_bulk_changes_required.get("en"))
+        if "email" in self.changes.model_fields_set:
+            raise ValueError(messages.contact_bulk_email_change.get("en"))
+        return self
+
+
+class ContactBulkResult(BaseModel):
+    """IDs of the contacts affected by a bulk operation."""
+    ids: list[int]
+
+
+class ContactUpsertReport(ContactImportReport):
+    """Result of a bulk contact upsert."""
+    updated: int
+    unchanged: int
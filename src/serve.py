@@ -0,0 +1,105 @@
+"""
+Production entry point: ``python -m src.serve`` or ``contacts-serve``.
+
+Runs ``main:app`` under uvicorn with ``SERVER_WORKERS`` processes. It
+uses uvloop and httptools when they are installed (the ``server`` extra)
+and falls back to asyncio and h11 otherwise. Keep-alive, backlog and
+trusted proxies come from Settings; command-line flags override them.
+With several workers, the cleanup scheduler runs in only one of them.
+"""
+import argparse
+import importlib.util
+import logging
+import logging.config
+import os
+import tempfile
+
+import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+
+from src.config.config import settings
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def pick(requested: str, fast: str, fallback: str) -> str:
+    """``fast`` for ``auto`` when its package is installed, else ``fallback``."""
+    if requested != "auto":
+        return requested
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """Give multiple workers a shared, empty per-pid metrics directory."""
+    directory = settings.METRICS_MULTIPROC_DIR
+    if workers == 1 and not directory:
+        return
+    if not directory:
+        directory = tempfile.mkdtemp(prefix="contacts-metrics-")
+        # Workers are fresh processes that read Settings from the environment.
+        os.environ["METRICS_MULTIPROC_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    # Files from a previous run would be counted as exited workers.
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".json", ".json.tmp")):
+            os.remove(entry.path)
+
+
+def prepare_scheduler_lock(workers: int) -> None:
+    """Have multiple workers elect one of them to run the scheduler."""
+    if workers == 1 or settings.SCHEDULER_LOCK_FILE:
+        return
+    directory = tempfile.mkdtemp(prefix="contacts-scheduler-")
+    os.environ["SCHEDULER_LOCK_FILE"] = os.path.join(directory, "scheduler.lock")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Contacts API.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help="worker processes; 0 means one per CPU",
+    )
+    parser.add_argument("--loop", choices=("auto", "asyncio", "uvloop"), default="auto")
+    parser.add_argument("--http", choices=("auto", "h11", "httptools"), default="auto")
+    return parser.parse_args(argv)
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on, which containers can restrict."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Start the server."""
+    args = parse_args(argv)
+    logging.config.dictConfig(LOGGING_CONFIG)
+    workers = args.workers or cpu_count()
+    loop = pick(args.loop, "uvloop", "asyncio")
+    http = pick(args.http, "httptools", "h11")
+    prepare_metrics_dir(workers)
+    prepare_scheduler_lock(workers)
+    logger.info(f"Starting {workers} worker(s) with loop={loop} http={http}")
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta, timezone
+import asyncio
 import secrets
 import logging
+from typing import Callable, TypeVar
 
 import jwt
 import bcrypt
@@ -13,6 +15,7 @@ from libgravatar import Gravatar
 
 from src.config.config import settings
 from src.config import messages
+from src.core.metrics import BCRYPT_QUEUE_DEPTH
 from src.entity.models import User
 from src.repositories.refresh_token_repository import RefreshTokenRepository
 from src.repositories.user_repository import UserRepository
@@ -25,6 +28,17 @@ logger = logging.getLogger(__name__)
 redis_client = redis.from_url(settings.REDIS_URL)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+T = TypeVar("T")
+
+
+async def run_bcrypt(func: Callable[..., T], *args) -> T:
+    """Run a bcrypt hash or check in a thread, off the event loop."""
+    BCRYPT_QUEUE_DEPTH.inc()
+    try:
+        return await asyncio.to_thread(func, *args)
+    finally:
+        BCRYPT_QUEUE_DEPTH.dec()
+
 
 class AuthService:
     """Authentication service."""
@@ -74,7 +88,9 @@ class AuthService:
                 detail=messages.authentificate_email_not_confirmed.get("en"),
             )
         """Check if password is correct."""
-        if not self._verify_password(password, user.hash_password):
+        if not await run_bcrypt(
+            self._verify_password, password, user.hash_password
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=messages.authenticate_wrong_user.get("en"),
@@ -102,9 +118,11 @@ class AuthService:
             g = Gravatar(user_data.email)
             avatar = g.get_image()
         except Exception as e:
-            print(e)
+            logger.warning(f"Gravatar lookup failed: {e}")
 
-        hashed_password = self._hash_password(user_data.password)
+        hashed_password = await run_bcrypt(
+            self._hash_password, user_data.password
+        )
         user = await self.user_repository.create_user(
             user_data, 
             hashed_password,
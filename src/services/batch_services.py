@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from urllib.parse import unquote
+
+import orjson
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Message, Scope
+
+from src.config import constants
+from src.entity.models import User
+from src.schemas.batch_schema import BatchRequestItem
+
+
+logger = logging.getLogger("uvicorn.error")
+
+# Scope state keys carrying the batch's session and user into the requests
+# it runs; their presence marks a batched request.
+BATCH_SESSION = "batch_session"
+BATCH_USER = "batch_user"
+
+
+def is_batched(scope: Scope) -> bool:
+    """Whether the request is run by /api/batch on behalf of a batch."""
+    return BATCH_SESSION in scope.get("state", {})
+
+
+class BatchService:
+    """
+    Run batched requests in-process through the ASGI app.
+
+    Each request goes through the full middleware stack and router, as if
+    it had arrived on its own, but requests run one after another and
+    reuse the batch's user and database session (see ``get_db`` and
+    ``get_current_user``), so there is one token check and one connection
+    checkout per batch.
+    """
+    def __init__(self, request: Request, db: AsyncSession, user: User):
+        self.request = request
+        self.db = db
+        self.user = user
+
+    async def run(self, items: list[BatchRequestItem]) -> list[dict]:
+        """Run ``items`` in order and collect their responses."""
+        results = []
+        for item in items:
+            result = await self._dispatch(item)
+            if result["status"] >= 400:
+                # Do not leave a failed transaction to the next request.
+                await self.db.rollback()
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _encode_body(item: BatchRequestItem) -> tuple[bytes, str | None]:
+        """Request body bytes and content type of a batched request."""
+        content_type = item.headers.get("content-type")
+        if item.body is None:
+            return b"", content_type
+        if isinstance(item.body, str) and content_type and "json" not in content_type:
+            return item.body.encode(), content_type
+        return orjson.dumps(item.body), content_type or "application/json"
+
+    def _scope(self, item: BatchRequestItem, content_type: str | None) -> dict:
+        """ASGI scope of a batched request, derived from the batch's own."""
+        parent = self.request.scope
+        path, _, query = item.path.partition("?")
+        headers = [
+            (name.encode(), value.encode())
+            for name, value in item.headers.items()
+            if name != "content-type"
+        ]
+        if content_type:
+            headers.append((b"content-type", content_type.encode()))
+        authorization = self.request.headers.get("authorization")
+        if authorization:
+            headers.append((b"authorization", authorization.encode()))
+        return {
+            "type": "http",
+            "asgi": parent.get("asgi", {"version": "3.0"}),
+            "http_version": parent.get("http_version", "1.1"),
+            "method": item.method,
+            "scheme": parent.get("scheme", "http"),
+            "server": parent.get("server"),
+            "client": parent.get("client"),
+            "root_path": parent.get("root_path", ""),
+            "path": unquote(path),
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            "state": {
+                **parent.get("state", {}),
+                BATCH_SESSION: self.db,
+                BATCH_USER: self.user,
+            },
+        }
+
+    async def _dispatch(self, item: BatchRequestItem) -> dict:
+        """Run one request and capture its response."""
+        body, content_type = self._encode_body(item)
+        scope = self._scope(item, content_type)
+        finished = asyncio.Event()
+        body_sent = False
+        status = 500
+        raw_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming responses watch for a disconnect; only report one
+            # once the response is complete.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status, raw_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                raw_headers = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.request.app(scope, receive, send)
+        except Exception:
+            # ServerErrorMiddleware has already produced the 500 response.
+            logger.exception("Batched request %s %s failed", item.method, item.path)
+        finally:
+            finished.set()
+
+        headers = {}
+        for name, value in raw_headers:
+            name = name.decode().lower()
+            if name in constants.BATCH_RETURNED_HEADERS:
+                headers[name] = value.decode()
+        raw = b"".join(chunks)
+        if not raw:
+            response_body = None
+        elif headers.get("content-type", "").startswith("application/json"):
+            response_body = orjson.loads(raw)
+        else:
+            response_body = raw.decode()
+        return {"status": status, "headers": headers, "body": response_body}
@@ -1,6 +1,10 @@
+import time
+
 import redis.asyncio as Redis
 from datetime import datetime, timezone
 from src.config.config import settings
+from src.core.metrics import CACHE_REQUESTS
+from src.core.timing import TimedRedis
 from src.entity.models import User
 from src.schemas.user_schema import UserResponse
 
@@ -9,7 +13,7 @@ class CacheService:
     """Redis cache service."""
     def __init__(self):
         """Initialize Redis client with application settings."""
-        self.redis: Redis = Redis.from_url(settings.REDIS_URL)
+        self.redis: Redis = TimedRedis.from_url(settings.REDIS_URL)
         self.cache_ttl: int = settings.REDIS_TTL
 
     async def is_token_revoked(self, token: str) -> bool:
@@ -28,6 +32,7 @@ class CacheService:
     async def get_cached_user(self, username: str) -> User | None:
         """Get user data from cache."""
         cached_user = await self.redis.get(f"user:{username}")
+        CACHE_REQUESTS.inc(cache="user", result="hit" if cached_user else "miss")
         if cached_user:
             try:
                 if isinstance(cached_user, bytes):
@@ -50,6 +55,25 @@ class CacheService:
         """Delete user data from cache."""
         await self.redis.delete(f"user:{username}")
 
+    async def get_contacts_version(self, user_id: int) -> int:
+        """Get the version of a user's contacts."""
+        key = f"contacts-version:{user_id}"
+        # Seed from the clock so a lost key never repeats an old version.
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, time.time_ns(), nx=True)
+            pipe.get(key)
+            _, version = await pipe.execute()
+        return int(version)
+
+    async def bump_contacts_version(self, user_id: int) -> int:
+        """Mark a user's contacts as changed."""
+        key = f"contacts-version:{user_id}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, time.time_ns(), nx=True)
+            pipe.incr(key)
+            _, version = await pipe.execute()
+        return version
+
 
 cache_service = CacheService()
 
@@ -0,0 +1,355 @@
+import codecs
+import csv
+import io
+import json
+import re
+from typing import AsyncIterator, Sequence
+
+from src.config import constants, messages
+
+
+# (row number, parsed record or None, error message or None)
+ParsedRow = tuple[int, dict | None, str | None]
+
+
+async def iter_lines(
+        chunks: AsyncIterator[bytes],
+        max_length: int = constants.IMPORT_MAX_RECORD_LENGTH
+) -> AsyncIterator[str | None]:
+    """
+    Split a stream of byte chunks into decoded text lines.
+
+    A line longer than ``max_length`` characters is yielded as ``None``;
+    it is dropped as it arrives rather than buffered whole.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    overlong = False
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if overlong or len(line) > max_length:
+                overlong = False
+                yield None
+            else:
+                yield line.rstrip("\r")
+        if len(buffer) > max_length:
+            overlong, buffer = True, ""
+    buffer += decoder.decode(b"", final=True)
+    if overlong or len(buffer) > max_length:
+        yield None
+    elif buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_csv_records(
+        lines: AsyncIterator[str | None],
+        max_length: int = constants.IMPORT_MAX_RECORD_LENGTH
+) -> AsyncIterator[ParsedRow]:
+    """Parse CSV lines with a header row into per-row records."""
+    header = None
+    pending = None
+    quotes = 0
+    row = 0
+    async for line in lines:
+        if line is None or (
+            pending is not None and len(pending) + len(line) >= max_length
+        ):
+            pending, quotes = None, 0
+            row += 1
+            yield row, None, messages.import_record_too_long.get("en")
+            continue
+        pending = line if pending is None else f"{pending}\n{line}"
+        quotes += line.count('"')
+        # A quoted field may contain newlines; wait for its closing quote.
+        if quotes % 2:
+            continue
+        record_line, pending, quotes = pending, None, 0
+        if not record_line.strip():
+            continue
+        values = next(csv.reader([record_line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, messages.import_column_count.get("en").format(
+                expected=len(header), got=len(values)
+            )
+            continue
+        yield row, {
+            name: value for name, value in zip(header, values) if value != ""
+        }, None
+    if pending is not None:
+        yield row + 1, None, messages.import_unterminated_quote.get("en")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str | None]) -> AsyncIterator[ParsedRow]:
+    """Parse newline-delimited JSON objects into per-row records."""
+    row = 0
+    async for line in lines:
+        if line is None:
+            row += 1
+            yield row, None, messages.import_record_too_long.get("en")
+            continue
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row, None, messages.import_invalid_json.get("en")
+            continue
+        if not isinstance(record, dict):
+            yield row, None, messages.import_invalid_json.get("en")
+            continue
+        yield row, record, None
+
+
+def _unescape(value: str) -> str:
+    """Undo vCard text escaping (``\\n``, ``\\,``, ``\\;``, ``\\\\``)."""
+    return re.sub(
+        r"\\(.)",
+        lambda m: "\n" if m.group(1) in "nN" else m.group(1),
+        value,
+    )
+
+
+def _escape(value: str) -> str:
+    """Escape text for a vCard property value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _split_components(value: str) -> list[str]:
+    """Split a structured value (e.g. ``N``) on unescaped semicolons."""
+    parts, current, i = [], [], 0
+    while i < len(value):
+        if value[i] == "\\" and i + 1 < len(value):
+            current.append(value[i:i + 2])
+            i += 2
+            continue
+        if value[i] == ";":
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(value[i])
+        i += 1
+    parts.append("".join(current))
+    return [_unescape(part).strip() for part in parts]
+
+
+def _parse_property(line: str) -> tuple[str, str] | None:
+    """Split ``[group.]NAME;PARAMS:value`` into an upper-case name and value."""
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            name = line[:i].split(";", 1)[0].rsplit(".", 1)[-1]
+            return name.strip().upper(), line[i + 1:]
+    return None
+
+
+def _parse_birthday(value: str) -> str | None:
+    """Normalize a ``BDAY`` value to ISO format; year-less dates are dropped."""
+    value = value.strip().split("T", 1)[0]
+    if not value or value.startswith("--"):
+        return None
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
+
+
+def _card_record(properties: list[tuple[str, str]]) -> dict:
+    """Map the properties of one card to contact fields."""
+    record = {}
+    full_name = None
+    has_name = False
+    for name, value in properties:
+        if name == "N" and not has_name:
+            has_name = True
+            components = _split_components(value) + ["", ""]
+            if components[0]:
+                record["last_name"] = components[0]
+            if components[1]:
+                record["first_name"] = components[1]
+        elif name == "FN":
+            full_name = full_name or _unescape(value).strip()
+        elif name == "EMAIL":
+            record.setdefault("email", _unescape(value).strip().removeprefix("mailto:"))
+        elif name == "TEL":
+            record.setdefault("phone", _unescape(value).strip().removeprefix("tel:"))
+        elif name == "BDAY":
+            birthday = _parse_birthday(value)
+            if birthday:
+                record.setdefault("birthday", birthday)
+        elif name == "NOTE":
+            record.setdefault("additional_info", _unescape(value))
+    if full_name:
+        first, _, last = full_name.partition(" ")
+        if first:
+            record.setdefault("first_name", first)
+        if last.strip():
+            record.setdefault("last_name", last.strip())
+    return record
+
+
+async def _unfold(
+        lines: AsyncIterator[str | None],
+        max_length: int = constants.IMPORT_MAX_RECORD_LENGTH
+) -> AsyncIterator[str | None]:
+    """
+    Join folded vCard lines (continuations start with a space or tab).
+
+    Like ``iter_lines``, yields ``None`` for a line over ``max_length``.
+    """
+    pending = None
+    overlong = False
+    async for line in lines:
+        if (pending is not None or overlong) and line is not None and line[:1] in (" ", "\t"):
+            if pending is not None and len(pending) + len(line) > max_length:
+                pending, overlong = None, True
+            elif pending is not None:
+                pending += line[1:]
+            continue
+        if overlong:
+            yield None
+        elif pending is not None:
+            yield pending
+        pending, overlong = line, line is None
+    if overlong:
+        yield None
+    elif pending is not None:
+        yield pending
+
+
+async def iter_vcard_records(
+        lines: AsyncIterator[str | None],
+        max_length: int = constants.IMPORT_MAX_RECORD_LENGTH
+) -> AsyncIterator[ParsedRow]:
+    """Parse vCard 3.0/4.0 cards into per-card records."""
+    row = 0
+    properties = None
+    async for line in _unfold(lines, max_length):
+        if line is None:
+            # The card is dropped; its remaining properties are ignored.
+            if properties is not None:
+                yield row, None, messages.import_record_too_long.get("en")
+                properties = None
+            continue
+        parsed = _parse_property(line)
+        if parsed is None:
+            continue
+        name, value = parsed
+        if name == "BEGIN" and value.strip().upper() == "VCARD":
+            if properties is not None:
+                yield row, None, messages.import_unterminated_vcard.get("en")
+            row += 1
+            properties = []
+        elif name == "END" and value.strip().upper() == "VCARD":
+            if properties is not None:
+                yield row, _card_record(properties), None
+            properties = None
+        elif properties is not None:
+            properties.append(parsed)
+    if properties is not None:
+        yield row, None, messages.import_unterminated_vcard.get("en")
+
+
+RECORD_PARSERS = {
+    "text/csv": iter_csv_records,
+    "application/x-ndjson": iter_ndjson_records,
+    "application/ndjson": iter_ndjson_records,
+    "text/vcard": iter_vcard_records,
+    "text/x-vcard": iter_vcard_records,
+}
+
+
+async def iter_csv_chunks(
+        fields: Sequence[str],
+        batches: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as CSV, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(fields)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+async def iter_ndjson_chunks(
+        fields: Sequence[str],
+        batches: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as NDJSON, one chunk per batch."""
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(fields, row)), default=str) + "\n"
+            for row in rows
+        ).encode()
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets, as vCard requires."""
+    if len(line.encode()) <= 75:
+        return line + "\r\n"
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+
+def _vcard(contact: dict) -> str:
+    """Render one contact as a vCard 3.0 card."""
+    first_name = contact.get("first_name") or ""
+    last_name = contact.get("last_name") or ""
+    lines = [
+        "BEGIN:VCARD",
+        "VERSION:3.0",
+        f"N:{_escape(last_name)};{_escape(first_name)};;;",
+        f"FN:{_escape(' '.join(filter(None, (first_name, last_name))))}",
+    ]
+    if contact.get("email"):
+        lines.append(f"EMAIL;TYPE=INTERNET:{_escape(contact['email'])}")
+    if contact.get("phone"):
+        lines.append(f"TEL:{_escape(contact['phone'])}")
+    if contact.get("birthday"):
+        lines.append(f"BDAY:{contact['birthday']}")
+    if contact.get("additional_info"):
+        lines.append(f"NOTE:{_escape(contact['additional_info'])}")
+    lines.append("END:VCARD")
+    return "".join(_fold(line) for line in lines)
+
+
+async def iter_vcard_chunks(
+        fields: Sequence[str],
+        batches: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as vCard 3.0 cards, one chunk per batch."""
+    async for rows in batches:
+        yield "".join(_vcard(dict(zip(fields, row))) for row in rows).encode()
+
+
+# format -> (media type, chunk writer)
+EXPORT_WRITERS = {
+    "csv": ("text/csv", iter_csv_chunks),
+    "ndjson": ("application/x-ndjson", iter_ndjson_chunks),
+    "vcf": ("text/vcard", iter_vcard_chunks),
+}
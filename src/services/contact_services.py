@@ -1,21 +1,86 @@
-from datetime import date, timedelta
+import math
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Sequence
+
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repositories.contacts_repository import ContactRepository
-from src.schemas.contact_schema import ContactSchema, ContactUpdateSchema
+from src.schemas.contact_schema import (
+    ContactSchema,
+    ContactUpdateSchema,
+    ContactBulkSchema,
+    ContactBulkUpdateSchema,
+)
 from src.entity.models import User
+from src.core.pagination import encode_cursor, decode_cursor
+from src.core.etag import make_etag, contact_etag, etag_matches
+from src.config import messages, constants
+from src.config.config import settings
+from src.services.contact_io_services import ParsedRow, EXPORT_WRITERS
+from src.services.cache import CacheService
 from fastapi import HTTPException, status
 
 
 class ContactService:
     """Contact service."""
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: CacheService | None = None):
         self.contact_repository = ContactRepository(db)
+        self.cache = cache
+
+    async def _contacts_changed(self, user: User) -> None:
+        """Bump the user's contacts version once per write."""
+        if self.cache is not None:
+            await self.cache.bump_contacts_version(user.id)
 
     async def get_contacts(self, limit: int, offset: int, user: User):
         """Get a list of contacts."""
         return await self.contact_repository.get_contacts(limit, offset, user)
 
+    async def get_contacts_page(
+            self,
+            limit: int,
+            offset: int,
+            user: User,
+            sort_by: str = "id",
+            cursor: str | None = None,
+            fields: Sequence[str] | None = None
+    ):
+        """
+        Get a page of contacts and the cursor of the next page.
+
+        With ``fields`` the page holds column rows, not ``Contact``s.
+        """
+        after = self._decode_cursor(cursor, sort_by) if cursor else None
+        contacts = await self.contact_repository.get_contacts(
+            limit, offset, user, sort_by=sort_by, after=after, fields=fields
+        )
+        next_cursor = None
+        if len(contacts) == limit:
+            last = contacts[-1]
+            value = getattr(last, sort_by)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            next_cursor = encode_cursor({"s": sort_by, "v": value, "id": last.id})
+        return contacts, next_cursor
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_by: str) -> tuple:
+        """Decode a contacts cursor into a (sort value, id) pair."""
+        payload = decode_cursor(cursor)
+        try:
+            if payload["s"] != sort_by:
+                raise ValueError(payload["s"])
+            value, last_id = payload["v"], int(payload["id"])
+            if sort_by in ("created_at", "updated_at"):
+                value = datetime.fromisoformat(value)
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=messages.invalid_cursor.get("en"),
+            )
+        return value, last_id
+
     async def get_contact(self, contact_id: int, user: User):
         """Get a contact by ID."""
         contact = await self.contact_repository.get_contact_by_id(contact_id, user)
@@ -25,28 +90,333 @@ class ContactService:
                 detail="Contact not found"
             )
         return contact
-    
-    
+
+    async def get_contact_etag(self, contact_id: int, user: User) -> str | None:
+        """Entity tag of a contact without loading the row."""
+        updated_at = await self.contact_repository.get_contact_updated_at(
+            contact_id, user
+        )
+        if updated_at is None:
+            return None
+        return contact_etag(contact_id, updated_at)
+
+    async def get_contacts_etag(self, user: User, *parts) -> str | None:
+        """
+        Entity tag of a contact list view.
+
+        Derived from the user's contacts version and the view's ``parts``,
+        which must name the view (e.g. its path) as well as its query.
+        Read it before running the query: a concurrent write then yields
+        a newer body under an older tag, which only costs a later cache
+        miss.
+        """
+        if self.cache is None:
+            return None
+        version = await self.cache.get_contacts_version(user.id)
+        return make_etag("contacts", user.id, version, *parts)
+
+    async def _check_if_match(
+            self,
+            contact_id: int,
+            user: User,
+            if_match: str | None
+    ) -> None:
+        """Lock the contact and compare it with an ``If-Match`` header."""
+        if if_match is None:
+            return
+        contact = await self.contact_repository.get_contact_by_id(
+            contact_id, user, for_update=True
+        )
+        if contact and not etag_matches(
+            if_match, contact_etag(contact.id, contact.updated_at)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=messages.contact_precondition_failed.get("en"),
+            )
+
+    async def get_contacts_batch(self, ids: list[int], user: User):
+        """
+        Get contacts by IDs, aligned with ``ids``.
+
+        Returns the contacts with ``None`` for every ID that was not
+        found, and the list of missing IDs.
+        """
+        contacts = await self.contact_repository.get_contacts_by_ids(
+            list(dict.fromkeys(ids)), user
+        )
+        by_id = {contact.id: contact for contact in contacts}
+        aligned = [by_id.get(contact_id) for contact_id in ids]
+        missing = [contact_id for contact_id in ids if contact_id not in by_id]
+        return aligned, missing
 
     async def create_contact(self, body: ContactSchema, user: User):
         """Create a new contact."""
-        return await self.contact_repository.create_contact(body, user)
+        contact = await self.contact_repository.create_contact(body, user)
+        await self._contacts_changed(user)
+        return contact
+
+    async def import_contacts(
+            self,
+            records: AsyncIterator[ParsedRow],
+            user: User,
+            upsert: bool = False
+    ) -> dict:
+        """
+        Validate streamed records and insert them in batches.
 
-    async def remove_contact(self, contact_id: int, user: User):
+        Returns counts of inserted and failed rows with a per-row error
+        report (capped at ``CONTACT_IMPORT_MAX_ERRORS`` entries). With
+        ``upsert`` existing contacts are matched by email and updated;
+        the report then also counts updated and unchanged rows.
+        """
+        report = {"inserted": 0, "failed": 0, "errors": []}
+        if upsert:
+            report.update(updated=0, unchanged=0)
+        batch: list[tuple[int, dict]] = []
+
+        def fail(row: int, error: str):
+            report["failed"] += 1
+            if len(report["errors"]) < settings.CONTACT_IMPORT_MAX_ERRORS:
+                report["errors"].append({"row": row, "error": error})
+
+        async def flush():
+            seen: set[str] = set()
+            unique = []
+            duplicate = messages.import_duplicate_email.get("en")
+            if upsert:
+                duplicate = messages.upsert_duplicate_email.get("en")
+            for row, values in batch:
+                if values["email"] in seen:
+                    fail(row, duplicate)
+                else:
+                    seen.add(values["email"])
+                    unique.append((row, values))
+            rows = [values for _, values in unique]
+            batch.clear()
+            if upsert:
+                written = await self.contact_repository.bulk_upsert_contacts(
+                    rows, user
+                )
+                inserted = sum(written.values())
+                report["inserted"] += inserted
+                report["updated"] += len(written) - inserted
+                report["unchanged"] += len(rows) - len(written)
+                return
+            inserted = await self.contact_repository.bulk_create_contacts(
+                rows, user
+            )
+            report["inserted"] += len(inserted)
+            for row, values in unique:
+                if values["email"] not in inserted:
+                    fail(row, duplicate)
+
+        try:
+            async for row, record, error in records:
+                if error is None:
+                    try:
+                        contact = ContactSchema.model_validate(record)
+                    except ValidationError as e:
+                        error = "; ".join(
+                            f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                            for err in e.errors()
+                        )
+                if error is not None:
+                    fail(row, error)
+                    continue
+                batch.append((row, contact.model_dump()))
+                if len(batch) >= settings.CONTACT_IMPORT_BATCH_SIZE:
+                    await flush()
+            if batch:
+                await flush()
+        finally:
+            if report["inserted"] or report.get("updated"):
+                await self._contacts_changed(user)
+        return report
+
+    def export_contacts(
+            self,
+            user: User,
+            format: str = "csv"
+    ) -> tuple[str, AsyncIterator[bytes]]:
+        """Return the media type and encoded chunks of a contacts export."""
+        media_type, writer = EXPORT_WRITERS[format]
+        batches = self.contact_repository.stream_contacts(
+            user,
+            constants.CONTACT_EXPORT_FIELDS,
+            settings.CONTACT_EXPORT_BATCH_SIZE,
+        )
+        return media_type, writer(constants.CONTACT_EXPORT_FIELDS, batches)
+
+    async def remove_contact(
+            self,
+            contact_id: int,
+            user: User,
+            if_match: str | None = None
+    ):
         """Remove a contact by ID."""
         await self.get_contact(contact_id, user)  
-        return await self.contact_repository.remove_contact(contact_id, user)
+        await self._check_if_match(contact_id, user, if_match)
+        contact = await self.contact_repository.remove_contact(contact_id, user)
+        if contact:
+            await self._contacts_changed(user)
+        return contact
 
-    async def update_contact(self, contact_id: int, body: ContactUpdateSchema, user: User):
+    async def update_contact(
+            self,
+            contact_id: int,
+            body: ContactUpdateSchema,
+            user: User,
+            if_match: str | None = None
+    ):
         """Update a contact by ID."""
-        return await self.contact_repository.update_contact(contact_id, body, user)
+        await self._check_if_match(contact_id, user, if_match)
+        contact = await self.contact_repository.update_contact(contact_id, body, user)
+        if contact:
+            await self._contacts_changed(user)
+        return contact
+
+    async def bulk_update_contacts(
+            self,
+            body: ContactBulkUpdateSchema,
+            user: User
+    ) -> list[int]:
+        """Apply the same changes to the selected contacts."""
+        ids = await self.contact_repository.bulk_update_contacts(
+            user,
+            body.changes.model_dump(exclude_unset=True),
+            ids=body.ids,
+            filters=body.filter.model_dump(exclude_none=True) if body.filter else None,
+        )
+        if ids:
+            await self._contacts_changed(user)
+        return ids
+
+    async def bulk_remove_contacts(
+            self,
+            body: ContactBulkSchema,
+            user: User
+    ) -> list[int]:
+        """Delete the selected contacts."""
+        ids = await self.contact_repository.bulk_remove_contacts(
+            user,
+            ids=body.ids,
+            filters=body.filter.model_dump(exclude_none=True) if body.filter else None,
+        )
+        if ids:
+            await self._contacts_changed(user)
+        return ids
 
     async def search_contacts(self, query: str, user: User):
         """Search for contacts by query."""
         return await self.contact_repository.search_contacts(query, user)
 
-    async def upcoming_birthdays(self, user: User):
-        """Get contacts with upcoming birthdays."""
+    async def search_contacts_page(
+            self,
+            query: str,
+            user: User,
+            limit: int,
+            cursor: str | None = None,
+            fields: Sequence[str] | None = None
+    ):
+        """
+        Search for a page of contacts and the cursor of the next page.
+
+        With ``fields`` the page holds column rows, not ``Contact``s.
+        """
+        after = None
+        if cursor:
+            payload = decode_cursor(cursor)
+            try:
+                rank = float(payload["r"])
+                if not math.isfinite(rank):
+                    raise ValueError(rank)
+                after = (rank, int(payload["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=messages.invalid_cursor.get("en"),
+                )
+        contacts = await self.contact_repository.search_contacts(
+            query, user, limit=limit, after=after, fields=fields
+        )
+        next_cursor = None
+        if len(contacts) == limit:
+            last = contacts[-1]
+            # Only PostgreSQL computes a rank; elsewhere it is unused.
+            rank = getattr(last, "search_rank", None)
+            next_cursor = encode_cursor({"r": rank or 0.0, "id": last.id})
+        return contacts, next_cursor
+
+    async def get_changes(
+            self,
+            user: User,
+            since: str | None,
+            limit: int
+    ) -> dict:
+        """
+        Get contacts changed and deleted since a sync token.
+
+        The token holds the ``(timestamp, id)`` positions reached in the
+        contacts and in the tombstones. Rows newer than the settle window
+        are left for the next call, so transactions still committing with
+        an earlier timestamp are not skipped.
+        """
+        now = await self.contact_repository.get_db_now()
+        cutoff = now - timedelta(seconds=settings.CONTACT_SYNC_SETTLE_SECONDS)
+        if since:
+            payload = decode_cursor(since)
+            try:
+                after = tuple(payload["c"]) if payload["c"] else None
+                if after is not None:
+                    after = (datetime.fromisoformat(after[0]), int(after[1]))
+                deleted_after = (
+                    datetime.fromisoformat(payload["d"][0]), int(payload["d"][1])
+                )
+            except (KeyError, IndexError, TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=messages.invalid_cursor.get("en"),
+                )
+            retention = timedelta(days=settings.CONTACT_TOMBSTONE_RETENTION_DAYS)
+            if deleted_after[0] < now - retention:
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail=messages.sync_token_expired.get("en"),
+                )
+        else:
+            # A full sync has nothing to delete on the client.
+            after, deleted_after = None, (cutoff, 0)
+
+        contacts = await self.contact_repository.get_changed_contacts(
+            user, after, cutoff, limit
+        )
+        tombstones = await self.contact_repository.get_deleted_contacts(
+            user, deleted_after, cutoff, limit
+        )
+        # Once caught up, move to the cutoff so the token keeps advancing.
+        if len(contacts) == limit:
+            after = (contacts[-1].updated_at, contacts[-1].id)
+        else:
+            after = (cutoff, 0)
+        if len(tombstones) == limit:
+            deleted_after = (tombstones[-1].deleted_at, tombstones[-1].id)
+        else:
+            deleted_after = (cutoff, 0)
+
+        next_token = encode_cursor({
+            "c": [after[0].isoformat(), after[1]],
+            "d": [deleted_after[0].isoformat(), deleted_after[1]],
+        })
+        return {
+            "contacts": contacts,
+            "deleted": list(dict.fromkeys(t.contact_id for t in tombstones)),
+            "next_token": next_token,
+            "has_more": len(contacts) == limit or len(tombstones) == limit,
+        }
+
+    async def upcoming_birthdays(self, user: User, days: int = 7):
+        """Get contacts with birthdays in the next ``days`` days."""
         today = date.today()
-        end_date = today + timedelta(days=7)
+        end_date = today + timedelta(days=days)
         return await self.contact_repository.get_contacts_with_birthdays(today, end_date, user)
\ No newline at end of file
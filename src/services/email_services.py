@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
@@ -8,6 +9,8 @@ from src.config.config import settings
 from src.core.email_token import create_email_token, create_password_reset_token
 
 
+logger = logging.getLogger("uvicorn.error")
+
 conf = ConnectionConfig(
     MAIL_USERNAME=settings.MAIL_USERNAME,
     MAIL_PASSWORD=settings.MAIL_PASSWORD,
@@ -57,4 +60,4 @@ async def send_email(
         await fm.send_message(message, template_name=template)
 
     except (ConnectionErrors, ValueError) as err:
-        print(f"Email sending error: {err}")
\ No newline at end of file
+        logger.error(f"Email sending error: {err}")
\ No newline at end of file
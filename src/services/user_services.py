@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from src.entity.models import User
 from src.repositories.user_repository import UserRepository 
 from src.schemas.user_schema import UserCreate
-from src.services.auth_services import AuthService
+from src.services.auth_services import AuthService, run_bcrypt
 from src.core.email_token import get_email_from_token
 from src.services.email_services import send_email
 from src.services.cache import get_cache_service
@@ -75,7 +75,9 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=messages.user_not_found.get("en"),
             )
-        hashed_password = self.auth_service._hash_password(new_password)
+        hashed_password = await run_bcrypt(
+            self.auth_service._hash_password, new_password
+        )
         user.hash_password = hashed_password
         await self.db.commit()
 
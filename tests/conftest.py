@@ -1,6 +1,7 @@
 import sys
 import os
 import asyncio
+from contextlib import contextmanager
 from datetime import datetime
 
 import pytest
@@ -10,7 +11,12 @@ from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from unittest.mock import AsyncMock
 
-from main import app
+# The suite sends far more requests a minute than any real client would.
+os.environ.setdefault("RATE_LIMIT_DEFAULT", "100000/minute")
+os.environ.setdefault("RATE_LIMITS", "{}")
+
+from main import app  # noqa: E402
+from src.core.query_log import capture_queries, watch_queries
 from src.entity.models import Base, User, UserRole
 from src.database.db import get_db
 from src.services.auth_services import AuthService
@@ -27,6 +33,7 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+watch_queries(engine, slow_threshold=float("inf"))
 
 TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
@@ -41,6 +48,9 @@ test_user = {
 
 class FakeCacheService(CacheService):
     """Fake cache service."""
+    # Contacts versions outlive a request, like the Redis keys they mimic.
+    _versions: dict[int, int] = {}
+
     def __init__(self):
         self._cache = {}
         self._blacklist = set()
@@ -60,6 +70,13 @@ class FakeCacheService(CacheService):
     async def delete_user_cache(self, username: str) -> None:
         self._cache.pop(f"user:{username}", None)
 
+    async def get_contacts_version(self, user_id: int) -> int:
+        return self._versions.setdefault(user_id, 1)
+
+    async def bump_contacts_version(self, user_id: int) -> int:
+        self._versions[user_id] = self._versions.get(user_id, 1) + 1
+        return self._versions[user_id]
+
     async def cleanup(self):
         """Clear cache and blacklist."""
         self._cache.clear()
@@ -140,4 +157,23 @@ async def cleanup_cache():
     """Cleanup cache."""
     fake_cache = FakeCacheService()
     yield
-    await fake_cache.cleanup()
\ No newline at end of file
+    await fake_cache.cleanup()
+
+
+@pytest.fixture
+def max_queries():
+    """Assert that each request made in the block runs at most ``limit`` statements."""
+    @contextmanager
+    def check(limit: int):
+        with capture_queries() as requests:
+            yield requests
+        for request in requests:
+            statements = "\n".join(
+                f"  {count} x {statement}"
+                for statement, count in request.statements.items()
+            )
+            assert request.count <= limit, (
+                f"{request.method} {request.route} ran {request.count} "
+                f"statements, expected at most {limit}:\n{statements}"
+            )
+    return check
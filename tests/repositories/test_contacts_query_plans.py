@@ -0,0 +1,186 @@
+"""
+EXPLAIN-based checks that contact queries are served by indexes.
+
+These tests need a disposable PostgreSQL database, given as
+``TEST_POSTGRES_URL`` (``postgresql+asyncpg://...``); they are skipped
+otherwise. Sequential scans are disabled for the session so the plan
+shows whether a usable index exists rather than what is cheapest for a
+small table.
+"""
+import os
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, text
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.entity.models import Base, Contact, User
+from src.repositories.contacts_repository import ContactRepository
+
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="Requires PostgreSQL (TEST_POSTGRES_URL)"
+)
+
+
+@pytest_asyncio.fixture
+async def pg_engine():
+    """PostgreSQL engine with seeded contacts for 200 users."""
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": u, "username": f"u{u}", "email": f"u{u}@x", "hash_password": "x"}
+            for u in range(1, 201)
+        ])
+        await conn.execute(insert(Contact), [
+            {
+                "first_name": f"{i % 999}",
+                "last_name": f"{i % 997}",
+                "email": f"{i}",
+                "birthday_mmdd": 101 + i % 12 * 100 + i % 28,
+                "updated_at": datetime(2024, 1, 1) + timedelta(minutes=i),
+                "user_id": 1 + i % 200,
+            }
+            for i in range(20_000)
+        ])
+        if await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions "
+            "WHERE name = 'pg_trgm')"
+        )):
+            # Mirrors migration c41d7a9e6b02, which is not part of the model.
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.execute(text(
+                "CREATE INDEX ix_contacts_search_trgm ON contacts USING gin "
+                "(first_name gin_trgm_ops, last_name gin_trgm_ops, email gin_trgm_ops)"
+            ))
+        await conn.execute(text("ANALYZE contacts"))
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def capture_statement(call, *args, **kwargs):
+    """Run a repository method against a mock session and return its SQL."""
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = Mock()
+    await call(ContactRepository(session), *args, **kwargs)
+    stmt = session.execute.call_args.args[0]
+    return str(stmt.compile(
+        dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+def plan_nodes(plan: dict):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(engine, sql: str) -> list[dict]:
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar()[0]["Plan"]
+    return list(plan_nodes(plan))
+
+
+def assert_index_scan(nodes: list[dict], index_prefix: str = "ix_contacts_user_id"):
+    node_types = [node["Node Type"] for node in nodes]
+    assert "Seq Scan" not in node_types, node_types
+    assert any(
+        node.get("Index Name", "").startswith(index_prefix) for node in nodes
+    ), nodes
+
+
+@pytest.mark.asyncio
+async def test_list_uses_user_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_contacts, limit=10, offset=0, user=User(id=3)
+    )
+    assert_index_scan(await explain(pg_engine, sql), "ix_contacts_user_id_id")
+
+
+@pytest.mark.asyncio
+async def test_list_after_cursor_uses_user_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_contacts,
+        limit=10, offset=0, user=User(id=3), after=(None, 10_000)
+    )
+    assert_index_scan(await explain(pg_engine, sql), "ix_contacts_user_id_id")
+
+
+@pytest.mark.asyncio
+async def test_get_uses_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_contact_by_id, contact_id=42, user=User(id=3)
+    )
+    assert_index_scan(await explain(pg_engine, sql), "")
+
+
+@pytest.mark.asyncio
+async def test_search_uses_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.search_contacts, query="12", user=User(id=3)
+    )
+    assert_index_scan(await explain(pg_engine, sql))
+
+
+@pytest.mark.asyncio
+async def test_birthdays_use_birthday_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_contacts_with_birthdays,
+        start_date=date(2024, 12, 28), end_date=date(2025, 1, 4), user=User(id=3)
+    )
+    assert_index_scan(await explain(pg_engine, sql), "ix_contacts_user_id_birthday_mmdd")
+
+
+@pytest.mark.asyncio
+async def test_search_uses_trigram_index(pg_engine):
+    async with pg_engine.connect() as conn:
+        if not await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_indexes "
+            "WHERE indexname = 'ix_contacts_search_trgm')"
+        )):
+            pytest.skip("pg_trgm extension is not available")
+    session = AsyncMock(spec=AsyncSession)
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.execute.return_value = Mock()
+    await ContactRepository(session).search_contacts(
+        query="123", user=User(id=3), limit=20
+    )
+    stmt = session.execute.call_args.args[0]
+    sql = str(stmt.compile(
+        dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert_index_scan(await explain(pg_engine, sql), "ix_contacts_search_trgm")
+
+
+@pytest.mark.asyncio
+async def test_changes_use_updated_at_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_changed_contacts,
+        user=User(id=3), after=(datetime(2024, 1, 10), 10),
+        before=datetime(2100, 1, 1), limit=500
+    )
+    assert_index_scan(await explain(pg_engine, sql), "ix_contacts_user_id_updated_at")
+
+
+@pytest.mark.asyncio
+async def test_tombstones_use_index(pg_engine):
+    sql = await capture_statement(
+        ContactRepository.get_deleted_contacts,
+        user=User(id=3), after=(datetime(2024, 1, 1), 10),
+        before=datetime(2100, 1, 1), limit=500
+    )
+    assert_index_scan(
+        await explain(pg_engine, sql), "ix_deleted_contacts_user_id_deleted_at"
+    )
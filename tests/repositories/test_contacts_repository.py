@@ -1,9 +1,10 @@
 import pytest
 from unittest.mock import AsyncMock, Mock
+from sqlalchemy.dialects.postgresql import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import date
+from datetime import date, datetime
 
-from src.entity.models import Contact, User
+from src.entity.models import Contact, DeletedContact, User
 from src.repositories.contacts_repository import ContactRepository
 from src.schemas.contact_schema import ContactSchema, ContactUpdateSchema
 
@@ -170,4 +171,293 @@ async def test_get_contacts_with_birthdays(
 
     # Assert
     assert result == [mock_contact]
-    mock_session.execute.assert_called_once()
\ No newline at end of file
+    mock_session.execute.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_contacts_after_cursor(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Get contacts after a keyset position."""
+    # Arrange
+    mock_contact = Contact(id=11, user_id=mock_user.id)
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [mock_contact]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contact_repository.get_contacts(
+        limit=10, offset=500, user=mock_user, sort_by="last_name", after=("Doe", 10)
+    )
+
+    # Assert
+    assert result == [mock_contact]
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt)
+    assert "OFFSET" not in sql
+    assert "ORDER BY contacts.last_name, contacts.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_ranked_on_postgresql(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Search contacts with trigram ranking on PostgreSQL."""
+    # Arrange
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.search_contacts(
+        query="50%_off", user=mock_user, limit=20, after=(0.5, 7)
+    )
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(
+        dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert "similarity(contacts.first_name, '50%_off')" in sql
+    assert "ILIKE '%50/%/_off%' ESCAPE '/'" in sql
+    assert "DESC, contacts.id" in sql
+    assert "LIMIT 20" in sql
+
+
+def test_contact_birthday_mmdd_follows_birthday():
+    """Birthday key is maintained on write."""
+    contact = Contact(birthday=date(1990, 12, 31))
+    assert contact.birthday_mmdd == 1231
+    contact.birthday = None
+    assert contact.birthday_mmdd is None
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_with_birthdays_across_new_year(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Birthday window wrapping from December into January."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.get_contacts_with_birthdays(
+        start_date=date(2023, 12, 28), end_date=date(2024, 1, 4), user=mock_user
+    )
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "contacts.birthday_mmdd >= 1228 OR contacts.birthday_mmdd <= 104" in sql
+    assert "to_char" not in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_contacts_on_postgresql(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Bulk update by IDs is one UPDATE with id = ANY(array)."""
+    # Arrange
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [3, 1]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contact_repository.bulk_update_contacts(
+        mock_user, {"birthday": date(1990, 3, 4)}, ids=[1, 2, 3]
+    )
+
+    # Assert
+    assert result == [1, 3]
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+    assert sql.startswith("UPDATE contacts SET birthday=")
+    assert "birthday_mmdd=" in sql
+    assert "contacts.id = ANY (" in sql
+    assert "RETURNING contacts.id" in sql
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_remove_contacts_by_filter(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Bulk delete by filter is one DELETE scoped to the user."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [5]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contact_repository.bulk_remove_contacts(
+        mock_user, filters={"query": "doe", "first_name": "John"}
+    )
+
+    # Assert
+    assert result == [5]
+    delete_call, tombstone_call = mock_session.execute.call_args_list
+    stmt = delete_call.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert sql.startswith("DELETE FROM contacts WHERE contacts.user_id = 1")
+    assert "contacts.first_name = 'John'" in sql
+    assert "RETURNING contacts.id" in sql
+    assert tombstone_call.args[1] == [{"contact_id": 5, "user_id": 1}]
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_by_ids(contact_repository, mock_session, mock_user):
+    """Get contacts by IDs in one query."""
+    # Arrange
+    mock_contact = Contact(id=2, user_id=mock_user.id)
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [mock_contact]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contact_repository.get_contacts_by_ids([2, 3], mock_user)
+
+    # Assert
+    assert result == [mock_contact]
+    mock_session.execute.assert_called_once()
+    sql = str(mock_session.execute.call_args.args[0].compile(
+        compile_kwargs={"literal_binds": True}
+    ))
+    assert "contacts.user_id = 1 AND contacts.id IN (2, 3)" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_contacts_on_postgresql(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Upsert skips unchanged rows and reports inserts via xmax."""
+    # Arrange
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    mock_result = Mock()
+    mock_result.all.return_value = [("new@example.com", True), ("old@example.com", False)]
+    mock_session.execute.return_value = mock_result
+    rows = [
+        {"first_name": "New", "last_name": "Row", "email": "new@example.com",
+         "phone": "1234567890", "birthday": None, "additional_info": None},
+    ]
+
+    # Act
+    result = await contact_repository.bulk_upsert_contacts(rows, mock_user)
+
+    # Assert
+    assert result == {"new@example.com": True, "old@example.com": False}
+    stmt, values = mock_session.execute.call_args.args
+    assert values[0]["user_id"] == 1 and values[0]["birthday_mmdd"] is None
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+    assert "ON CONFLICT (user_id, email) DO UPDATE SET" in sql
+    assert "WHERE contacts.first_name IS DISTINCT FROM excluded.first_name OR" in sql
+    assert "RETURNING contacts.email, xmax = " in sql
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_remove_contact_leaves_tombstone(
+    contact_repository,
+    mock_session,
+    mock_user):
+    """Removing a contact records it for delta sync."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = Contact(id=7, user_id=mock_user.id)
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.remove_contact(contact_id=7, user=mock_user)
+
+    # Assert
+    tombstone = mock_session.add.call_args.args[0]
+    assert isinstance(tombstone, DeletedContact)
+    assert (tombstone.contact_id, tombstone.user_id) == (7, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_changed_contacts(contact_repository, mock_session, mock_user):
+    """Changed contacts are read in (updated_at, id) order below the cutoff."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.get_changed_contacts(
+        mock_user,
+        after=(datetime(2024, 1, 1, 12), 5),
+        before=datetime(2024, 1, 2),
+        limit=100,
+    )
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "contacts.updated_at < '2024-01-02 00:00:00'" in sql
+    assert "(contacts.updated_at, contacts.id) > ('2024-01-01 12:00:00', 5)" in sql
+    assert "ORDER BY contacts.updated_at, contacts.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_contact_by_id_for_update(contact_repository, mock_session, mock_user):
+    """A locking read only locks the contact row."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.get_contact_by_id(2, mock_user, for_update=True)
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    assert "FOR UPDATE OF contacts" in str(stmt.compile(dialect=asyncpg.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_sparse_fields(contact_repository, mock_session, mock_user):
+    """Sparse reads select only the requested and pagination columns."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contact_repository.get_contacts(
+        10, 0, mock_user, sort_by="last_name", fields=("first_name",)
+    )
+
+    # Assert
+    assert result == []
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile())
+    assert sql.startswith(
+        "SELECT contacts.first_name, contacts.id, contacts.last_name \nFROM contacts"
+    )
+    mock_result.scalars.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_does_not_join_users(contact_repository, mock_session, mock_user):
+    """Contact pages are read from the contacts table alone."""
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contact_repository.get_contacts(500, 0, mock_user)
+
+    # Assert
+    sql = str(mock_session.execute.call_args.args[0].compile())
+    assert "JOIN" not in sql and "users" not in sql
@@ -0,0 +1,183 @@
+from datetime import date
+
+import pytest
+
+from src.services.contact_io_services import (
+    iter_lines,
+    iter_csv_records,
+    iter_ndjson_records,
+    iter_csv_chunks,
+    iter_ndjson_chunks,
+    iter_vcard_records,
+    iter_vcard_chunks,
+)
+
+
+async def chunked(data: bytes, size: int = 7):
+    """Yield data in small chunks, like a streamed request body."""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunks():
+    """Lines split across chunk boundaries are joined."""
+    data = "﻿a,b\r\nпривіт,2\nlast".encode()
+    lines = await collect(iter_lines(chunked(data, 3)))
+    assert lines == ["a,b", "привіт,2", "last"]
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_records():
+    """CSV rows are mapped by header; quoted newlines are kept."""
+    data = (
+        b"first_name,last_name,additional_info\n"
+        b'John,Doe,"line one\nline two"\n'
+        b"\n"
+        b"Jane,Smith\n"
+        b"Ann,Lee,\n"
+    )
+    rows = await collect(iter_csv_records(iter_lines(chunked(data))))
+    assert rows[0] == (
+        1,
+        {"first_name": "John", "last_name": "Doe", "additional_info": "line one\nline two"},
+        None,
+    )
+    assert rows[1] == (2, None, "Expected 3 columns, got 2")
+    assert rows[2] == (3, {"first_name": "Ann", "last_name": "Lee"}, None)
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_records():
+    """Each NDJSON line is one record; bad lines become row errors."""
+    data = b'{"first_name": "John"}\n\n[1, 2]\n{broken\n{"first_name": "Jane"}'
+    rows = await collect(iter_ndjson_records(iter_lines(chunked(data))))
+    assert rows == [
+        (1, {"first_name": "John"}, None),
+        (2, None, "Invalid JSON object"),
+        (3, None, "Invalid JSON object"),
+        (4, {"first_name": "Jane"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_overlong():
+    """Lines over the limit become None without being buffered whole."""
+    data = b"short\n" + b"x" * 50 + b"\nafter\n" + b"y" * 50
+    lines = await collect(iter_lines(chunked(data), max_length=20))
+    assert lines == ["short", None, "after", None]
+
+
+@pytest.mark.asyncio
+async def test_iter_records_too_long():
+    """Overlong lines and runaway quoted records become row errors."""
+    too_long = "Record longer than 65536 characters"
+    data = b'first_name,last_name\nJohn,"unbalanced\n' + b"more\n" * 10 + b"\nJane,Doe\n"
+    lines = iter_lines(chunked(data), max_length=1000)
+    rows = await collect(iter_csv_records(lines, max_length=30))
+    assert rows[0] == (1, None, too_long)
+    assert rows[-1][1] == {"first_name": "Jane", "last_name": "Doe"}
+
+    data = b'{"first_name": "John"}\n{"first_name": "' + b"x" * 50 + b'"}\n'
+    rows = await collect(iter_ndjson_records(iter_lines(chunked(data), max_length=30)))
+    assert rows == [(1, {"first_name": "John"}, None), (2, None, too_long)]
+
+    data = (
+        b"BEGIN:VCARD\nFN:John\nNOTE:a\n " + b"b" * 20 + b"\n " + b"b" * 20 + b"\nEND:VCARD\n"
+        b"BEGIN:VCARD\nFN:Jane\nNOTE:" + b"c" * 40 + b"\nEND:VCARD\n"
+        b"BEGIN:VCARD\nFN:Ann\nEND:VCARD\n"
+    )
+    lines = iter_lines(chunked(data), max_length=30)
+    rows = await collect(iter_vcard_records(lines, max_length=30))
+    assert rows[:2] == [(1, None, too_long), (2, None, too_long)]
+    assert rows[2][1]["first_name"] == "Ann"
+
+
+async def batches(*groups):
+    for rows in groups:
+        yield rows
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_chunks():
+    """CSV export writes a header and one chunk per batch."""
+    chunks = await collect(iter_csv_chunks(
+        ("first_name", "birthday", "additional_info"),
+        batches([("John", date(1990, 1, 2), None)], [("Jane", None, "a, b")]),
+    ))
+    assert chunks == [
+        b"first_name,birthday,additional_info\n",
+        b"John,1990-01-02,\n",
+        b'Jane,,"a, b"\n',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_chunks():
+    """NDJSON export writes one object per row."""
+    chunks = await collect(iter_ndjson_chunks(
+        ("first_name", "birthday"),
+        batches([("John", date(1990, 1, 2)), ("Jane", None)]),
+    ))
+    assert chunks == [
+        b'{"first_name": "John", "birthday": "1990-01-02"}\n'
+        b'{"first_name": "Jane", "birthday": null}\n'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_vcard_records():
+    """Cards are unfolded, unescaped and mapped to contact fields."""
+    data = (
+        b"BEGIN:VCARD\r\nVERSION:3.0\r\n"
+        b"N:Doe;John;;;\r\nFN:John Doe\r\n"
+        b"item1.EMAIL;TYPE=INTERNET:john@example.com\r\n"
+        b"TEL;TYPE=CELL:1234567890\r\nTEL:0000000000\r\n"
+        b"BDAY:19900102\r\n"
+        b"NOTE:line one\\nline two\\, with a very long note that is folded acr\r\n"
+        b" oss lines\r\nEND:VCARD\r\n"
+        b"BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Jane Smith\r\n"
+        b"EMAIL:jane@example.com\r\nTEL;VALUE=uri:tel:0987654321\r\n"
+        b"BDAY:--0102\r\nEND:VCARD\r\n"
+        b"BEGIN:VCARD\r\nFN:Broken\r\n"
+    )
+    rows = await collect(iter_vcard_records(iter_lines(chunked(data))))
+    assert rows == [
+        (1, {
+            "last_name": "Doe",
+            "first_name": "John",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "birthday": "1990-01-02",
+            "additional_info": "line one\nline two, with a very long note "
+                               "that is folded across lines",
+        }, None),
+        (2, {
+            "first_name": "Jane",
+            "last_name": "Smith",
+            "email": "jane@example.com",
+            "phone": "0987654321",
+        }, None),
+        (3, None, "Missing END:VCARD"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_vcard_chunks_round_trip():
+    """Exported cards are folded at 75 octets and parse back unchanged."""
+    fields = ("first_name", "last_name", "email", "phone", "birthday", "additional_info")
+    contact = ("John", "Doe", "john@example.com", "1234567890",
+               date(1990, 1, 2), "Ünïcode; notes, " * 10)
+    chunks = await collect(iter_vcard_chunks(fields, batches([contact])))
+    assert all(len(line) <= 75 for line in b"".join(chunks).split(b"\r\n"))
+
+    rows = await collect(iter_vcard_records(iter_lines(chunked(b"".join(chunks)))))
+    record = rows[0][1]
+    assert record == {
+        **dict(zip(fields, contact)),
+        "birthday": "1990-01-02",
+    }
@@ -0,0 +1,109 @@
+import gzip
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.compression import CompressionMiddleware, choose_encoding
+
+
+BODY = "contact," * 200
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100, cache_size=2)
+
+
+@app.get("/page")
+def page():
+    return PlainTextResponse(BODY)
+
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("tiny")
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([BODY, BODY]), media_type="text/csv")
+
+
+client = TestClient(app)
+
+
+def test_choose_encoding():
+    """Test Accept-Encoding negotiation"""
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("") is None
+
+
+def test_compresses_large_responses():
+    """Test responses above the minimum size are gzipped"""
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.text == BODY
+
+
+def test_skips_small_and_unaccepted_responses():
+    """Test small bodies and identity clients are left uncompressed"""
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    response = client.get("/page", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compresses_streams():
+    """Test streamed bodies are compressed chunk by chunk"""
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.text == BODY * 2
+
+
+def test_reuses_compressed_bodies_by_etag():
+    """Test strong ETags are compressed once per body and evicted LRU"""
+    compression = CompressionMiddleware(app=None, cache_size=2)
+    body = BODY.encode()
+    first = compression.compress(body, "gzip", '"a"', "/page")
+    assert compression.compress(body, "gzip", '"a"', "/page") is first
+    assert gzip.decompress(first) == body
+    # A shared ETag with another path or body is not trusted.
+    assert gzip.decompress(compression.compress(b"other", "gzip", '"a"', "/page")) == b"other"
+    assert compression.compress(body, "gzip", '"a"', "/search") is not first
+    assert [key[:3] for key in compression.cache] == [
+        ("/page", '"a"', "gzip"), ("/search", '"a"', "gzip")
+    ]
+    compression.compress(body, "gzip", 'W/"d"')
+    assert len(compression.cache) == 2
+
+
+def test_compressed_etag_has_coding_suffix():
+    """Test compressed representations get their own ETag, accepted back"""
+    etag_app = FastAPI()
+    etag_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @etag_app.get("/tagged")
+    def tagged(request: Request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return Response(status_code=304, headers={"ETag": '"v1"'})
+        return PlainTextResponse(BODY, headers={"ETag": '"v1"'})
+
+    etag_client = TestClient(etag_app)
+    response = etag_client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["ETag"] == '"v1-gzip"'
+    response = etag_client.get("/tagged", headers={"Accept-Encoding": "identity"})
+    assert response.headers["ETag"] == '"v1"'
+
+    response = etag_client.get(
+        "/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"v1-gzip"'
+    response = etag_client.get(
+        "/tagged", headers={"Accept-Encoding": "identity", "If-None-Match": '"v1-gzip"'}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"v1"'
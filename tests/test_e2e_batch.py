@@ -0,0 +1,95 @@
+import pytest
+
+
+def test_batch_requests(client, get_token):
+    """Test running several contacts requests in one call"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact = {
+        "first_name": "Batch",
+        "last_name": "Created",
+        "email": "batch@example.com",
+        "phone": "1234567890",
+        "birthday": "1990-01-01",
+        "additional_info": "Note",
+    }
+    response = client.post(
+        "/api/batch",
+        json={"requests": [
+            {"method": "POST", "path": "/api/contacts/", "body": contact},
+            {"method": "GET", "path": "/api/contacts/search/?query=batch@&fields=email"},
+            {"method": "GET", "path": "/api/contacts/999999"},
+            {"method": "GET", "path": "/api/contacts/upcoming_birthdays/?days=7"},
+        ]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    created, search, missing, birthdays = response.json()
+    assert created["status"] == 201
+    assert created["body"]["email"] == "batch@example.com"
+    assert search["status"] == 200
+    assert search["body"] == [{"email": "batch@example.com"}]
+    assert "etag" in search["headers"]
+    assert missing["status"] == 404
+    assert birthdays["status"] == 200
+    assert isinstance(birthdays["body"], list)
+
+
+def test_batch_conditional_requests(client, get_token):
+    """Test per-request If-Match headers"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"method": "GET", "path": "/api/contacts/search/?query=batch@"}]},
+        headers=headers,
+    )
+    contact_id = response.json()[0]["body"][0]["id"]
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{
+            "method": "PUT",
+            "path": f"/api/contacts/{contact_id}",
+            "headers": {"If-Match": '"stale"'},
+            "body": {"phone": "0987654321"},
+        }]},
+        headers=headers,
+    )
+    assert response.json()[0]["status"] == 412
+
+
+def test_batch_rejects_other_paths(client, get_token):
+    """Test only contacts routes can be batched"""
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"method": "GET", "path": "/api/users/me"}]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("GET", "/api/contacts/export/?format=ndjson"),
+        ("GET", "/api/contacts/export"),
+        ("POST", "/api/contacts/import"),
+        ("POST", "/api/contacts/upsert"),
+        ("GET", "/api/contacts/%65xport/"),
+    ],
+)
+def test_batch_rejects_streamed_paths(client, get_token, method, path):
+    """Test streamed import, upsert and export cannot be batched"""
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"method": method, "path": path}]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_batch_requires_auth(client):
+    """Test the batch itself needs credentials"""
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"method": "GET", "path": "/api/contacts/"}]},
+    )
+    assert response.status_code == 401, response.text
@@ -1,7 +1,13 @@
+import json
+import time
 from datetime import date, timedelta
 import pytest
 import uuid
 
+from fastapi.testclient import TestClient
+
+from src.core.pagination import encode_cursor
+
 test_contact_data = {
     "first_name": "John",
     "last_name": "Doe",
@@ -69,6 +75,78 @@ def test_get_contacts(client, get_token):
     assert "id" in data[0]
 
 
+def test_get_contacts_cursor(client, get_token):
+    """Test walking contacts with a cursor"""
+    for i in range(3):
+        response = client.post(
+            "/api/contacts",
+            json={**test_contact_data, "email": f"page_{i}_{uuid.uuid4().hex[:6]}@example.com"},
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+        assert response.status_code == 201, response.text
+
+    first = client.get(
+        "/api/contacts?limit=2",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert first.status_code == 200, first.text
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(
+        f"/api/contacts?limit=2&cursor={cursor}",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert second.status_code == 200, second.text
+    offset_page = client.get(
+        "/api/contacts?limit=2&offset=2",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert [c["id"] for c in second.json()] == [c["id"] for c in offset_page.json()]
+
+
+def test_get_contacts_cursor_by_created_at(client, get_token):
+    """Test walking contacts sorted by a timestamp visits every contact"""
+    for i in range(5):
+        response = client.post(
+            "/api/contacts",
+            json={**test_contact_data, "email": f"created_{i}_{uuid.uuid4().hex[:6]}@example.com"},
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+        assert response.status_code == 201, response.text
+
+    everything = client.get(
+        "/api/contacts?limit=100&sort_by=created_at",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert everything.status_code == 200, everything.text
+
+    walked, cursor = [], None
+    while True:
+        params = {"limit": 2, "sort_by": "created_at"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(
+            "/api/contacts",
+            params=params,
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+        assert page.status_code == 200, page.text
+        walked.extend(c["id"] for c in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert walked == [c["id"] for c in everything.json()]
+
+
+def test_get_contacts_invalid_cursor(client, get_token):
+    """Test getting contacts with a malformed cursor"""
+    response = client.get(
+        "/api/contacts?cursor=not-a-cursor",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 400, response.text
+
+
 def test_update_contact(client, get_token):
     """Test updating a contact"""
     updated_data = {
@@ -169,7 +247,43 @@ def test_search_contacts(client, get_token):
     assert isinstance(data, list)
     assert any(c["email"] == unique_email for c in data)
 
-@pytest.mark.skip(reason="Requires PostgreSQL for to_char function")
+def test_search_contacts_paginated(client, get_token):
+    """Test paging through search results with a cursor"""
+    for i in range(3):
+        response = client.post(
+            "/api/contacts",
+            json={**test_contact_data, "first_name": "Searchable", "email": f"searchable_{i}@example.com"},
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+        assert response.status_code == 201, response.text
+
+    first = client.get(
+        "/api/contacts/search/?query=searchable&limit=2",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert first.status_code == 200, first.text
+    assert len(first.json()) == 2
+
+    second = client.get(
+        f"/api/contacts/search/?query=searchable&limit=2&cursor={first.headers['X-Next-Cursor']}",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert second.status_code == 200, second.text
+    assert [c["email"] for c in second.json()] == ["searchable_2@example.com"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.parametrize("rank", ["high", None, "nan"])
+def test_search_contacts_invalid_cursor_rank(client, get_token, rank):
+    """Test a search cursor whose rank is not a number is rejected"""
+    response = client.get(
+        "/api/contacts/search/",
+        params={"query": "searchable", "cursor": encode_cursor({"r": rank, "id": 1})},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 400, response.text
+
+
 def test_get_upcoming_birthdays(client, get_token):
     """Test getting upcoming birthdays"""
     tomorrow = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -197,4 +311,503 @@ def test_get_upcoming_birthdays(client, get_token):
     assert data[0]["first_name"] == "Birthday"
     assert data[0]["last_name"] == "Person"
     assert data[0]["email"] == "birthday@example.com"
-    assert data[0]["birthday"] == tomorrow 
\ No newline at end of file
+    assert data[0]["birthday"] == tomorrow
+
+
+def test_get_upcoming_birthdays_custom_window(client, get_token):
+    """Test getting birthdays within a custom number of days"""
+    in_twenty_days = (date.today() + timedelta(days=20)).strftime("%Y-%m-%d")
+    client.post(
+        "/api/contacts",
+        json={
+            "first_name": "Later",
+            "last_name": "Person",
+            "email": "later@example.com",
+            "phone": "2222222222",
+            "birthday": in_twenty_days,
+            "additional_info": "Later St"
+        },
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    week = client.get(
+        "/api/contacts/upcoming_birthdays/",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    month = client.get(
+        "/api/contacts/upcoming_birthdays/?days=30",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert week.status_code == 200, week.text
+    assert month.status_code == 200, month.text
+    assert "later@example.com" not in [c["email"] for c in week.json()]
+    assert "later@example.com" in [c["email"] for c in month.json()]
+
+
+def test_import_contacts_csv(client, get_token):
+    """Test importing contacts from CSV"""
+    body = (
+        "first_name,last_name,email,phone,birthday\n"
+        "Import,One,import1@example.com,1234567890,1990-02-03\n"
+        "Import,Two,import2@example.com,1234567890,\n"
+        "Import,Dup,import1@example.com,1234567890,\n"
+        "X,Short,import3@example.com,1234567890,\n"
+    )
+    response = client.post(
+        "/api/contacts/import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {get_token}", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["inserted"] == 2
+    assert data["failed"] == 2
+    assert [e["row"] for e in data["errors"]] == [4, 3]
+
+
+def test_import_contacts_ndjson(client, get_token):
+    """Test importing contacts from NDJSON"""
+    body = (
+        '{"first_name": "Ndjson", "last_name": "One", "email": "ndjson1@example.com", "phone": "1234567890"}\n'
+        '{"first_name": "Ndjson", "last_name": "Two", "email": "import2@example.com", "phone": "1234567890"}\n'
+    )
+    response = client.post(
+        "/api/contacts/import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {get_token}", "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["inserted"] == 1
+    assert data["errors"] == [{"row": 2, "error": "Contact with this email already exists"}]
+
+
+def test_import_contacts_unsupported_type(client, get_token):
+    """Test importing contacts with an unsupported content type"""
+    response = client.post(
+        "/api/contacts/import",
+        content=b"<contacts/>",
+        headers={"Authorization": f"Bearer {get_token}", "Content-Type": "application/xml"},
+    )
+    assert response.status_code == 415, response.text
+
+
+def test_export_contacts_csv(client, get_token):
+    """Test exporting contacts as CSV"""
+    response = client.get(
+        "/api/contacts/export/",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "contacts.csv" in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert lines[0] == "first_name,last_name,email,phone,birthday,additional_info"
+    assert "Import,One,import1@example.com,1234567890,1990-02-03," in lines
+
+
+def test_export_contacts_ndjson(client, get_token):
+    """Test exporting contacts as NDJSON"""
+    response = client.get(
+        "/api/contacts/export/",
+        params={"format": "ndjson"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert {"first_name": "Ndjson", "last_name": "One", "email": "ndjson1@example.com",
+            "phone": "1234567890", "birthday": None, "additional_info": None} in records
+
+
+def test_import_and_export_contacts_vcard(client, get_token):
+    """Test importing and exporting contacts as vCard"""
+    body = (
+        "BEGIN:VCARD\r\nVERSION:4.0\r\nN:Card;Vcard;;;\r\nFN:Vcard Card\r\n"
+        "EMAIL:vcard1@example.com\r\nTEL:1234567890\r\nBDAY:19850607\r\n"
+        "NOTE:Met at the conference\r\nEND:VCARD\r\n"
+    )
+    response = client.post(
+        "/api/contacts/import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {get_token}", "Content-Type": "text/vcard"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["inserted"] == 1
+
+    response = client.get(
+        "/api/contacts/export/",
+        params={"format": "vcf"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/vcard")
+    assert (
+        "N:Card;Vcard;;;\r\nFN:Vcard Card\r\nEMAIL;TYPE=INTERNET:vcard1@example.com\r\n"
+        "TEL:1234567890\r\nBDAY:1985-06-07\r\nNOTE:Met at the conference\r\n"
+    ) in response.text
+
+
+def _import_bulk_contacts(client, get_token, prefix, count=3):
+    body = "first_name,last_name,email,phone,birthday,additional_info\n" + "".join(
+        f"Bulk,{prefix},{prefix.lower()}{i}@example.com,1234567890,1990-01-01,Note\n"
+        for i in range(count)
+    )
+    response = client.post(
+        "/api/contacts/import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {get_token}", "Content-Type": "text/csv"},
+    )
+    assert response.json()["inserted"] == count
+    response = client.get(
+        "/api/contacts/search/",
+        params={"query": prefix.lower()},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    return sorted(contact["id"] for contact in response.json())
+
+
+def test_bulk_update_contacts(client, get_token):
+    """Test updating contacts by IDs and by filter"""
+    ids = _import_bulk_contacts(client, get_token, "Upd")
+    response = client.post(
+        "/api/contacts/bulk_update/",
+        json={"ids": ids[:2] + [999999], "changes": {"additional_info": "Bulk note"}},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"ids": ids[:2]}
+
+    response = client.post(
+        "/api/contacts/bulk_update/",
+        json={"filter": {"last_name": "Upd"}, "changes": {"birthday": "1990-05-06"}},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.json() == {"ids": ids}
+
+    contact = client.get(
+        f"/api/contacts/{ids[0]}", headers={"Authorization": f"Bearer {get_token}"}
+    ).json()
+    assert contact["additional_info"] == "Bulk note"
+    assert contact["birthday"] == "1990-05-06"
+
+
+@pytest.mark.parametrize("body", [
+    {"changes": {"additional_info": "x"}},
+    {"ids": [1], "filter": {"query": "x"}, "changes": {"additional_info": "x"}},
+    {"filter": {}, "changes": {"additional_info": "x"}},
+    {"ids": [1], "changes": {}},
+    {"ids": [1], "changes": {"email": "same@example.com"}},
+    {"ids": [2**31], "changes": {"additional_info": "x"}},
+    {"ids": [0], "changes": {"additional_info": "x"}},
+])
+def test_bulk_update_contacts_invalid(client, get_token, body):
+    """Test bulk update validation"""
+    response = client.post(
+        "/api/contacts/bulk_update/",
+        json=body,
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_bulk_delete_contacts(client, get_token):
+    """Test deleting contacts by IDs and by filter"""
+    ids = _import_bulk_contacts(client, get_token, "Del")
+    response = client.post(
+        "/api/contacts/bulk_delete/",
+        json={"ids": ids[:1]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"ids": ids[:1]}
+
+    response = client.post(
+        "/api/contacts/bulk_delete/",
+        json={"filter": {"query": "del"}},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.json() == {"ids": ids[1:]}
+    response = client.get(
+        f"/api/contacts/{ids[1]}", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 404
+
+
+def test_bulk_delete_contacts_id_out_of_range(client, get_token):
+    """Test bulk delete rejects IDs beyond the id column's range"""
+    response = client.post(
+        "/api/contacts/bulk_delete/",
+        json={"ids": [1, 2**31]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_get_contacts_batch(client, get_token):
+    """Test getting contacts by a list of IDs"""
+    ids = _import_bulk_contacts(client, get_token, "Batch")
+    requested = [ids[2], 999999, ids[0], ids[2]]
+    response = client.get(
+        "/api/contacts/batch/",
+        params={"ids": ",".join(map(str, requested))},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [c and c["id"] for c in data["contacts"]] == [ids[2], None, ids[0], ids[2]]
+    assert data["missing"] == [999999]
+
+
+@pytest.mark.parametrize(
+    "ids", ["", "1,,2", "a", ",".join(["1"] * 501), "1,2147483648", "1," + "9" * 20]
+)
+def test_get_contacts_batch_invalid(client, get_token, ids):
+    """Test getting contacts with an invalid list of IDs"""
+    response = client.get(
+        "/api/contacts/batch/",
+        params={"ids": ids},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_upsert_contacts(client, get_token):
+    """Test upserting contacts by email"""
+    def upsert(records):
+        body = "".join(json.dumps(record) + "\n" for record in records)
+        response = client.post(
+            "/api/contacts/upsert",
+            content=body.encode(),
+            headers={
+                "Authorization": f"Bearer {get_token}",
+                "Content-Type": "application/x-ndjson",
+            },
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    records = [
+        {"first_name": "Sync", "last_name": f"Row{i}", "email": f"sync{i}@example.com",
+         "phone": "1234567890", "birthday": "1990-01-01", "additional_info": "Note"}
+        for i in range(3)
+    ]
+    report = upsert(records)
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (3, 0, 0)
+
+    records[1]["phone"] = "0987654321"
+    report = upsert(records + [
+        {**records[0], "first_name": "Twice"},
+        {"first_name": "Sync", "last_name": "Row3", "email": "sync3@example.com",
+         "phone": "1234567890"},
+    ])
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (1, 1, 2)
+    assert report["failed"] == 1
+    assert report["errors"] == [
+        {"row": 4, "error": "Email appears more than once in the same batch"}
+    ]
+
+
+def test_get_contact_changes(client, get_token, monkeypatch):
+    """Test delta sync with tombstones"""
+    from src.config.config import settings
+
+    monkeypatch.setattr(settings, "CONTACT_SYNC_SETTLE_SECONDS", 0)
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    # SQLite timestamps have one-second resolution; let earlier writes settle.
+    time.sleep(1.1)
+    response = client.get("/api/contacts/changes/", params={"limit": 1000}, headers=headers)
+    assert response.status_code == 200, response.text
+    full = response.json()
+    assert full["deleted"] == [] and not full["has_more"]
+    ids = _import_bulk_contacts(client, get_token, "Delta")
+    client.post("/api/contacts/bulk_delete/", json={"ids": ids[:1]}, headers=headers)
+
+    time.sleep(1.1)
+    response = client.get(
+        "/api/contacts/changes/", params={"since": full["next_token"], "limit": 2},
+        headers=headers,
+    )
+    page = response.json()
+    assert [c["id"] for c in page["contacts"]] == ids[1:]
+    assert page["deleted"] == ids[:1]
+
+    response = client.get(
+        "/api/contacts/changes/", params={"since": page["next_token"]}, headers=headers,
+    )
+    assert response.json()["contacts"] == []
+    assert response.json()["deleted"] == []
+
+
+def test_get_contact_changes_invalid_token(client, get_token):
+    """Test delta sync with an invalid token"""
+    response = client.get(
+        "/api/contacts/changes/",
+        params={"since": "not-a-token"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 400, response.text
+
+
+def test_get_contact_not_modified(client, get_token):
+    """Test conditional GET of a contact and of the contact list"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = _import_bulk_contacts(client, get_token, "Etag", count=1)
+
+    response = client.get(f"/api/contacts/{ids[0]}", headers=headers)
+    etag = response.headers["ETag"]
+    response = client.get(
+        f"/api/contacts/{ids[0]}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304, response.text
+    assert response.headers["ETag"] == etag
+
+    response = client.get("/api/contacts/", headers=headers)
+    list_etag = response.headers["ETag"]
+    response = client.get(
+        "/api/contacts/", headers={**headers, "If-None-Match": f"W/{list_etag}"}
+    )
+    assert response.status_code == 304, response.text
+
+    client.put(f"/api/contacts/{ids[0]}", json={"phone": "0987654321"}, headers=headers)
+    response = client.get(
+        "/api/contacts/", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != list_etag
+
+
+def test_list_and_search_etags_differ(client, get_token):
+    """Test the same query string on list and search gets distinct ETags"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    list_etag = client.get("/api/contacts/?query=a", headers=headers).headers["ETag"]
+    response = client.get(
+        "/api/contacts/search/?query=a", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != list_etag
+
+
+def test_update_contact_precondition_failed(client, get_token):
+    """Test If-Match on update and delete"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = _import_bulk_contacts(client, get_token, "Match", count=1)
+    etag = client.get(f"/api/contacts/{ids[0]}", headers=headers).headers["ETag"]
+
+    stale = {**headers, "If-Match": '"0123456789abcdef"'}
+    response = client.put(f"/api/contacts/{ids[0]}", json={"phone": "0987654321"}, headers=stale)
+    assert response.status_code == 412, response.text
+    response = client.delete(f"/api/contacts/{ids[0]}", headers=stale)
+    assert response.status_code == 412, response.text
+
+    response = client.put(
+        f"/api/contacts/{ids[0]}", json={"phone": "0987654321"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["phone"] == "0987654321"
+    response = client.delete(
+        f"/api/contacts/{ids[0]}", headers={**headers, "If-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 204, response.text
+
+
+def test_get_contacts_sparse_fields(client, get_token):
+    """Test narrowing contact lists with fields="""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = _import_bulk_contacts(client, get_token, "Sparse", count=3)
+
+    response = client.get(
+        "/api/contacts/search/",
+        params={"query": "sparse", "fields": "first_name,email", "limit": 2},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == [
+        {"first_name": "Bulk", "email": "sparse0@example.com"},
+        {"first_name": "Bulk", "email": "sparse1@example.com"},
+    ]
+    assert "ETag" in response.headers
+    response = client.get(
+        "/api/contacts/search/",
+        params={"query": "sparse", "fields": "id", "cursor": response.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert response.json() == [{"id": ids[2]}]
+
+    response = client.get(
+        "/api/contacts/", params={"fields": "id,birthday", "limit": 500}, headers=headers
+    )
+    assert {"id": ids[0], "birthday": "1990-01-01"} in response.json()
+
+
+def test_get_contacts_unknown_field(client, get_token):
+    """Test fields= with a field that does not exist"""
+    response = client.get(
+        "/api/contacts/",
+        params={"fields": "id,hash_password"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_get_contacts_matches_contact_response(client, get_token):
+    """Test list rows are encoded exactly like ContactResponse"""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = _import_bulk_contacts(client, get_token, "Rows", count=1)
+
+    listed = client.get("/api/contacts/", params={"limit": 500}, headers=headers).json()
+    single = client.get(f"/api/contacts/{ids[0]}", headers=headers).json()
+    assert next(row for row in listed if row["id"] == ids[0]) == single
+
+
+def test_get_contacts_compressed(client, get_token):
+    """Test contact list pages are gzipped for clients that accept it"""
+    _import_bulk_contacts(client, get_token, "Gzip", count=5)
+    response = client.get(
+        "/api/contacts/",
+        params={"limit": 500},
+        headers={"Authorization": f"Bearer {get_token}", "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].endswith('-gzip"')
+    assert len(response.json()) >= 5
+
+    response = client.get(
+        "/api/contacts/",
+        params={"limit": 500},
+        headers={
+            "Authorization": f"Bearer {get_token}",
+            "Accept-Encoding": "gzip",
+            "If-None-Match": response.headers["ETag"],
+        },
+    )
+    assert response.status_code == 304, response.text
+
+
+def test_metrics_endpoint(client, get_token):
+    """Test request latency is exported per route template, to allowed clients"""
+    client.get("/api/contacts/", headers={"Authorization": f"Bearer {get_token}"})
+    assert client.get("/metrics").status_code == 403
+
+    scraper = TestClient(client.app, client=("127.0.0.1", 50000))
+    response = scraper.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/contacts/",status="200"}'
+        in response.text
+    )
+    assert "# TYPE bcrypt_queue_depth gauge" in response.text
+
+
+
+def test_contacts_query_budget(client, get_token, max_queries):
+    """Test contact pages cost the same few statements however long they are"""
+    _import_bulk_contacts(client, get_token, "Budget", count=20)
+    headers = {"Authorization": f"Bearer {get_token}"}
+    with max_queries(2) as requests:
+        client.get("/api/contacts/", params={"limit": 100}, headers=headers)
+    assert len(requests) == 1
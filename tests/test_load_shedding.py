@@ -0,0 +1,146 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.core.load_shedding import DECREASE_FACTOR, ConcurrencyPool, LoadSheddingMiddleware
+
+
+def test_pool_queues_and_hands_over_slots():
+    """Test a freed slot goes to the oldest waiter"""
+    async def scenario():
+        pool = ConcurrencyPool("read", max_limit=1, target_latency=1, queue_timeout=1)
+        assert await pool.acquire() is None
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert len(pool.waiters) == 1
+        pool.release(0.01)
+        assert await waiter is None
+        assert pool.in_flight == 1 and not pool.waiters
+
+    asyncio.run(scenario())
+
+
+def test_pool_refuses_when_saturated():
+    """Test full queues refuse at once and waits time out"""
+    async def scenario():
+        pool = ConcurrencyPool(
+            "auth", max_limit=1, target_latency=1, queue_timeout=0.01, max_queue=1
+        )
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert await pool.acquire() == "queue_full"
+        assert await waiter == "timeout"
+        assert pool.in_flight == 1 and not pool.waiters
+
+    asyncio.run(scenario())
+
+
+def test_pool_release_between_cancel_and_resume():
+    """Test a waiter cancelled just before a release leaves the pool sane"""
+    async def scenario():
+        pool = ConcurrencyPool("read", max_limit=1, target_latency=1, queue_timeout=1)
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        pool.release(0.01)  # pops the cancelled future before the waiter resumes
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert pool.in_flight == 0 and not pool.waiters
+
+    asyncio.run(scenario())
+
+
+def test_pool_release_between_timeout_and_resume():
+    """Test a timed-out waiter popped by a release still reports a timeout"""
+    async def scenario():
+        pool = ConcurrencyPool("read", max_limit=1, target_latency=1, queue_timeout=0.05)
+        await pool.acquire()
+        loop = asyncio.get_running_loop()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        # Runs in the same loop iteration as the timeout, before the waiter resumes.
+        loop.call_at(loop.time() + 0.0501, pool.release, 0.01)
+        assert await waiter == "timeout"
+        assert pool.in_flight == 0 and not pool.waiters
+
+    asyncio.run(scenario())
+
+
+def test_pool_limit_aimd():
+    """Test slow requests cut the limit once per window, fast ones grow it"""
+    pool = ConcurrencyPool("write", max_limit=10, target_latency=60, queue_timeout=1)
+    pool.in_flight = 3
+    pool.release(61)
+    pool.release(61)
+    assert pool.limit == 10 * DECREASE_FACTOR
+    pool.release(0.1)
+    assert pool.limit == 10 * DECREASE_FACTOR + 1 / (10 * DECREASE_FACTOR)
+
+
+def test_auth_storm_does_not_starve_reads():
+    """Test a saturated auth pool sheds logins while reads go through"""
+    app = FastAPI()
+
+    @app.post("/api/auth/login")
+    async def login():
+        await asyncio.sleep(0.2)
+        return {}
+
+    @app.get("/api/contacts/")
+    async def contacts():
+        return []
+
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        pools={
+            "auth": {"max_limit": 1, "target_latency": 1, "queue_timeout": 0.05},
+            "write": {"max_limit": 1, "target_latency": 1, "queue_timeout": 0.05},
+            "read": {"max_limit": 4, "target_latency": 1, "queue_timeout": 0.05},
+        },
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            logins = [client.post("/api/auth/login") for _ in range(4)]
+            read = client.get("/api/contacts/")
+            return await asyncio.gather(*logins, read)
+
+    *logins, read = asyncio.run(scenario())
+    assert sorted(r.status_code for r in logins) == [200, 503, 503, 503]
+    assert all(r.headers["Retry-After"] == "1" for r in logins if r.status_code == 503)
+    assert read.status_code == 200
+
+
+def test_untimed_paths_do_not_steer_the_limit():
+    """Test slow bulk writes hold a slot without lowering the write limit"""
+    app = FastAPI()
+
+    @app.post("/api/contacts/upsert")
+    async def upsert():
+        await asyncio.sleep(0.05)
+        return {}
+
+    @app.post("/api/contacts/")
+    async def create():
+        await asyncio.sleep(0.05)
+        return {}
+
+    middleware = LoadSheddingMiddleware(
+        app, pools={"write": {"max_limit": 4, "target_latency": 0.01, "queue_timeout": 1}}
+    )
+    pool = middleware.pools["write"]
+
+    async def scenario(path):
+        transport = httpx.ASGITransport(app=middleware)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path)
+
+    assert asyncio.run(scenario("/api/contacts/upsert")).status_code == 200
+    assert pool.limit == 4 and pool.in_flight == 0
+    assert asyncio.run(scenario("/api/contacts/")).status_code == 200
+    assert pool.limit == 4 * DECREASE_FACTOR
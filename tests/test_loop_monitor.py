@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import time
+
+from src.core.loop_monitor import LoopLagMonitor
+from src.core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+
+def block_the_loop() -> None:
+    time.sleep(0.3)
+
+
+def test_lag_recorded_and_blocking_stack_logged(caplog):
+    """Test a blocking call shows up as lag and its stack is logged"""
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.01, threshold=0.05, capture_stacks=True)
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        block_the_loop()
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    samples = sum(EVENT_LOOP_LAG.values.get((), [[0], 0.0])[0])
+    blocked = EVENT_LOOP_BLOCKED.values.get((), 0.0)
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        asyncio.run(scenario())
+
+    assert sum(EVENT_LOOP_LAG.values[()][0]) > samples
+    assert EVENT_LOOP_BLOCKED.values[()] == blocked + 1
+    assert any("Event loop lagged" in message for message in caplog.messages)
+    assert any(
+        "Event loop blocked" in message and "block_the_loop" in message
+        for message in caplog.messages
+    )
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    client_allowed,
+    HTTP_REQUEST_DURATION,
+    merge_snapshots,
+    render,
+    sql_operation,
+)
+
+
+def test_render_exposition_format():
+    """Test counters and cumulative histogram buckets are rendered"""
+    registry = MetricsRegistry()
+    hits = registry.register(Counter("hits_total", "Hits.", ("cache",)))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+    hits.inc(cache="user")
+    hits.inc(2, cache="user")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = render(registry.collect())
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{cache="user"} 3.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_merge_per_pid_snapshots(tmp_path):
+    """Test worker files are summed and dead workers' gauges dropped"""
+    def snapshot(requests: float, in_flight: float) -> dict:
+        registry = MetricsRegistry()
+        registry.register(Counter("requests_total", "Requests.")).inc(requests)
+        registry.register(Gauge("in_flight", "In flight.")).set(in_flight)
+        return registry.collect()
+
+    registry = MetricsRegistry()
+    registry.multiproc_dir = str(tmp_path)
+    registry.register(Counter("requests_total", "Requests.")).inc(1)
+    registry.register(Gauge("in_flight", "In flight.")).set(1)
+    # pid 2**22 + 1 is above Linux's pid_max, so never alive.
+    (tmp_path / f"{2 ** 22 + 1}.json").write_text(json.dumps(snapshot(5, 7)))
+
+    text = asyncio.run(registry.exposition())
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert "requests_total 6.0" in text
+    assert "in_flight 1.0" in text
+
+    merged = merge_snapshots([(True, snapshot(1, 2)), (True, snapshot(3, 4))])
+    assert merged["in_flight"]["samples"] == [[[], 6.0]]
+
+
+def test_client_allowed():
+    """Test scrapers are matched against the allowed networks"""
+    networks = ["127.0.0.1/32", "10.0.0.0/8"]
+    assert client_allowed("127.0.0.1", networks)
+    assert client_allowed("10.1.2.3", networks)
+    assert not client_allowed("203.0.113.5", networks)
+    assert not client_allowed("testclient", networks)
+    assert not client_allowed(None, networks)
+
+
+def test_sql_operation():
+    """Test statement types are bounded to a known set"""
+    assert sql_operation("\n  SELECT contacts.id FROM contacts") == "SELECT"
+    assert sql_operation("insert into contacts values (1)") == "INSERT"
+    assert sql_operation("SAVEPOINT sa_1") == "OTHER"
+    assert sql_operation("") == "OTHER"
+
+
+def test_middleware_labels_route_template():
+    """Test request latency is labelled by route template, not path"""
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def thing(thing_id: int):
+        return {"id": thing_id}
+
+    app.add_middleware(MetricsMiddleware)
+    client = TestClient(app)
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/nowhere")
+
+    values = HTTP_REQUEST_DURATION.values
+    assert sum(values[("GET", "/things/{thing_id}", "200")][0]) == 2
+    assert sum(values[("GET", "<unmatched>", "404")][0]) == 1
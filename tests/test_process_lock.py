@@ -0,0 +1,13 @@
+from src.core.process_lock import hold_lock
+
+
+def test_lock_held_by_one_holder(tmp_path):
+    """Test only one holder gets the lock until it lets go"""
+    path = str(tmp_path / "scheduler.lock")
+    first = hold_lock(path)
+    assert first is not None
+    assert hold_lock(path) is None
+    first.close()
+    second = hold_lock(path)
+    assert second is not None
+    second.close()
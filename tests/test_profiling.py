@@ -0,0 +1,69 @@
+import marshal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.depend_service import get_current_user
+from src.core.profiling import ProfilingMiddleware
+from src.entity.models import User, UserRole
+
+
+def busy() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def make_client(role: UserRole, min_interval: float = 0.0) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"total": busy()}
+
+    app.add_middleware(ProfilingMiddleware, min_interval=min_interval)
+    app.dependency_overrides[get_current_user] = lambda: User(username="u", role=role)
+    return TestClient(app)
+
+
+def test_unflagged_request_untouched():
+    """Test requests without the flag are served as usual"""
+    response = make_client(UserRole.USER).get("/items")
+    assert response.status_code == 200
+    assert "X-Profile-Status" not in response.headers
+
+
+def test_profile_requires_admin():
+    """Test non-admins cannot profile requests"""
+    response = make_client(UserRole.USER).get("/items", headers={"X-Profile": "cprofile"})
+    assert response.status_code == 403
+
+
+def test_profile_cprofile_report():
+    """Test cProfile text reports replace the response body"""
+    response = make_client(UserRole.ADMIN).get("/items", headers={"X-Profile": "cprofile"})
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Status"] == "200"
+    assert "busy" in response.text and "cumulative" in response.text
+
+
+def test_profile_pstats_dump():
+    """Test binary pstats dumps load back"""
+    response = make_client(UserRole.ADMIN).get("/items", params={"profile": "pstats"})
+    stats = marshal.loads(response.content)
+    assert any(function == "busy" for _, _, function in stats)
+
+
+def test_profile_collapsed_stacks():
+    """Test the sampling profiler returns collapsed stacks"""
+    response = make_client(UserRole.ADMIN).get("/items", headers={"X-Profile": "collapsed"})
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy (" in line for line in lines)
+
+
+def test_profile_rate_limited():
+    """Test profiles are limited to one per interval"""
+    client = make_client(UserRole.ADMIN, min_interval=60)
+    assert client.get("/items", headers={"X-Profile": "cprofile"}).status_code == 200
+    assert client.get("/items", headers={"X-Profile": "cprofile"}).status_code == 429
+    assert client.get("/items", headers={"X-Profile": "bogus"}).status_code == 400
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.query_log import QueryLogMiddleware, capture_queries, watch_queries
+from src.core.timing import on_statement
+
+
+engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+watch_queries(engine, slow_threshold=0.0)
+
+app = FastAPI()
+app.add_middleware(QueryLogMiddleware, n_plus_one_threshold=3)
+
+
+@app.get("/items/{count}")
+async def items(count: int):
+    async with engine.connect() as conn:
+        for i in range(count):
+            await conn.execute(text("SELECT :i"), {"i": i})
+    return {"count": count}
+
+
+client = TestClient(app)
+
+
+def test_request_id_assigned_and_echoed():
+    """Test requests get an ID, or keep a well-formed one they bring"""
+    assert len(client.get("/items/0").headers["X-Request-ID"]) == 32
+    response = client.get("/items/0", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+    response = client.get("/items/0", headers={"X-Request-ID": "bad id\x01"})
+    assert response.headers["X-Request-ID"] != "bad id\x01"
+
+
+def test_queries_counted_per_request():
+    """Test statements are attributed to the request that ran them"""
+    with capture_queries() as requests:
+        client.get("/items/2")
+        client.get("/items/1")
+    assert [request.count for request in requests] == [2, 1]
+    assert requests[0].route == "/items/{count}"
+
+
+def test_slow_query_and_n_plus_one_logged(caplog):
+    """Test slow statements and repeated statements are reported"""
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        client.get("/items/3", headers={"X-Request-ID": "req-1"})
+    slow = [m for m in caplog.messages if m.startswith("Slow query")]
+    assert slow and "route=/items/{count} request_id=req-1" in slow[0]
+    assert any(
+        m.startswith("Possible N+1: 3 identical statements") and "SELECT ?" in m
+        for m in caplog.messages
+    )
+
+
+def test_failed_statements_leave_no_state():
+    """Test hooks share one event pair and failed statements are not recorded"""
+    statements = []
+    failing = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    watch_queries(failing, slow_threshold=float("inf"))
+    on_statement(failing, lambda statement, elapsed: statements.append(statement))
+
+    async def scenario():
+        async with failing.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing"))
+            await conn.execute(text("SELECT 1"))
+            return (await conn.get_raw_connection()).info
+
+    assert asyncio.run(scenario()) == {}
+    assert statements == ["SELECT 1"]
+    assert len(failing.sync_engine.dispatch.before_cursor_execute) == 1
@@ -0,0 +1,115 @@
+import uuid
+
+import fakeredis
+import jwt
+import pytest
+import redis.asyncio as redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config.config import settings
+from src.core.rate_limit import Budget, RateLimitMiddleware
+from src.services.batch_services import BATCH_SESSION
+
+
+def make_app(redis_client) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    @app.post("/login")
+    async def login():
+        return {}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        redis=redis_client,
+        secret_key=settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        default="3/minute",
+        limits={"/login": "1/minute"},
+    )
+    return app
+
+
+@pytest.fixture
+def redis_client():
+    # In-memory Redis; the limiter's Lua script runs on lupa.
+    return fakeredis.FakeAsyncRedis()
+
+
+def auth_headers() -> dict:
+    # A fresh user per test keeps buckets from leaking between runs.
+    token = jwt.encode(
+        {"sub": f"user-{uuid.uuid4().hex}"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_budget_parse():
+    """Test budgets are parsed from '<count>/<unit>' specs"""
+    assert Budget.parse("10/minute") == Budget(10, 60)
+    assert Budget.parse("5/second").rate == 5
+    with pytest.raises(ValueError):
+        Budget.parse("ten/minute")
+
+
+def test_token_bucket_per_user_and_route(redis_client):
+    """Test buckets are per user and per budgeted route"""
+    app = make_app(redis_client)
+    headers = auth_headers()
+    with TestClient(app) as client:
+        responses = [client.get("/items", headers=headers) for _ in range(4)]
+        assert [r.status_code for r in responses] == [200, 200, 200, 429]
+        assert [r.headers["RateLimit-Remaining"] for r in responses] == ["2", "1", "0", "0"]
+        assert responses[0].headers["RateLimit-Limit"] == "3"
+        assert responses[0].headers["RateLimit-Policy"] == "3;w=60"
+        assert int(responses[3].headers["Retry-After"]) in range(1, 21)
+
+        # Another user and another route have buckets of their own.
+        assert client.get("/items", headers=auth_headers()).status_code == 200
+        assert client.post("/login", headers=headers).status_code == 200
+        assert client.post("/login", headers=headers).status_code == 429
+
+
+def test_batched_requests_pay_budgeted_routes_only(redis_client):
+    """Test batched requests skip the default bucket but not route budgets"""
+    app = make_app(redis_client)
+
+    async def batched(scope, receive, send):
+        scope["state"] = {**scope.get("state", {}), BATCH_SESSION: None}
+        await app(scope, receive, send)
+
+    headers = auth_headers()
+    with TestClient(batched) as client:
+        assert all(client.get("/items", headers=headers).status_code == 200 for _ in range(5))
+        assert client.post("/login", headers=headers).status_code == 200
+        assert client.post("/login", headers=headers).status_code == 429
+
+
+def test_fail_open_without_redis():
+    """Test requests pass, without headers, when Redis is unreachable"""
+    app = make_app(redis.Redis(host="127.0.0.1", port=1))
+    with TestClient(app) as client:
+        response = client.get("/items", headers=auth_headers())
+    assert response.status_code == 200
+    assert "RateLimit-Limit" not in response.headers
+
+
+def test_expired_token_keyed_by_address(redis_client):
+    """Test expired tokens fall back to the client address"""
+    token = jwt.encode(
+        {"sub": "someone", "exp": 1}, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+    middleware = RateLimitMiddleware(
+        None, redis_client, settings.SECRET_KEY, settings.ALGORITHM
+    )
+    scope = {
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("10.0.0.1", 1234),
+    }
+    assert middleware._client(scope) == "ip:10.0.0.1"
+    valid = [(b"authorization", auth_headers()["Authorization"].encode())]
+    assert middleware._client({**scope, "headers": valid}).startswith("user:user-")
@@ -0,0 +1,64 @@
+import asyncio
+import re
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.timing import (
+    RequestTimings,
+    ServerTimingMiddleware,
+    TimedRoute,
+    instrument_engine,
+    timed,
+)
+
+
+engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+instrument_engine(engine)
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/items")
+async def items():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await conn.execute(text("SELECT 2"))
+    with timed("cache"):
+        await asyncio.sleep(0)
+    return [{"id": i} for i in range(100)]
+
+
+def make_client(sample_rate: float) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ServerTimingMiddleware, sample_rate=sample_rate)
+    return TestClient(app)
+
+
+def test_server_timing_header():
+    """Test sampled responses report their phases"""
+    response = make_client(1.0).get("/items")
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert 'db;dur=' in header and 'desc="2 calls"' in header
+    assert re.search(r"cache;dur=[\d.]+;desc=\"1 calls\"", header)
+    assert re.search(r"handler;dur=[\d.]+, serialize;dur=[\d.]+, total;dur=", header)
+
+
+def test_server_timing_not_sampled():
+    """Test unsampled responses carry no header"""
+    response = make_client(0.0).get("/items")
+    assert "Server-Timing" not in response.headers
+
+
+def test_timed_outside_request():
+    """Test timing blocks are no-ops outside a sampled request"""
+    with timed("db"):
+        pass
+    timings = RequestTimings()
+    assert timings.header().startswith("total;dur=")
+    assert "db_calls=0" in timings.logfmt()